@@ -3,6 +3,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import time
 from simulators10.tmsim import NondeterministicTuringMachine, DeterministicTuringMachine
+from simulators6.vectorise import executer_vectorise, machine_depuis_dtm
 
 st.set_page_config(page_title="TP : Langage et traducteurs", page_icon="🧠", layout="wide")
 
@@ -67,15 +68,16 @@ if current_page == "home":
 
 elif current_page == "exo10":
     # Code de ton Exercice 10 intégré ici directement
-    def benchmark(trans_d, trans_nd, input_gen, max_len=50, step=5, trials=3):
+    def benchmark(trans_d, trans_nd, input_gen, max_len=50, step=5, trials=3, batch_size=200):
         results = []
+        machine_d = machine_depuis_dtm(trans_d)
         for length in range(10, max_len + 1, step):
             input_data = input_gen(length)
             dt_stats, nd_stats = [], []
             for _ in range(trials):
                 dtm = DeterministicTuringMachine(trans_d)
                 t0 = time.perf_counter()
-                dtm.simulate(input_data)
+                dtm.simulate(input_data, trace='none')
                 t1 = time.perf_counter()
                 dt_stats.append((t1 - t0) * 1000)
 
@@ -88,6 +90,12 @@ elif current_page == "exo10":
                     'paths': nd_result['paths_explored']
                 })
 
+            # Même machine déterministe, lot de mots exécuté en pas synchronisés (NumPy)
+            batch = [input_gen(length) for _ in range(batch_size)]
+            t0 = time.perf_counter()
+            executer_vectorise(machine_d, batch)
+            t1 = time.perf_counter()
+
             avg_dt = sum(dt_stats) / trials
             avg_nd = sum(x['time'] for x in nd_stats) / trials
             avg_paths = sum(x['paths'] for x in nd_stats) / trials
@@ -95,6 +103,7 @@ elif current_page == "exo10":
             results.append({
                 'Length': length,
                 'DT_time_ms': avg_dt,
+                'DT_vect_ms': (t1 - t0) * 1000 / batch_size,
                 'ND_time_ms': avg_nd,
                 'ND_paths': avg_paths,
                 'Time_ratio': avg_nd / avg_dt if avg_dt else float('inf'),
@@ -152,6 +161,7 @@ elif current_page == "exo10":
                 fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 5))
                 ax1.plot(df['Length'], df['DT_time_ms'], 'b-', label='Déterministe')
                 ax1.plot(df['Length'], df['ND_time_ms'], 'r-', label='Non-déterministe')
+                ax1.plot(df['Length'], df['DT_vect_ms'], 'b--', label='Déterministe (lot vectorisé, par mot)')
                 ax1.set_yscale('log')
                 ax1.legend()
                 ax1.set_title("Temps d'exécution (ms)")
@@ -161,7 +171,7 @@ elif current_page == "exo10":
                 st.pyplot(fig)
                 st.subheader("📊 Données brutes")
                 st.dataframe(df.style.format({
-                    'DT_time_ms': '{:.2f}', 'ND_time_ms': '{:.2f}',
+                    'DT_time_ms': '{:.2f}', 'DT_vect_ms': '{:.4f}', 'ND_time_ms': '{:.2f}',
                     'Time_ratio': '{:.1f}', 'Paths_per_char': '{:.1e}'
                 }))
 
@@ -1,6 +1,8 @@
 # compare.py
+import random
 import time
-from simulators8.tm_2tape_palindrome import run as run_2tape
+from simulators8.single_tape import compile_single_tape
+from simulators8.tm_2tape_palindrome import multi_tape_machine, run as run_2tape
 
 def simulate_1tape(w):
     """Version naïve 1 ruban"""
@@ -8,17 +10,22 @@ def simulate_1tape(w):
     left, right = w.split("#")
     return left == right
 
+def best_time(function, *args, repeat=5):
+    """Meilleur temps (en ms) sur plusieurs exécutions, et le résultat de la dernière"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
 def compare_versions(w):
-    """Compare les temps d'exécution"""
+    """Compare les temps d'exécution (machine seule : aucune trace n'est construite)"""
     # Version 1 ruban
-    start = time.perf_counter()
-    result_1tape = simulate_1tape(w)
-    time_1tape = (time.perf_counter() - start) * 1000  # en ms
+    result_1tape, time_1tape = best_time(simulate_1tape, w)
     
     # Version 2 rubans
-    start = time.perf_counter()
-    result_2tape, _ = run_2tape(w)
-    time_2tape = (time.perf_counter() - start) * 1000  # en ms
+    (result_2tape, _), time_2tape = best_time(run_2tape, w, False)
     
     return {
         "Mot testé": w,
@@ -28,4 +35,29 @@ def compare_versions(w):
         "Temps 2 rubans": f"{time_2tape:.3f} ms",
         "Gain relatif": f"{(time_1tape - time_2tape)/time_1tape * 100:.1f}%",
         "Conclusion": "2 rubans plus rapide ✅" if time_2tape < time_1tape else "1 ruban plus rapide ❌"
-    }
\ No newline at end of file
+    }
+
+def compare_steps(sizes, seed=0):
+    """
+    Nombre d'étapes de la machine à 2 rubans et de sa version compilée à 1 ruban
+    (pistes multiples, simulators8.single_tape) sur des mots w#w de tailles croissantes
+    """
+    single = compile_single_tape(multi_tape_machine())
+    generator = random.Random(seed)
+    rows = []
+    for n in sizes:
+        w = "".join(generator.choice("01") for _ in range(n))
+        word = w + "#" + w
+        machine = multi_tape_machine()
+        machine.initialize_tape(0, word)
+        accepted = machine.run(max_steps=10 * n + 10)
+        result = single.run([word, ""], max_steps=100 * (n + 2) ** 2)
+        if result["accepte"] != accepted:
+            raise RuntimeError(f"Résultats différents pour n = {n}")
+        rows.append({
+            "Taille n": n,
+            "Étapes k rubans": machine.steps,
+            "Étapes 1 ruban": result["nb_etapes"],
+            "Rapport 1 ruban / k rubans": round(result["nb_etapes"] / max(machine.steps, 1), 1),
+        })
+    return rows
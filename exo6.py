@@ -1,6 +1,67 @@
+import os
+import threading
 import streamlit as st
 from simulators6 import machin_de_turing 
+from simulators6.definition import charger_texte
 from simulators6.machin_de_turing import creer_machine_addition_unaire,creer_machine_anbn,creer_machine_palindromes
+from simulators6.analyse import analyser
+from simulators6.cache import CACHE, executer_en_cache
+
+MACHINES_PREDEFINIES = {
+    "Palindromes": creer_machine_palindromes,
+    "a^n b^n": creer_machine_anbn,
+    "Addition unaire": creer_machine_addition_unaire,
+}
+
+LIGNES_PAR_PAGE = 500  # lignes du tableau de la trace reconstruites à la fois
+
+# Machines et résultats partagés entre les réexécutions du script et les sessions
+
+@st.cache_resource
+def obtenir_machine(machine_type, texte_json=None):
+    """
+    Construit et compile une machine une seule fois par (type, définition).
+    
+    Retourne la machine et le verrou qui protège son ruban pendant une
+    exécution (la machine est partagée par toutes les sessions).
+    """
+    if machine_type in MACHINES_PREDEFINIES:
+        machine = MACHINES_PREDEFINIES[machine_type]()
+    else:
+        machine = charger_texte(texte_json)
+    if isinstance(machine, machin_de_turing.MachineDeTuring):
+        machine.compiler()
+    return machine, threading.Lock()
+
+@st.cache_resource(max_entries=256)
+def executer_machine(machine_type, texte_json, mot, max_etapes, minimiser=False):
+    """
+    Résultat mis en cache par (machine, mot, max_etapes, minimiser).
+    
+    La trace reste une TraceExecution compacte : l'animation n'en
+    reconstruit qu'une configuration à la fois. En dessous, le cache par empreinte canonique (simulators6.cache) partage
+    les résultats entre machines qui ne diffèrent que par le nom des états.
+    """
+    machine, verrou = obtenir_machine(machine_type, texte_json)
+    with verrou:
+        return executer_en_cache(machine, mot, max_etapes, rapide=True, minimiser=minimiser)
+
+@st.cache_data(max_entries=64)
+def tableau_trace(machine_type, texte_json, mot, max_etapes, minimiser=False, page=0):
+    """Lignes d'une page du tableau de la trace (seules ses configurations sont reconstruites)."""
+    trace = executer_machine(machine_type, texte_json, mot, max_etapes, minimiser)['trace']
+    return [{
+        "Étape": etape['etape'],
+        "État": etape['etat'],
+        "Symbole lu": etape['symbole_lu'],
+        "Position": etape['position'],
+        "Configuration du ruban": etape['ruban']
+    } for etape in trace[page * LIGNES_PAR_PAGE:(page + 1) * LIGNES_PAR_PAGE]]
+
+@st.cache_data
+def rapport_analyse(machine_type, texte_json=None):
+    """Lignes du rapport d'analyse statique de la machine."""
+    return analyser(obtenir_machine(machine_type, texte_json)[0]).lignes()
 
 # Interface Streamlit
 
@@ -17,21 +78,44 @@ def main():
     )
     
     # Créer la machine selon le choix
+    texte_json = None
     if machine_type == "Palindromes":
-        machine = creer_machine_palindromes()
         st.info("🔍 Machine sélectionnée: Reconnaissance de palindromes")
         exemples = ["aba", "abba", "a", "", "abc", "abcba"]
     elif machine_type == "a^n b^n":
-        machine = creer_machine_anbn()
         st.info("🔍 Machine sélectionnée: Reconnaissance de {aⁿbⁿ | n ≥ 0}")
         exemples = ["", "ab", "aabb", "aaabbb", "aab", "abb"]
     elif machine_type == "Addition unaire":
-        machine = creer_machine_addition_unaire()
         st.info("🔍 Machine sélectionnée: Addition en unaire")
         exemples = ["1+1", "11+1", "1+11", "111+11"]
     else:
-        st.warning("🚧 Mode personnalisé non implémenté dans cette version")
+        st.info("🔍 Machine personnalisée : définition au format JSON (voir simulators6/definition.py)")
+        with open(os.path.join(os.path.dirname(__file__), "simulators6", "exemples", "palindromes.json"),
+                  encoding="utf-8") as fichier:
+            exemple_json = fichier.read()
+        fichier_json = st.sidebar.file_uploader("Charger une définition (.json)", type=["json"])
+        texte_json = fichier_json.getvalue().decode("utf-8") if fichier_json else st.sidebar.text_area(
+            "Définition de la machine:", value=exemple_json, height=300)
+    try:
+        machine, _ = obtenir_machine(machine_type, texte_json)
+    except ValueError as erreur:
+        st.error(f"❌ Définition invalide : {erreur}")
+        return
+    if not isinstance(machine, machin_de_turing.MachineDeTuring):
+        st.error("❌ Ce simulateur n'exécute que les machines déterministes à un ruban")
         return
+    if texte_json is not None:
+        exemples = sorted(machine.alphabet_entree)[:6]
+    
+    with st.sidebar.expander("🔬 Analyse statique de la machine"):
+        for ligne in rapport_analyse(machine_type, texte_json):
+            st.markdown(f"- {ligne}")
+        minimiser = st.checkbox("Exécuter la table minimisée",
+                                help="États fusionnés sous le nom du représentant de leur classe")
+    
+    stats = CACHE.statistiques()
+    st.sidebar.caption(f"Cache des résultats : {stats['succes']} succès, {stats['echecs']} échecs "
+                       f"({stats['entrees']} entrées, {stats['octets'] // 1024} Ko)")
     
     # Interface principale
     col1, col2 = st.columns([1, 1])
@@ -58,14 +142,16 @@ def main():
         
         if st.button("🚀 Exécuter", type="primary"):
             with st.spinner("Exécution en cours..."):
-                resultat = machine.executer(mot_test, max_etapes)
-                st.session_state.resultat = resultat
+                # Seule la clé de l'exécution est gardée dans la session
+                st.session_state.execution = (machine_type, texte_json, mot_test, max_etapes, minimiser)
+                executer_machine(*st.session_state.execution)
+    
+    resultat = executer_machine(*st.session_state.execution) if 'execution' in st.session_state else None
     
     with col2:
         st.header("📊 Résultats")
         
-        if 'resultat' in st.session_state:
-            resultat = st.session_state.resultat
+        if resultat is not None:
             
             # Résultat principal
             if resultat['accepte']:
@@ -85,11 +171,11 @@ def main():
                 st.code(resultat['ruban_final'] if resultat['ruban_final'] else "ε (vide)")
     
     # Trace d'exécution
-    if 'resultat' in st.session_state and st.session_state.resultat['trace']:
+    if resultat is not None and resultat['trace']:
         st.markdown("---")
         st.header("🔍 Trace d'exécution")
         
-        trace = st.session_state.resultat['trace']
+        trace = resultat['trace']
         
         # Option pour afficher la trace complète ou pas à pas
         mode_trace = st.radio("Mode d'affichage:", ["Tableau complet", "Animation pas à pas"], horizontal=True)
@@ -97,22 +183,15 @@ def main():
         if mode_trace == "Tableau complet":
             # Affichage sous forme de tableau
             st.subheader("Trace complète:")
-            trace_data = []
-            for etape in trace:
-                trace_data.append({
-                    "Étape": etape['etape'],
-                    "État": etape['etat'],
-                    "Symbole lu": etape['symbole_lu'],
-                    "Position": etape['position'],
-                    "Configuration du ruban": etape['ruban']
-                })
-            st.dataframe(trace_data, use_container_width=True)
+            nb_pages = (len(trace) - 1) // LIGNES_PAR_PAGE + 1
+            page = st.number_input(f"Page (sur {nb_pages}):", 1, nb_pages, 1) - 1 if nb_pages > 1 else 0
+            st.dataframe(tableau_trace(*st.session_state.execution, page=page), use_container_width=True)
             
         else:
             # Animation pas à pas
             st.subheader("Animation pas à pas:")
             
-            if 'etape_courante' not in st.session_state:
+            if st.session_state.get('etape_courante', len(trace)) >= len(trace):
                 st.session_state.etape_courante = 0
             
             col1, col2, col3 = st.columns([1, 2, 1])
@@ -129,7 +208,7 @@ def main():
                 if st.button("⏭️ Fin"):
                     st.session_state.etape_courante = len(trace) - 1
             
-            # Affichage de l'étape courante
+            # Affichage de l'étape courante (reconstruite depuis la trace compacte)
             etape_actuelle = trace[st.session_state.etape_courante]
             
             st.info(f"**Étape {etape_actuelle['etape']}** | État: {etape_actuelle['etat']} | "
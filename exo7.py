@@ -1,5 +1,69 @@
+import csv
+import io
+import itertools
+import tempfile
+import time
 import streamlit as st
-from simulators7 import palindrome, unary_add, unary_sub, unary_mul, unary_div
+from simulators7 import batch, palindrome, turing, unary_add, unary_sub, unary_mul, unary_div
+
+MAX_MACHINE_STEPS = 10 ** 9  # étapes au plus pour la vraie machine (quelques secondes)
+SPOOL_SIZE = 8 << 20         # octets du CSV des résultats gardés en mémoire, au-delà sur disque
+
+OPERATIONS = {
+    "Reconnaissance de palindrome": "palindrome",
+    "Addition unaire": "add",
+    "Soustraction unaire": "sub",
+    "Multiplication unaire": "mul",
+    "Division unaire": "div",
+}
+
+def show_value(label, value, zero=""):
+    """Affiche une valeur unaire (aperçu borné) et sa valeur décimale."""
+    st.write(f"{label} :", value.preview(zero=zero))
+    st.caption(f"{label} = {int(value):,}".replace(",", " "))
+
+def check_palindrome_file():
+    """Palindrome sur un fichier téléversé, comparé par blocs sans copie complète."""
+    with st.expander("📁 Très grandes entrées : tester un fichier"):
+        uploaded = st.file_uploader("Fichier à tester", key="palindrome_file")
+        if not st.button("🔍 Tester le fichier") or not uploaded:
+            return
+        start = time.perf_counter()
+        size = uploaded.size
+        result = palindrome.is_palindrome_buffer(uploaded.getbuffer())
+        elapsed = time.perf_counter() - start
+        st.success("✔ Fichier palindrome !" if result else "❌ Fichier non palindrome")
+        st.caption(f"{size:,} octets en {elapsed * 1000:.1f} ms".replace(",", " ")
+                   + (f" ({size / elapsed / 1e6:.0f} Mo/s)" if elapsed > 0 else ""))
+
+def batch_mode(operation):
+    """Exécute l'opération sur chaque ligne d'un fichier et propose le CSV des résultats."""
+    uploaded = st.file_uploader("📄 Fichier d'entrées (une entrée par ligne)", key="batch_file")
+    if not uploaded or not st.button("▶️ Exécuter le lot"):
+        st.info("Chargez un fichier et cliquez sur Exécuter le lot.")
+        return
+    stats = batch.BatchStats()
+    progress = st.progress(0.0)
+    preview = None
+    # Le CSV des résultats passe sur disque au-delà de SPOOL_SIZE : la mémoire du lot reste bornée
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as output:
+        for chunk in batch.iter_csv(operation, uploaded, stats=stats):
+            if preview is None:
+                preview = list(itertools.islice(csv.reader(io.StringIO(chunk)), 21))
+            output.write(chunk.encode("utf-8"))
+            progress.progress(min(stats.bytes / max(uploaded.size, 1), 1.0))
+        progress.empty()
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Lignes", f"{stats.lines:,}".replace(",", " "))
+        col2.metric("Erreurs", f"{stats.errors:,}".replace(",", " "))
+        col3.metric("Lignes/s", f"{stats.lines_per_second:,.0f}".replace(",", " "))
+        col4.metric("Débit", f"{stats.megabytes_per_second:.1f} Mo/s")
+        if preview:
+            st.dataframe([dict(zip(preview[0], row)) for row in preview[1:]], use_container_width=True)
+        output.seek(0)
+        st.download_button("💾 Télécharger les résultats (CSV)", output,
+                           file_name=f"resultats_{operation}.csv", mime="text/csv")
 
 def main():
     st.title("🧠 Machines spécialisées")
@@ -12,21 +76,47 @@ def main():
         "Division unaire"
     ])
 
+    mode = st.radio("Mode :", ["Entrée unique", "Lot (fichier d'entrées)"], horizontal=True)
+    if mode != "Entrée unique":
+        batch_mode(OPERATIONS[option])
+        return
+
+    if option == "Reconnaissance de palindrome":
+        check_palindrome_file()
+
     user_input = st.text_input("🔤 Entrée (unaire, ex: 111#11 pour 3 et 2)", value="")
+    with_machine = st.checkbox("🤖 Exécuter aussi la vraie machine de Turing (étapes, espace)")
 
     if st.button("▶️ Exécuter") and user_input.strip():
-        if option == "Reconnaissance de palindrome":
-            result = palindrome.is_palindrome(user_input)
-            st.success("✔ Mot accepté !" if result else "❌ Mot rejeté")
-        elif option == "Addition unaire":
-            st.write("Résultat :", unary_add.compute(user_input))
-        elif option == "Soustraction unaire":
-            st.write("Résultat :", unary_sub.compute(user_input))
-        elif option == "Multiplication unaire":
-            st.write("Résultat :", unary_mul.compute(user_input))
-        elif option == "Division unaire":
-            q, r = unary_div.compute(user_input)
-            st.write(f"Quotient : {q}   Reste : {r}")
+        # Valeurs unaires compactes : le résultat n'est jamais construit en entier
+        try:
+            if option == "Reconnaissance de palindrome":
+                result = palindrome.is_palindrome(user_input)
+                st.success("✔ Mot accepté !" if result else "❌ Mot rejeté")
+            elif option == "Addition unaire":
+                show_value("Résultat", unary_add.compute_value(user_input))
+            elif option == "Soustraction unaire":
+                show_value("Résultat", unary_sub.compute_value(user_input), zero="0")
+            elif option == "Multiplication unaire":
+                show_value("Résultat", unary_mul.compute_value(user_input))
+            elif option == "Division unaire":
+                q, r = unary_div.compute_value(user_input)
+                show_value("Quotient", q)
+                show_value("Reste", r, zero="0")
+            if with_machine:
+                with st.spinner("Exécution de la machine de Turing..."):
+                    run = turing.run(OPERATIONS[option], user_input, MAX_MACHINE_STEPS)
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Étapes", f"{run.steps:,}".replace(",", " "))
+                col2.metric("Cases visitées", f"{run.space:,}".replace(",", " "))
+                col3.metric("Durée", f"{run.seconds * 1000:.1f} ms")
+                if run.timed_out:
+                    limit = f"{MAX_MACHINE_STEPS:,}".replace(",", " ")
+                    st.warning(f"⏱ Machine arrêtée après {limit} étapes, avant la fin du calcul")
+                else:
+                    st.caption("✔ Résultat de la machine identique à la forme close")
+        except ValueError as error:
+            st.error(f"Erreur : {error}")
     else:
         st.info("Entrez une chaîne et cliquez sur Exécuter.")
 
@@ -1,18 +1,49 @@
 # exo8.py
+import itertools
+import tempfile
 import streamlit as st
-from simulators8.tm_2tape_palindrome import run as run_palindrome
-from simulators8.tm_3tape_sort import run as run_sort
-from benchmarks.compare import compare_versions
+from simulators8 import tm_merge_sort
+from simulators8.tm_2tape_palindrome import iter_trace as palindrome_trace, run as run_palindrome
+from simulators8.tm_merge_sort import run as run_sort
+from benchmarks.compare import compare_steps, compare_versions
+
+MAX_TRACE_LINES = 400  # lignes de trace affichées au plus
+SPOOL_SIZE = 8 << 20   # octets du fichier trié gardés en mémoire, au-delà sur disque
 
 def display_trace(trace):
-    """Affiche la trace de manière élégante"""
+    """Affiche la trace de manière élégante (seules les MAX_TRACE_LINES premières lignes sont lues)"""
     st.subheader("🔍 Trace d'exécution")
+    lines = list(itertools.islice(trace, MAX_TRACE_LINES + 1))
     with st.expander("Voir les détails d'exécution"):
-        for step in trace:
+        for step in lines[:MAX_TRACE_LINES]:
             if step == "---":
                 st.divider()
             else:
                 st.write(step)
+        if len(lines) > MAX_TRACE_LINES:
+            st.caption(f"Trace tronquée aux {MAX_TRACE_LINES} premières lignes")
+
+def sort_uploaded(uploaded, k):
+    """Tri externe d'un fichier téléversé : journal des passes, E/S des rubans et fichier trié"""
+    stats = tm_merge_sort.MergeSortStats()
+    # Le fichier trié passe sur disque au-delà de SPOOL_SIZE : la mémoire du tri reste bornée
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as output:
+        try:
+            for block in tm_merge_sort.iter_sorted_blocks(tm_merge_sort.read_numbers(uploaded), k, stats=stats):
+                if block:
+                    output.write(b"\n".join(b"%d" % value for value in block) + b"\n")
+        except ValueError as error:
+            st.error(f"Erreur: {error}")
+            return
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Nombres", f"{stats.numbers:,}".replace(",", " "))
+        col2.metric("Passes de fusion", stats.passes)
+        col3.metric("E/S des rubans", f"{(stats.bytes_read + stats.bytes_written) / 1e6:.1f} Mo")
+        col4.metric("Durée", f"{stats.seconds:.2f} s")
+        display_trace(stats.log)
+        output.seek(0)
+        st.download_button("💾 Télécharger le fichier trié", output,
+                           file_name="tri.txt", mime="text/plain")
 
 def main():
     st.title("🧠 Simulateur de Machine de Turing à k rubans")
@@ -30,7 +61,7 @@ def main():
 
     task = st.selectbox("📌 Choisir une machine :", [
         "Reconnaissance L = {w#w} à 2 rubans",
-        "Tri de nombres à 3 rubans",
+        "Tri de nombres à k rubans (fusion externe)",
         "Comparaison 1 ruban vs k rubans"
     ])
 
@@ -40,39 +71,50 @@ def main():
         Entrez un mot binaire avec un # au milieu (ex: `101#101`)
         """)
         input_data = st.text_input("Mot à tester:", value="101#101")
-    elif task == "Tri de nombres à 3 rubans":
+    elif task == "Tri de nombres à k rubans (fusion externe)":
         st.markdown("""
         **Tri d'une liste de nombres**  
-        Entrez des nombres séparés par des espaces (ex: `5 2 7 1`)
+        Entrez des nombres séparés par des espaces (ex: `5 2 7 1`), ou chargez un fichier  
+        Fusion à k-1 voies sur des rubans stockés dans des fichiers temporaires
         """)
         input_data = st.text_input("Liste à trier:", value="5 2 7 1")
+        tapes = st.slider("Nombre de rubans (k)", 3, 8, 3)
+        run_size = st.number_input("Taille des monotonies initiales (liste saisie)", 1, tm_merge_sort.RUN_SIZE, 2)
+        uploaded = st.file_uploader("Fichier d'entiers (tri externe, taille quelconque)", key="sort_file")
     else:
         st.markdown("""
         **Comparaison de performance**  
-        Entrez un mot pour comparer les versions 1 ruban et 2 rubans
+        Entrez un mot pour comparer les versions 1 ruban et 2 rubans  
+        Le nombre d'étapes est mesuré sur la machine à 2 rubans et sur sa compilation
+        en machine à 1 ruban (pistes multiples), pour des mots w#w de taille croissante
         """)
         input_data = st.text_input("Mot à tester:", value="101#101")
+        max_size = st.slider("Taille maximale de w", 10, 2000, 200, step=10)
 
     if st.button("▶ Exécuter") and input_data.strip():
         if task == "Reconnaissance L = {w#w} à 2 rubans":
-            result, trace = run_palindrome(input_data)
+            # Résultat sans trace (O(n)), puis seulement les lignes affichées
+            result, _ = run_palindrome(input_data, trace=False)
             if result:
                 st.markdown("<div class='success-box'>✅ <b>Résultat:</b> Le mot est accepté</div>", 
                           unsafe_allow_html=True)
             else:
                 st.markdown("<div class='error-box'>❌ <b>Résultat:</b> Le mot est rejeté</div>", 
                           unsafe_allow_html=True)
-            display_trace(trace)
+            display_trace(palindrome_trace(input_data))
         
-        elif task == "Tri de nombres à 3 rubans":
-            sorted_out, trace = run_sort(input_data)
-            if isinstance(sorted_out, list):
-                st.markdown("<div class='success-box'>📊 <b>Résultat trié:</b></div>", 
-                          unsafe_allow_html=True)
-                st.write(sorted_out)
-                display_trace(trace)
+        elif task == "Tri de nombres à k rubans (fusion externe)":
+            if uploaded:
+                sort_uploaded(uploaded, tapes)
             else:
-                st.error(sorted_out)
+                sorted_out, trace = run_sort(input_data, k=tapes, run_size=int(run_size))
+                if trace and trace[0].startswith("Erreur"):
+                    st.error(trace[0])
+                else:
+                    st.markdown("<div class='success-box'>📊 <b>Résultat trié:</b></div>", 
+                              unsafe_allow_html=True)
+                    st.write(sorted_out)
+                    display_trace(trace)
         
         elif task == "Comparaison 1 ruban vs k rubans":
             report = compare_versions(input_data)
@@ -82,5 +124,12 @@ def main():
             col2.metric("2 rubans", report["Temps 2 rubans"])
             st.write(report["Conclusion"])
 
+            st.subheader("👣 Nombre d'étapes : 2 rubans vs 1 ruban compilé")
+            rows = compare_steps([max_size * i // 10 for i in range(11)])
+            st.dataframe(rows)
+            st.line_chart({"Étapes k rubans": [row["Étapes k rubans"] for row in rows],
+                           "Étapes 1 ruban": [row["Étapes 1 ruban"] for row in rows]})
+            st.caption("Le rapport croît linéairement avec n : la simulation à 1 ruban est quadratique")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
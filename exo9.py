@@ -1,5 +1,6 @@
 import streamlit as st
 from simulators9.universal_turing_machine import UniversalTuringMachine
+from simulators6.cache import run_en_cache
 
 def main():
     st.title("🧠 Machine de Turing Universelle (MTU)")
@@ -19,8 +20,12 @@ def main():
         else:
             accept_list = [s.strip() for s in accept_states.split(',')]
             mtu = UniversalTuringMachine(trans_code.strip(), input_code.strip(), accept_states=accept_list)
-            accepted = mtu.run()
+            accepted = run_en_cache(mtu, detect_loops=True)
             st.success("✔ Accepté !" if accepted else "❌ Rejeté")
+            if mtu.loop:
+                start, length = mtu.loop
+                st.warning(f"🔁 Boucle infinie détectée : la configuration de l'étape {start} "
+                           f"se répète tous les {length} pas")
             st.markdown(f"**Ruban final** : `{''.join(mtu.tape)}`")
             st.markdown(f"**Position de la tête** : {mtu.head}")
             st.markdown(f"**État final** : {mtu.state}")
@@ -1,5 +1,8 @@
 from collections import deque
 import time
+from simulators6.options_trace import FULL, SAMPLED, SUMMARY, Echantillonneur, lire_options
+from simulators6.boucles import DetecteurBoucle, confirmer_cycle
+from simulators6.analyse import RapportAnalyse, etats_morts
 
 class NondeterministicTuringMachine:
     """
@@ -121,52 +124,137 @@ class DeterministicTuringMachine:
         États d'acceptation
     """
 
+    PRUNED_LIMIT = 64   # tables élaguées mémorisées au plus (une par alphabet d'entrée)
+
     def __init__(self, transitions, start_state='q0', accept_states=None):
         self.transitions = transitions
         self.start_state = start_state
         self.accept_states = set(accept_states or ['q_accept'])
+        self._pruned = {}
 
-    def simulate(self, input_tape):
+    def _pruned_table(self, symbols):
+        """
+        Table minimisée et élaguée pour les mots sur l'alphabet ``symbols``.
+
+        La table minimisée (simulators6.analyse) ne garde que les états
+        accessibles, un par classe d'équivalence, et les couples possibles ;
+        les états morts y perdent leurs transitions sortantes. Le résultat
+        est calculé une fois par alphabet d'entrée.
+
+        Retourne :
+        ----------
+        (dict, set) : transitions élaguées et états morts
+        """
+        key = frozenset(symbols)
+        pruned = self._pruned.get(key)
+        if pruned is None:
+            report = RapportAnalyse(self.transitions, self.start_state, self.accept_states, (), key, '_')
+            finals = {state for state in self.accept_states if state in report.representants}
+            dead = etats_morts(report.transitions_minimisees, finals)
+            transitions = {key: value for key, value in report.transitions_minimisees.items()
+                           if key[0] not in dead}
+            if len(self._pruned) >= self.PRUNED_LIMIT:
+                self._pruned.clear()
+            pruned = self._pruned[key] = (transitions, dead)
+        return pruned
+
+    def simulate(self, input_tape, trace=FULL, detect_loops=False, prune=False):
         """
         Simule la machine déterministe sur le mot donné.
 
+        Paramètres :
+        -----------
+        input_tape : str
+            Le mot à analyser
+        trace : str
+            Niveau de trace de 'path' ('none', 'summary', 'sampled[:N]',
+            'reservoir:N' ou 'full', par défaut)
+        detect_loops : bool
+            Arrête la simulation dès qu'une configuration se répète
+            (haché de Zobrist incrémental, confirmé en rejouant le cycle)
+        prune : bool
+            Exécute la table minimisée et arrête la simulation dès que la
+            machine entre dans un état mort, qui ne mène à aucun état
+            d'acceptation (simulators6.analyse) ; les états fusionnés y
+            portent le nom du représentant de leur classe
+
         Retourne :
         ----------
         dict : {
-            'path': liste des configurations successives,
-            'error': (optionnel) si arrêt prématuré,
-            'timeout': (optionnel) si boucle infinie
+            'path': liste des configurations successives (selon le niveau de trace),
+            'error': (optionnel) si arrêt prématuré ('No transition' ou 'Dead state'),
+            'timeout': (optionnel) si boucle infinie,
+            'loop': (optionnel) {'start': étape de début du cycle, 'length': longueur},
+            'steps': nombre de transitions effectuées
         }
         """
+        options = lire_options(trace)
+        sampler = Echantillonneur(options) if options.niveau == SAMPLED else None
+        transitions = self.transitions
+        dead = set()
+        if prune:
+            # Table minimisée et élaguée : un état mort n'a plus de transition sortante
+            transitions, dead = self._pruned_table(input_tape)
         tape = list(input_tape)
         state = self.start_state
         head = 0
+        shift = 0  # cases ajoutées à gauche : head - shift est la position logique
         path = []
-
-        for _ in range(1000):
-            path.append(self._config(state, tape, head))
+        detector = None
+        if detect_loops:
+            detector = DetecteurBoucle(state, head, enumerate(tape), '_')
+
+        def finish(result, steps):
+            # 'sampled' : configurations retenues ; 'summary' : configuration finale seule
+            if sampler is not None:
+                result['path'] = sampler.elements()
+            elif options.niveau == SUMMARY:
+                result['path'] = [self._config(state, tape, head)]
+            result['steps'] = steps
+            return result
+
+        for step in range(1000):
+            if options.niveau == FULL:
+                path.append(self._config(state, tape, head))
+            elif sampler is not None:
+                sampler.ajouter(step, lambda: self._config(state, tape, head))
 
             if state in self.accept_states:
-                return {'path': path}
+                return finish({'path': path}, step)
+
+            # Configuration déjà rencontrée : la machine boucle indéfiniment
+            if detector is not None:
+                previous = detector.observer(step)
+                if previous is not None:
+                    cells = {i - shift: sym for i, sym in enumerate(tape) if sym != '_'}
+                    if confirmer_cycle(self.transitions, state, head - shift, cells, '_', step - previous,
+                                       lambda direction: 1 if direction == 'R' else -1, self.accept_states):
+                        return finish({'path': path, 'loop': {'start': previous, 'length': step - previous}}, step)
 
             # Étendre le ruban si nécessaire
             if head < 0:
                 tape.insert(0, '_')
                 head = 0
+                shift += 1
             elif head >= len(tape):
                 tape.append('_')
 
             current_symbol = tape[head]
-            transition = self.transitions.get((state, current_symbol))
+            transition = transitions.get((state, current_symbol))
 
             if not transition:
-                return {'path': path, 'error': 'No transition'}
+                return finish({'path': path, 'error': 'Dead state' if state in dead else 'No transition'}, step)
+
+            if detector is not None:
+                move = 1 if transition[2] == 'R' else -1
+                detector.appliquer(state, head - shift, current_symbol, transition[1], transition[0],
+                                   head - shift + move)
 
             state, write_sym, direction = transition
             tape[head] = write_sym
             head += 1 if direction == 'R' else -1
 
-        return {'timeout': True, 'path': path}
+        return finish({'timeout': True, 'path': path}, 1000)
 
     def _config(self, state, tape, head):
         """
@@ -0,0 +1,192 @@
+"""
+Analyse statique d'une fonction de transition.
+
+Sans exécuter la machine, l'analyse détermine :
+
+- les états inaccessibles depuis l'état initial ;
+- les couples (état, symbole) qui ne peuvent jamais se produire : état
+  inaccessible ou final (la machine s'arrête avant de lire), ou symbole
+  qui ne peut jamais se trouver sur le ruban (ni blanc, ni symbole
+  d'entrée, ni écrit par une transition possible) ;
+- les états morts, depuis lesquels aucun état final n'est accessible :
+  une exécution qui y entre ne peut plus accepter ;
+- les états équivalents, fusionnables par raffinement de partition
+  (même comportement pour chaque symbole possible, vers des états
+  eux-mêmes équivalents).
+
+La table minimisée ne garde que les états accessibles (un représentant par
+classe d'équivalence) et les couples possibles : elle donne les mêmes
+résultats et les mêmes nombres d'étapes que la table d'origine pour les
+mots écrits sur l'alphabet d'entrée.
+"""
+from typing import Dict, Iterable, List, Set, Tuple
+
+from simulators6.compilation import DEPLACEMENTS
+
+Transitions = Dict[Tuple[str, str], Tuple[str, str, str]]
+
+
+def etats_morts(transitions: Transitions, etats_finaux: Iterable[str], etats: Iterable[str] = ()) -> Set[str]:
+    """
+    États depuis lesquels aucun état final n'est accessible.
+
+    Args:
+        transitions (Dict): Transitions {(état, symbole): (état, symbole, direction)}
+        etats_finaux (Iterable[str]): États d'acceptation
+        etats (Iterable[str], optional): États déclarés en plus de ceux des transitions
+
+    Returns:
+        Set[str]: États morts
+
+    Note:
+        Toutes les transitions sont supposées possibles, quel que soit le
+        symbole lu : le résultat reste valable pour n'importe quel mot
+        d'entrée, ce qui permet de l'utiliser pour rejeter une exécution.
+    """
+    etats_finaux = set(etats_finaux)
+    tous = set(etats) | etats_finaux
+    predecesseurs: Dict[str, Set[str]] = {}
+    for (etat, _), (nouvel_etat, _, _) in transitions.items():
+        tous.update((etat, nouvel_etat))
+        if etat not in etats_finaux:
+            predecesseurs.setdefault(nouvel_etat, set()).add(etat)
+
+    vivants = set(etats_finaux)
+    a_visiter = list(etats_finaux)
+    while a_visiter:
+        for etat in predecesseurs.get(a_visiter.pop(), ()):
+            if etat not in vivants:
+                vivants.add(etat)
+                a_visiter.append(etat)
+    return tous - vivants
+
+
+class RapportAnalyse:
+    """
+    Résultat de l'analyse statique d'une machine (voir analyser()).
+
+    Attributes:
+        etats_accessibles (Set[str]): États atteignables depuis l'état initial
+        etats_inaccessibles (Set[str]): États jamais atteints
+        symboles_possibles (Set[str]): Symboles pouvant apparaître sur le ruban
+        paires_impossibles (Set[Tuple[str, str]]): Transitions définies qui ne
+            peuvent jamais s'appliquer
+        etats_morts (Set[str]): États ne pouvant plus mener à un état final
+        classes (List[Set[str]]): Classes d'états équivalents (plus d'un état)
+        transitions_minimisees (Dict): Table minimisée
+        representants (Dict[str, str]): État -> représentant de sa classe
+    """
+
+    def __init__(self, transitions: Transitions, etat_initial: str, etats_finaux: Set[str],
+                 etats: Set[str], alphabet_entree: Set[str], symbole_blanc: str):
+        self.nb_transitions = len(transitions)
+
+        # Point fixe : états accessibles et symboles pouvant être lus
+        self.etats_accessibles = {etat_initial}
+        self.symboles_possibles = set(alphabet_entree) | {symbole_blanc}
+        possibles: Transitions = {}
+        change = True
+        while change:
+            change = False
+            for (etat, lu), action in transitions.items():
+                if ((etat, lu) in possibles or etat in etats_finaux or etat not in self.etats_accessibles
+                        or lu not in self.symboles_possibles):
+                    continue
+                possibles[(etat, lu)] = action
+                self.etats_accessibles.add(action[0])
+                self.symboles_possibles.add(action[1])
+                change = True
+
+        tous = set(etats) | set(etats_finaux) | {etat for cle, action in transitions.items()
+                                                 for etat in (cle[0], action[0])}
+        self.etats_inaccessibles = tous - self.etats_accessibles
+        self.paires_impossibles = set(transitions) - set(possibles)
+        self.etats_morts = etats_morts(transitions, etats_finaux, etats)
+
+        # Raffinement de partition sur les états accessibles
+        symboles = sorted(self.symboles_possibles)
+        accessibles = sorted(self.etats_accessibles)
+        bloc = {etat: int(etat in etats_finaux) for etat in accessibles}
+        nb_blocs = len(set(bloc.values()))
+        while True:
+            signatures = {}
+            for etat in accessibles:
+                if etat in etats_finaux:
+                    signature = ('final',)
+                else:
+                    signature = tuple(
+                        None if (etat, s) not in possibles else
+                        (possibles[(etat, s)][1], DEPLACEMENTS.get(possibles[(etat, s)][2], 0),
+                         bloc[possibles[(etat, s)][0]])
+                        for s in symboles)
+                signatures[etat] = (bloc[etat], signature)
+            distinctes = sorted(set(signatures.values()), key=repr)
+            numeros = {signature: numero for numero, signature in enumerate(distinctes)}
+            bloc = {etat: numeros[signatures[etat]] for etat in accessibles}
+            if len(numeros) == nb_blocs:
+                break
+            nb_blocs = len(numeros)
+
+        membres: Dict[int, List[str]] = {}
+        for etat in accessibles:
+            membres.setdefault(bloc[etat], []).append(etat)
+        self.representants = {}
+        for groupe in membres.values():
+            representant = etat_initial if etat_initial in groupe else min(groupe)
+            for etat in groupe:
+                self.representants[etat] = representant
+        self.classes = [set(groupe) for groupe in membres.values() if len(groupe) > 1]
+
+        self.transitions_minimisees: Transitions = {}
+        for (etat, lu), (nouvel_etat, ecrit, direction) in possibles.items():
+            if self.representants[etat] == etat:
+                self.transitions_minimisees[(etat, lu)] = (self.representants[nouvel_etat], ecrit, direction)
+
+    def lignes(self) -> List[str]:
+        """Résumé lisible du rapport, une ligne par constat."""
+        def liste(elements):
+            elements = sorted(map(str, elements))
+            return ', '.join(elements) if elements else 'aucun'
+        return [
+            f"États inaccessibles : {liste(self.etats_inaccessibles)}",
+            f"Transitions impossibles : {liste(f'δ({q}, {s})' for q, s in self.paires_impossibles)}",
+            f"États morts (ne mènent à aucun état final) : {liste(self.etats_morts)}",
+            f"États fusionnables : {liste('{' + ', '.join(sorted(c)) + '}' for c in self.classes)}",
+            f"Table minimisée : {len(self.transitions_minimisees)} transitions "
+            f"(au lieu de {self.nb_transitions}), {len(set(self.representants.values()))} états",
+        ]
+
+
+def analyser(machine) -> RapportAnalyse:
+    """
+    Analyse statiquement une MachineDeTuring.
+
+    Args:
+        machine (MachineDeTuring): Machine à analyser
+
+    Returns:
+        RapportAnalyse: États inaccessibles, couples impossibles, états
+                        morts, états fusionnables et table minimisée
+    """
+    return RapportAnalyse(machine.transitions, machine.etat_initial, machine.etats_finaux,
+                          machine.etats, machine.alphabet_entree, machine.symbole_blanc)
+
+
+def minimiser(machine):
+    """
+    Construit la machine minimisée équivalente (voir RapportAnalyse).
+
+    Args:
+        machine (MachineDeTuring): Machine d'origine
+
+    Returns:
+        MachineDeTuring: Machine de même type, sur la table minimisée ;
+            mêmes acceptations, rubans et nombres d'étapes pour les mots
+            sur l'alphabet d'entrée (les états portent le nom du
+            représentant de leur classe)
+    """
+    rapport = analyser(machine)
+    etats = set(rapport.representants.values())
+    return type(machine)(etats, set(machine.alphabet_entree), set(machine.alphabet_travail),
+                         rapport.transitions_minimisees, machine.etat_initial,
+                         {etat for etat in machine.etats_finaux if etat in etats}, machine.symbole_blanc)
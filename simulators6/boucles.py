@@ -0,0 +1,123 @@
+"""
+Détection exacte des boucles infinies par hachage de Zobrist.
+
+Une configuration (état, position de la tête, contenu du ruban) est résumée
+par un haché de 64 bits : le XOR d'une clé pseudo-aléatoire pour l'état,
+d'une clé pour la position de la tête et d'une clé pour chaque case non
+blanche (position, symbole). Une transition ne modifie qu'une case, l'état
+et la tête : le haché se met à jour en O(1) par étape.
+
+Une machine déterministe boucle indéfiniment dès qu'une configuration se
+répète. Lorsqu'un haché réapparaît, la répétition est confirmée en
+rejouant le cycle sur une copie de la configuration, ce qui élimine les
+collisions : le diagnostic est exact.
+"""
+from typing import Callable, Collection, Dict, Hashable, Iterable, Optional, Tuple
+
+MASQUE = (1 << 64) - 1
+
+
+def _melanger(x: int) -> int:
+    """Fonction de mélange splitmix64 (répartit les bits d'un entier)."""
+    x = (x + 0x9E3779B97F4A7C15) & MASQUE
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASQUE
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASQUE
+    return x ^ (x >> 31)
+
+
+def cle(*valeurs: Hashable) -> int:
+    """Clé de Zobrist (64 bits) associée à un tuple de valeurs."""
+    return _melanger(hash(valeurs) & MASQUE)
+
+
+class DetecteurBoucle:
+    """
+    Haché incrémental de la configuration d'une machine à un ruban.
+
+    Les états, positions et symboles peuvent être des chaînes ou des codes
+    entiers, pourvu que le même codage soit utilisé pendant toute
+    l'exécution. Les positions doivent être logiques (indépendantes des
+    extensions du ruban vers la gauche).
+
+    Attributes:
+        empreinte (int): Haché de la configuration courante
+    """
+
+    def __init__(self, etat: Hashable, tete: int, cases: Iterable[Tuple[int, Hashable]], blanc: Hashable):
+        """
+        Args:
+            etat: État initial
+            tete (int): Position logique initiale de la tête
+            cases: Couples (position logique, symbole) du ruban initial
+            blanc: Symbole blanc (les cases blanches ne contribuent pas au haché)
+        """
+        self.blanc = blanc
+        self.empreinte = cle('etat', etat) ^ cle('tete', tete)
+        for position, symbole in cases:
+            self.empreinte ^= self._case(position, symbole)
+        self._vues: Dict[int, int] = {}
+
+    def _case(self, position: int, symbole: Hashable) -> int:
+        return 0 if symbole == self.blanc else cle(position, symbole)
+
+    def observer(self, etape: int) -> Optional[int]:
+        """
+        Enregistre la configuration courante.
+
+        Args:
+            etape (int): Numéro de l'étape courante
+
+        Returns:
+            Optional[int]: Étape antérieure ayant le même haché, ou None
+        """
+        precedente = self._vues.get(self.empreinte)
+        if precedente is None:
+            self._vues[self.empreinte] = etape
+        return precedente
+
+    def appliquer(self, etat: Hashable, tete: int, lu: Hashable, ecrit: Hashable,
+                  nouvel_etat: Hashable, nouvelle_tete: int):
+        """Met à jour le haché pour une transition (O(1))."""
+        empreinte = self.empreinte
+        if lu != ecrit:
+            empreinte ^= self._case(tete, lu) ^ self._case(tete, ecrit)
+        if etat != nouvel_etat:
+            empreinte ^= cle('etat', etat) ^ cle('etat', nouvel_etat)
+        if tete != nouvelle_tete:
+            empreinte ^= cle('tete', tete) ^ cle('tete', nouvelle_tete)
+        self.empreinte = empreinte
+
+
+def confirmer_cycle(transitions: Dict, etat: str, tete: int, cases: Dict[int, str], blanc: str,
+                    longueur: int, deplacement: Callable[[str], int], etats_finaux: Collection[str] = ()) -> bool:
+    """
+    Vérifie qu'une configuration se retrouve identique après ``longueur`` étapes.
+
+    Args:
+        transitions (Dict): Fonction de transition {(état, symbole): (état, symbole, direction)}
+        etat (str): État de la configuration
+        tete (int): Position logique de la tête
+        cases (Dict[int, str]): Cases non blanches, par position logique
+        blanc (str): Symbole blanc
+        longueur (int): Longueur du cycle supposé
+        deplacement (Callable[[str], int]): Déplacement de la tête pour une direction
+        etats_finaux (Collection[str], optional): États où la machine s'arrête
+
+    Returns:
+        bool: True si la configuration se répète (la machine ne s'arrête jamais)
+    """
+    depart = (etat, tete, cases)
+    cases = dict(cases)
+    for _ in range(longueur):
+        if etat in etats_finaux:
+            return False
+        transition = transitions.get((etat, cases.get(tete, blanc)))
+        if transition is None:
+            return False
+        etat, ecrit, direction = transition
+        if ecrit == blanc:
+            cases.pop(tete, None)
+        else:
+            cases[tete] = ecrit
+        tete += deplacement(direction)
+    return (etat, tete, cases) == depart
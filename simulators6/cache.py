@@ -0,0 +1,314 @@
+"""
+Cache des résultats d'exécution, indexé par empreinte canonique de la machine.
+
+L'empreinte d'une fonction de transition ne dépend pas du nom des états :
+les états sont renumérotés par un parcours en largeur depuis l'état
+initial (symboles dans l'ordre croissant), puis la table renumérotée est
+hachée (SHA-256). Deux machines qui ne diffèrent que par le nom de leurs
+états partagent donc leurs résultats ; les états présents dans un résultat
+(état final, trace) sont stockés sous forme canonique et renommés à la
+lecture.
+
+La clé d'un résultat est (moteur, empreinte, entrée, budget d'étapes,
+options). Les résultats sont conservés dans un cache LRU limité en octets
+(taille sérialisée), doublé d'un répertoire optionnel sur disque.
+"""
+import hashlib
+import os
+import pickle
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from simulators6.compilation import DEPLACEMENTS
+from simulators6.options_trace import FULL
+from simulators6.trace_execution import TraceExecution
+
+ABSENT = object()
+
+
+def empreinte_machine(transitions: Dict[Tuple[str, str], Tuple[str, str, str]], etat_initial: str,
+                      etats_finaux: Set[str], blanc: str,
+                      deplacement: Callable[[str], int] = lambda direction: DEPLACEMENTS.get(direction, 0)
+                      ) -> Tuple[str, Dict[str, int]]:
+    """
+    Calcule l'empreinte canonique d'une fonction de transition.
+
+    Args:
+        transitions (Dict): Transitions {(état, symbole): (état, symbole, direction)}
+        etat_initial (str): État de départ
+        etats_finaux (Set[str]): États d'acceptation
+        blanc (str): Symbole blanc
+        deplacement (Callable[[str], int], optional): Déplacement associé à
+            une direction (par défaut celui de MachineDeTuring)
+
+    Returns:
+        Tuple[str, Dict[str, int]]: Empreinte hexadécimale et numérotation
+            canonique des états accessibles depuis l'état initial
+
+    Note:
+        Les états inaccessibles n'influencent aucune exécution et ne font
+        pas partie de l'empreinte.
+    """
+    sortantes: Dict[str, List[Tuple[str, Tuple[str, str, str]]]] = {}
+    for (etat, symbole), action in transitions.items():
+        sortantes.setdefault(etat, []).append((symbole, action))
+
+    numeros = {etat_initial: 0}
+    a_visiter = deque([etat_initial])
+    canonique = []
+    while a_visiter:
+        etat = a_visiter.popleft()
+        for symbole, (nouvel_etat, ecrit, direction) in sorted(sortantes.get(etat, ()), key=lambda t: t[0]):
+            if nouvel_etat not in numeros:
+                numeros[nouvel_etat] = len(numeros)
+                a_visiter.append(nouvel_etat)
+            canonique.append((numeros[etat], symbole, numeros[nouvel_etat], ecrit, deplacement(direction)))
+
+    finaux = sorted(numero for etat, numero in numeros.items() if etat in etats_finaux)
+    texte = repr((blanc, finaux, canonique)).encode('utf-8')
+    return hashlib.sha256(texte).hexdigest(), numeros
+
+
+class CacheResultats:
+    """
+    Cache LRU de résultats, limité en octets, avec niveau disque optionnel.
+
+    Attributes:
+        budget (int): Taille maximale des valeurs en mémoire (octets, sérialisées)
+        repertoire (Optional[str]): Répertoire du niveau disque (None : désactivé)
+        succes (int): Nombre de lectures servies depuis la mémoire
+        succes_disque (int): Nombre de lectures servies depuis le disque
+        echecs (int): Nombre de lectures sans résultat
+    """
+
+    def __init__(self, budget: int = 64 * 1024 * 1024, repertoire: Optional[str] = None):
+        self.budget = budget
+        self.repertoire = repertoire
+        self._entrees: 'OrderedDict[Hashable, Tuple[bytes, int]]' = OrderedDict()
+        self.octets = 0
+        self.succes = 0
+        self.succes_disque = 0
+        self.echecs = 0
+        if repertoire:
+            os.makedirs(repertoire, exist_ok=True)
+
+    def _chemin(self, cle: Hashable) -> str:
+        return os.path.join(self.repertoire, hashlib.sha256(repr(cle).encode('utf-8')).hexdigest() + '.pkl')
+
+    def lire(self, cle: Hashable) -> Any:
+        """
+        Retourne la valeur associée à une clé, ou ABSENT.
+
+        Note:
+            Une valeur trouvée sur disque est remontée en mémoire.
+        """
+        entree = self._entrees.get(cle)
+        if entree is not None:
+            self._entrees.move_to_end(cle)
+            self.succes += 1
+            return pickle.loads(entree[0])
+        if self.repertoire:
+            try:
+                with open(self._chemin(cle), 'rb') as fichier:
+                    donnees = fichier.read()
+            except OSError:
+                donnees = None
+            if donnees is not None:
+                self.succes_disque += 1
+                self._garder(cle, donnees)
+                return pickle.loads(donnees)
+        self.echecs += 1
+        return ABSENT
+
+    def ecrire(self, cle: Hashable, valeur: Any):
+        """Enregistre une valeur (en mémoire si elle tient dans le budget, et sur disque)."""
+        donnees = pickle.dumps(valeur, protocol=pickle.HIGHEST_PROTOCOL)
+        self._garder(cle, donnees)
+        if self.repertoire:
+            chemin = self._chemin(cle)
+            temporaire = f"{chemin}.{os.getpid()}.tmp"
+            with open(temporaire, 'wb') as fichier:
+                fichier.write(donnees)
+            os.replace(temporaire, chemin)
+
+    def _garder(self, cle: Hashable, donnees: bytes):
+        """Place des données en mémoire en évinçant les moins récemment utilisées."""
+        if cle in self._entrees:
+            self.octets -= self._entrees.pop(cle)[1]
+        if len(donnees) > self.budget:
+            return
+        self._entrees[cle] = (donnees, len(donnees))
+        self.octets += len(donnees)
+        while self.octets > self.budget:
+            _, (_, taille) = self._entrees.popitem(last=False)
+            self.octets -= taille
+
+    def vider(self):
+        """Vide le niveau mémoire et remet les statistiques à zéro."""
+        self._entrees.clear()
+        self.octets = 0
+        self.succes = self.succes_disque = self.echecs = 0
+
+    def statistiques(self) -> Dict[str, int]:
+        """Retourne les compteurs de succès/échecs et l'occupation mémoire."""
+        return {
+            'succes': self.succes,
+            'succes_disque': self.succes_disque,
+            'echecs': self.echecs,
+            'entrees': len(self._entrees),
+            'octets': self.octets,
+        }
+
+
+# Cache partagé par défaut
+CACHE = CacheResultats()
+
+
+def noms_etats(numeros: Dict[str, int]) -> List[str]:
+    """Table inverse : numéro canonique -> nom d'état."""
+    noms = [''] * len(numeros)
+    for etat, numero in numeros.items():
+        noms[numero] = etat
+    return noms
+
+
+def executer_en_cache(machine, mot: str, max_etapes: int = 1000, trace: str = FULL,
+                      detecter_boucles: bool = False, cache: Optional[CacheResultats] = None,
+                      rapide: bool = False, minimiser: bool = False) -> Dict:
+    """
+    MachineDeTuring.executer avec mise en cache du résultat.
+
+    Args:
+        machine (MachineDeTuring): Machine à exécuter
+        mot, max_etapes, trace, detecter_boucles: Comme pour executer()
+        cache (CacheResultats, optional): Cache à utiliser. Défaut: CACHE
+        rapide (bool, optional): Exécute avec executer_rapide() (même
+            résultat, même entrée de cache). Défaut: False
+        minimiser (bool, optional): Comme pour executer_rapide() (implique
+            rapide). Défaut: False
+
+    Returns:
+        Dict: Même résultat que executer() ; une trace complète reste une
+              TraceExecution compacte (détachée du ruban de la machine),
+              les autres niveaux donnent une liste de dictionnaires
+
+    Note:
+        En cas de succès, l'état de la machine (ruban, tête, état courant,
+        compteur d'étapes, trace) est restauré comme après executer().
+        Une trace complète est stockée sous sa forme compacte, états
+        renumérotés (voir TraceExecution.renommer) : aucune configuration
+        n'est construite pour la mettre en cache.
+    """
+    cache = CACHE if cache is None else cache
+    empreinte, numeros = empreinte_machine(machine.transitions, machine.etat_initial,
+                                           machine.etats_finaux, machine.symbole_blanc)
+    cle = ('executer', empreinte, mot, max_etapes, str(trace), detecter_boucles, minimiser)
+    stocke = cache.lire(cle)
+
+    if stocke is ABSENT:
+        if rapide or minimiser:
+            resultat = machine.executer_rapide(mot, max_etapes, trace, detecter_boucles, minimiser=minimiser)
+        else:
+            resultat = machine.executer(mot, max_etapes, trace, detecter_boucles)
+        if isinstance(resultat['trace'], TraceExecution):
+            resultat['trace'] = resultat['trace'].renommer(lambda etat: etat)
+            trace_canonique = resultat['trace'].renommer(numeros.__getitem__)
+        else:
+            resultat['trace'] = list(resultat['trace'])
+            trace_canonique = [dict(entree, etat=numeros[entree['etat']]) for entree in resultat['trace']]
+        ruban = machine.ruban
+        stocke = (
+            dict(resultat, etat_final=numeros[resultat['etat_final']], trace=trace_canonique),
+            ([ruban.symboles[code] for code in ruban.cases[ruban.debut:]], ruban.origine - ruban.debut,
+             machine.position_tete),
+        )
+        cache.ecrire(cle, stocke)
+        machine.trace = resultat['trace']
+        return resultat
+
+    noms = noms_etats(numeros)
+    resultat, (cases, origine, tete) = stocke
+    resultat['etat_final'] = noms[resultat['etat_final']]
+    if isinstance(resultat['trace'], TraceExecution):
+        resultat['trace'] = resultat['trace'].renommer(noms.__getitem__)
+    else:
+        resultat['trace'] = [dict(entree, etat=noms[entree['etat']]) for entree in resultat['trace']]
+    machine.ruban.charger(cases)
+    machine.ruban.origine = origine
+    machine.position_tete = tete
+    machine.etat_courant = resultat['etat_final']
+    machine.nb_etapes = resultat['nb_etapes']
+    machine.trace = resultat['trace']
+    return resultat
+
+
+def simulate_en_cache(dtm, input_tape: str, trace: str = FULL, detect_loops: bool = False,
+                      cache: Optional[CacheResultats] = None) -> Dict:
+    """
+    DeterministicTuringMachine.simulate avec mise en cache du résultat.
+
+    Args:
+        dtm (DeterministicTuringMachine): Machine à simuler
+        input_tape, trace, detect_loops: Comme pour simulate()
+        cache (CacheResultats, optional): Cache à utiliser. Défaut: CACHE
+
+    Returns:
+        Dict: Même résultat que simulate()
+
+    Note:
+        Les configurations de 'path' ont la forme "état|ruban" ; les noms
+        d'états ne doivent pas contenir '|'.
+    """
+    cache = CACHE if cache is None else cache
+    empreinte, numeros = empreinte_machine(dtm.transitions, dtm.start_state, dtm.accept_states, '_',
+                                           lambda direction: 1 if direction == 'R' else -1)
+    cle = ('simulate', empreinte, input_tape, str(trace), detect_loops)
+    stocke = cache.lire(cle)
+
+    if stocke is ABSENT:
+        resultat = dtm.simulate(input_tape, trace, detect_loops)
+        chemin = [config.partition('|') for config in resultat['path']]
+        cache.ecrire(cle, dict(resultat, path=[(numeros[etat], reste) for etat, _, reste in chemin]))
+        return resultat
+
+    noms = noms_etats(numeros)
+    stocke['path'] = [f"{noms[etat]}|{reste}" for etat, reste in stocke['path']]
+    return stocke
+
+
+def run_en_cache(utm, max_steps: int = 1000, detect_loops: bool = False,
+                 cache: Optional[CacheResultats] = None) -> bool:
+    """
+    UniversalTuringMachine.run avec mise en cache du résultat.
+
+    Args:
+        utm (UniversalTuringMachine): Machine universelle (ruban déjà chargé)
+        max_steps, detect_loops: Comme pour run()
+        cache (CacheResultats, optional): Cache à utiliser. Défaut: CACHE
+
+    Returns:
+        bool: Même résultat que run()
+
+    Note:
+        La clé porte sur la configuration de départ (état, ruban, tête) ;
+        en cas de succès, le ruban, la tête, l'état, le compteur d'étapes
+        et ``loop`` sont restaurés comme après run().
+    """
+    cache = CACHE if cache is None else cache
+    empreinte, numeros = empreinte_machine(utm.transitions, utm.state, set(utm.accept_states), utm.blank,
+                                           lambda direction: 1 if direction == 'R' else -1)
+    cle = ('run', empreinte, tuple(utm.tape), utm.head, max_steps, detect_loops)
+    stocke = cache.lire(cle)
+
+    if stocke is ABSENT:
+        origine, etapes = utm.origin, utm.steps
+        accepte = utm.run(max_steps, detect_loops)
+        cache.ecrire(cle, (accepte, list(utm.tape), utm.head, utm.origin - origine, utm.steps - etapes,
+                           numeros[utm.state], utm.loop))
+        return accepte
+
+    accepte, utm.tape, utm.head, decalage, etapes, etat, utm.loop = stocke
+    utm.origin += decalage
+    utm.steps += etapes
+    utm.state = noms_etats(numeros)[etat]
+    return accepte
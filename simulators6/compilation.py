@@ -0,0 +1,197 @@
+import base64
+import re
+import sys
+from array import array
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# Déplacement de la tête pour chaque direction acceptée par MachineDeTuring
+DEPLACEMENTS = {'L': -1, 'G': -1, 'R': 1, 'D': 1}
+
+
+class TableCompilee:
+    """
+    Fonction de transition compilée en entiers denses.
+
+    Les états et les symboles sont numérotés de façon contiguë et les
+    transitions sont rangées dans une liste plate indexée par
+    ``etat * nb_symboles + symbole``. Chaque case contient le triplet
+    ``(nouvel_etat, symbole_ecrit, deplacement)`` ou ``None`` si aucune
+    transition n'est définie. Une étape d'exécution se réduit ainsi à un
+    seul accès indexé, sans construction de tuple-clé ni hachage de chaînes.
+
+    La compilation repère aussi les balayages : pour un état q et une
+    direction d, l'ensemble des symboles s tels que δ(q, s) = (q, s, d).
+    Tant que la tête lit un de ces symboles, la machine ne fait que se
+    déplacer ; le moteur peut alors sauter directement à la première case
+    hors de l'ensemble (voir Balayage).
+
+    Attributes:
+        etats (List[str]): Table code -> état (l'état initial a le code 0)
+        codes_etats (Dict[str, int]): Table état -> code
+        symboles (List[str]): Table code -> symbole (partagée avec le ruban)
+        nb_symboles (int): Nombre de symboles, pas de la table plate
+        actions (List[Optional[Tuple[int, int, int]]]): Transitions compilées
+        balayages (List[Optional[Balayage]]): Balayage associé à chaque case
+            de la table (None si la transition n'est pas une boucle de balayage)
+        finaux (bytearray): Indicateur d'état final pour chaque code d'état
+        morts (bytearray): Indicateur d'état mort (sans transition sortante
+            dans la table, voir analyse.etats_morts)
+        initial (int): Code de l'état initial
+    """
+
+    def __init__(self, transitions: Dict[Tuple[str, str], Tuple[str, str, str]],
+                 etat_initial: str, etats_finaux: Set[str], codes_symboles: Dict[str, int],
+                 symboles: List[str], etats: Set[str] = frozenset(), etats_morts: Set[str] = frozenset()):
+        """
+        Compile une fonction de transition.
+
+        Args:
+            transitions (Dict): Transitions au format de MachineDeTuring
+            etat_initial (str): État de départ
+            etats_finaux (Set[str]): États d'acceptation
+            codes_symboles (Dict[str, int]): Codes des symboles du ruban
+            symboles (List[str]): Symboles du ruban, dans l'ordre des codes
+            etats (Set[str], optional): États déclarés par la machine
+            etats_morts (Set[str], optional): États dont les transitions
+                sortantes sont retirées : une exécution s'y arrête aussitôt
+
+        Note:
+            Tous les symboles des transitions doivent déjà être internés
+            dans ``codes_symboles`` (voir MachineDeTuring.compiler).
+        """
+        noms = set(etats) | set(etats_finaux)
+        for (etat, _), (nouvel_etat, _, _) in transitions.items():
+            noms.add(etat)
+            noms.add(nouvel_etat)
+        noms.discard(etat_initial)
+
+        self.etats = [etat_initial] + sorted(noms)
+        self.codes_etats = {etat: code for code, etat in enumerate(self.etats)}
+        self.symboles = list(symboles)
+        self.nb_symboles = len(self.symboles)
+        self.initial = 0
+        self.finaux = bytearray(etat in etats_finaux for etat in self.etats)
+        self.morts = bytearray(etat in etats_morts for etat in self.etats)
+
+        n = self.nb_symboles
+        self.actions: List[Optional[Tuple[int, int, int]]] = [None] * (len(self.etats) * n)
+        for (etat, symbole), (nouvel_etat, ecrit, direction) in transitions.items():
+            if etat in etats_morts:
+                continue
+            self.actions[self.codes_etats[etat] * n + codes_symboles[symbole]] = (
+                self.codes_etats[nouvel_etat],
+                codes_symboles[ecrit],
+                DEPLACEMENTS.get(direction, 0),
+            )
+
+        self.balayages: List[Optional[Balayage]] = [None] * len(self.actions)
+        for etat in range(len(self.etats)):
+            for deplacement in (1, -1):
+                indices = [etat * n + symbole for symbole in range(n)
+                           if self.actions[etat * n + symbole] == (etat, symbole, deplacement)]
+                if indices:
+                    balayage = Balayage(deplacement, [i - etat * n for i in indices], n)
+                    for i in indices:
+                        self.balayages[i] = balayage
+
+
+    def en_donnees(self) -> Dict:
+        """
+        Table sous forme sérialisable en JSON (entiers et chaînes seulement).
+
+        Returns:
+            Dict: 'etats', 'symboles', 'finaux', 'morts', 'actions' (triplets
+                  à plat, -1 pour une case sans transition, en entiers 32 bits
+                  encodés en base64 : le décodage ne lit pas un entier à la
+                  fois), 'ordre' (ordre des octets) et 'balayages'
+                  ([déplacement, [cases de la table]] par balayage)
+        """
+        actions = array('i')
+        for action in self.actions:
+            actions.extend((-1, 0, 0) if action is None else action)
+        balayages = {}
+        for i, balayage in enumerate(self.balayages):
+            if balayage is not None:
+                balayages.setdefault(id(balayage), (balayage.deplacement, []))[1].append(i)
+        return {
+            'etats': self.etats,
+            'symboles': self.symboles,
+            'finaux': list(self.finaux),
+            'morts': list(self.morts),
+            'actions': base64.b64encode(actions.tobytes()).decode('ascii'),
+            'ordre': sys.byteorder,
+            'balayages': [[deplacement, cases] for deplacement, cases in balayages.values()],
+        }
+
+    @classmethod
+    def depuis_donnees(cls, donnees: Dict) -> 'TableCompilee':
+        """
+        Reconstruit une table à partir de en_donnees(), sans recompiler.
+
+        Raises:
+            ValueError: Si les données sont incohérentes
+        """
+        table = cls.__new__(cls)
+        table.etats = list(donnees['etats'])
+        table.codes_etats = {etat: code for code, etat in enumerate(table.etats)}
+        table.symboles = list(donnees['symboles'])
+        table.nb_symboles = n = len(table.symboles)
+        table.initial = 0
+        table.finaux = bytearray(donnees['finaux'])
+        table.morts = bytearray(donnees['morts'])
+        plates = array('i', base64.b64decode(donnees['actions']))
+        if donnees['ordre'] != sys.byteorder:
+            plates.byteswap()
+        taille = len(table.etats) * n
+        if len(plates) != 3 * taille or not len(table.finaux) == len(table.morts) == len(table.etats):
+            raise ValueError("Table compilée incohérente")
+        table.actions = [None if action[0] < 0 else action
+                         for action in zip(plates[0::3], plates[1::3], plates[2::3])]
+        table.balayages = [None] * taille
+        for deplacement, cases in donnees['balayages']:
+            etat = cases[0] // n
+            balayage = Balayage(deplacement, [i - etat * n for i in cases], n)
+            for i in cases:
+                table.balayages[i] = balayage
+        return table
+
+
+class Balayage:
+    """
+    Parcours d'une suite de cases qui bouclent sur le même état.
+
+    Attributes:
+        deplacement (int): +1 (droite) ou -1 (gauche)
+        symboles (Set[int]): Codes des symboles parcourus sans modification
+    """
+
+    def __init__(self, deplacement: int, symboles: List[int], nb_symboles: int):
+        self.deplacement = deplacement
+        self.symboles = set(symboles)
+        self._autres = [code for code in range(nb_symboles) if code not in self.symboles]
+        # Première case hors de l'ensemble, vers la droite : recherche en C par expression régulière
+        self._motif = re.compile(b'[^' + b''.join(b'\\x%02x' % code for code in sorted(self.symboles)) + b']')
+
+    def longueur(self, cases: bytearray, position: int, debut: int) -> int:
+        """
+        Nombre de cases consécutives de l'ensemble à partir de ``position``.
+
+        Args:
+            cases (bytearray): Tampon du ruban
+            position (int): Indice de la tête (la case lue est dans l'ensemble)
+            debut (int): Indice de la première case du ruban
+
+        Returns:
+            int: Nombre d'étapes du balayage, jusqu'à la première case hors
+                 de l'ensemble ou jusqu'au bord du ruban (au moins 1)
+        """
+        if self.deplacement > 0:
+            fin = self._motif.search(cases, position)
+            return (fin.start() if fin else len(cases)) - position
+        fin = debut - 1
+        for code in self._autres:
+            trouve = cases.rfind(code, fin + 1, position)
+            if trouve > fin:
+                fin = trouve
+        return position - fin
@@ -0,0 +1,361 @@
+"""
+Format de fichier JSON des machines de Turing, avec cache JSON de la table compilée.
+
+Un fichier décrit une machine déterministe, non déterministe ou à k rubans :
+
+    {
+      "type": "deterministe",            // ou "non_deterministe", "multi_rubans"
+      "nom": "Palindromes",              // facultatif
+      "rubans": 2,                       // "multi_rubans" uniquement
+      "etat_initial": "q0",
+      "etats_finaux": ["q_accept"],
+      "blanc": "_",                      // facultatif ('_', ou 'B' à k rubans)
+      "etats": ["q0", "q1", "q_accept"], // facultatif (déduit des transitions)
+      "alphabet_entree": ["a", "b"],     // facultatif
+      "transitions": [
+        ["q0", "a", "q1", "X", "R"]      // état, lu, nouvel état, écrit, direction
+      ]
+    }
+
+À k rubans, « lu », « écrit » et « direction » sont des listes de k
+éléments ; un symbole lu peut valoir "*" (n'importe quel symbole) et un
+symbole écrit "=" (réécrire le symbole lu), voir simulators8.patterns.
+Une machine non déterministe peut avoir plusieurs transitions pour un
+même couple (état, symbole).
+
+Le chargement valide le fichier, construit le moteur correspondant
+(MachineDeTuring, NondeterministicTuringMachine ou MultiTapeTuringMachine)
+et, pour une machine déterministe, compile sa table (TableCompilee). La
+définition validée et la table compilée (entiers et chaînes, voir
+TableCompilee.en_donnees) sont conservées sur disque au format JSON,
+indexées par le haché du contenu du fichier : un nouveau chargement du
+même fichier saute la validation et la compilation. Le cache est propre à
+l'utilisateur (répertoire en mode 0700, dont le propriétaire est vérifié
+avant lecture) et ne contient aucun objet Python sérialisé : un fichier de
+cache n'exécute jamais de code.
+"""
+import getpass
+import hashlib
+import json
+import os
+import stat
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from simulators6.compilation import TableCompilee
+from simulators6.machin_de_turing import MachineDeTuring
+from simulators8.patterns import ANY, SAME
+from simulators8.tm_multi import MultiTapeTuringMachine
+from simulators10.tmsim import NondeterministicTuringMachine
+
+DETERMINISTE = 'deterministe'
+NON_DETERMINISTE = 'non_deterministe'
+MULTI_RUBANS = 'multi_rubans'
+TYPES = (DETERMINISTE, NON_DETERMINISTE, MULTI_RUBANS)
+
+# Directions acceptées par chaque moteur
+DIRECTIONS = {
+    DETERMINISTE: {'L', 'R', 'S', 'G', 'D'},
+    NON_DETERMINISTE: {'L', 'R'},
+    MULTI_RUBANS: {'L', 'R', 'S'},
+}
+# Symbole blanc imposé par les moteurs non déterministe et à k rubans
+BLANCS = {NON_DETERMINISTE: '_', MULTI_RUBANS: 'B'}
+
+# Version du contenu du cache (à incrémenter si les moteurs changent de structure)
+VERSION_CACHE = 5
+REPERTOIRE_CACHE = os.path.join(tempfile.gettempdir(), f'machines_turing_compilees-{getpass.getuser()}')
+
+
+def _verifier_symbole(valeur: Any, contexte: str) -> str:
+    if not isinstance(valeur, str) or not valeur:
+        raise ValueError(f"{contexte} : symbole ou état invalide {valeur!r} (chaîne non vide attendue)")
+    return valeur
+
+
+def _verifier_liste(valeur: Any, k: int, contexte: str) -> List[str]:
+    if not isinstance(valeur, list) or len(valeur) != k:
+        raise ValueError(f"{contexte} : liste de {k} éléments attendue, reçu {valeur!r}")
+    return [_verifier_symbole(element, contexte) for element in valeur]
+
+
+def valider(donnees: Dict) -> Dict:
+    """
+    Valide une définition de machine et la normalise.
+
+    Args:
+        donnees (Dict): Contenu JSON décodé
+
+    Returns:
+        Dict: Définition complète : 'type', 'nom', 'rubans', 'etat_initial',
+              'etats_finaux', 'blanc', 'etats', 'alphabet_entree',
+              'alphabet_travail' et 'transitions' au format du moteur
+
+    Raises:
+        ValueError: Si la définition est incomplète ou incohérente
+    """
+    if not isinstance(donnees, dict):
+        raise ValueError("La définition doit être un objet JSON")
+    type_machine = donnees.get('type', DETERMINISTE)
+    if type_machine not in TYPES:
+        raise ValueError(f"Type de machine inconnu : {type_machine!r} (attendu : {', '.join(TYPES)})")
+    for cle in ('etat_initial', 'transitions'):
+        if cle not in donnees:
+            raise ValueError(f"Champ obligatoire manquant : '{cle}'")
+
+    k = donnees.get('rubans', 1) if type_machine == MULTI_RUBANS else 1
+    if not isinstance(k, int) or k < 1:
+        raise ValueError(f"Nombre de rubans invalide : {k!r}")
+    blanc = _verifier_symbole(donnees.get('blanc', BLANCS.get(type_machine, '_')), 'blanc')
+    if type_machine in BLANCS and blanc != BLANCS[type_machine]:
+        raise ValueError(f"Le moteur '{type_machine}' utilise le blanc '{BLANCS[type_machine]}'")
+    etat_initial = _verifier_symbole(donnees['etat_initial'], 'etat_initial')
+    etats_finaux = [_verifier_symbole(etat, 'etats_finaux') for etat in donnees.get('etats_finaux', [])]
+    directions = DIRECTIONS[type_machine]
+
+    etats = {etat_initial, *etats_finaux}
+    symboles = {blanc}
+    transitions: Dict = {}
+    if not isinstance(donnees['transitions'], list):
+        raise ValueError("'transitions' doit être une liste")
+    for numero, ligne in enumerate(donnees['transitions']):
+        contexte = f"transition n°{numero}"
+        if not isinstance(ligne, list) or len(ligne) != 5:
+            raise ValueError(f"{contexte} : [état, lu, nouvel état, écrit, direction] attendu, reçu {ligne!r}")
+        etat, lu, nouvel_etat, ecrit, direction = ligne
+        etat = _verifier_symbole(etat, contexte)
+        nouvel_etat = _verifier_symbole(nouvel_etat, contexte)
+        if type_machine == MULTI_RUBANS:
+            lu, ecrit = _verifier_liste(lu, k, contexte), _verifier_liste(ecrit, k, contexte)
+            direction = _verifier_liste(direction, k, contexte)
+            cle, action = (etat, *lu), (nouvel_etat, ecrit, direction)
+        else:
+            lu, ecrit = _verifier_symbole(lu, contexte), _verifier_symbole(ecrit, contexte)
+            direction = [_verifier_symbole(direction, contexte)]
+            cle, action = (etat, lu), (nouvel_etat, ecrit, direction[0])
+        inconnues = set(direction) - directions
+        if inconnues:
+            raise ValueError(f"{contexte} : direction(s) {sorted(inconnues)} non supportée(s) "
+                             f"(attendu : {', '.join(sorted(directions))})")
+
+        if type_machine == NON_DETERMINISTE:
+            transitions.setdefault(cle, []).append(action)
+        elif cle in transitions:
+            raise ValueError(f"{contexte} : deux transitions pour {cle} dans une machine déterministe")
+        else:
+            transitions[cle] = action
+        etats.update((etat, nouvel_etat))
+        symboles.update([lu] if isinstance(lu, str) else lu)
+        symboles.update([ecrit] if isinstance(ecrit, str) else ecrit)
+        if type_machine == MULTI_RUBANS:
+            symboles.difference_update((ANY, SAME))
+
+    declares = donnees.get('etats')
+    if declares is not None:
+        declares = {_verifier_symbole(etat, 'etats') for etat in declares}
+        manquants = etats - declares
+        if manquants:
+            raise ValueError(f"États utilisés mais non déclarés : {sorted(manquants)}")
+        etats = declares
+    entree = donnees.get('alphabet_entree')
+    entree = sorted(symboles - {blanc}) if entree is None else [_verifier_symbole(s, 'alphabet_entree') for s in entree]
+    travail = set(donnees.get('alphabet_travail', [])) | symboles | set(entree)
+
+    return {
+        'type': type_machine,
+        'nom': donnees.get('nom', ''),
+        'rubans': k,
+        'etat_initial': etat_initial,
+        'etats_finaux': set(etats_finaux),
+        'blanc': blanc,
+        'etats': etats,
+        'alphabet_entree': set(entree),
+        'alphabet_travail': travail,
+        'transitions': transitions,
+    }
+
+
+def construire(definition: Dict, table: Optional[TableCompilee] = None):
+    """
+    Construit le moteur correspondant à une définition validée.
+
+    Args:
+        definition (Dict): Résultat de valider()
+        table (TableCompilee, optional): Table compilée de cette machine
+            (relue du cache), installée sans recompiler
+
+    Returns:
+        MachineDeTuring (table compilée), NondeterministicTuringMachine
+        ou MultiTapeTuringMachine
+    """
+    if definition['type'] == NON_DETERMINISTE:
+        return NondeterministicTuringMachine(definition['transitions'], definition['etat_initial'],
+                                             definition['etats_finaux'])
+    if definition['type'] == MULTI_RUBANS:
+        return MultiTapeTuringMachine(definition['rubans'], definition['transitions'],
+                                      definition['etat_initial'], definition['etats_finaux'])
+    machine = MachineDeTuring(definition['etats'], definition['alphabet_entree'], definition['alphabet_travail'],
+                              definition['transitions'], definition['etat_initial'], definition['etats_finaux'],
+                              definition['blanc'])
+    if table is None:
+        machine.compiler()
+    else:
+        machine.charger_table(table)
+    return machine
+
+
+def _repertoire_prive(repertoire: str) -> bool:
+    """
+    Crée au besoin le répertoire du cache (mode 0700) et vérifie qu'il est sûr.
+
+    Returns:
+        bool: True si le répertoire est un vrai répertoire appartenant à
+              l'utilisateur courant, inaccessible aux autres utilisateurs
+    """
+    try:
+        os.makedirs(repertoire, mode=0o700, exist_ok=True)
+        infos = os.lstat(repertoire)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(infos.st_mode):
+        return False
+    if hasattr(os, 'getuid') and (infos.st_uid != os.getuid() or infos.st_mode & 0o077):
+        return False
+    return True
+
+
+def _serialiser(definition: Dict, machine) -> Dict:
+    """
+    Définition validée et moteur construit -> contenu JSON du fichier de cache.
+
+    Pour une machine déterministe, la table compilée remplace la liste des
+    transitions : celles-ci sont relues depuis la table, avec une chaîne
+    'directions' d'une lettre par case (' ' pour une case sans transition).
+    """
+    donnees = {cle: sorted(valeur) if isinstance(valeur, set) else valeur
+               for cle, valeur in definition.items() if cle != 'transitions'}
+    if not isinstance(machine, MachineDeTuring):
+        donnees['transitions'] = [[list(cle), action] for cle, action in definition['transitions'].items()]
+        return {'definition': donnees, 'table': None}
+    table = machine.compiler()
+    transitions = definition['transitions']
+    directions = ''.join(transitions.get((etat, symbole), (None, None, ' '))[2]
+                         for etat in table.etats for symbole in table.symboles)
+    return {'definition': donnees, 'table': table.en_donnees(), 'directions': directions}
+
+
+def _deserialiser(donnees: Dict) -> Tuple[Dict, Optional[TableCompilee]]:
+    """Inverse de _serialiser() : définition (ensembles, transitions) et table compilée."""
+    definition = dict(donnees['definition'])
+    for cle in ('etats_finaux', 'etats', 'alphabet_entree', 'alphabet_travail'):
+        definition[cle] = set(definition[cle])
+    table = None
+    if donnees['table'] is not None:
+        table = TableCompilee.depuis_donnees(donnees['table'])
+        etats, symboles, directions = table.etats, table.symboles, donnees['directions']
+        n = table.nb_symboles
+        if len(directions) != len(table.actions):
+            raise ValueError("Directions incohérentes avec la table compilée")
+        definition['transitions'] = {
+            (etats[i // n], symboles[i % n]): (etats[action[0]], symboles[action[1]], directions[i])
+            for i, action in enumerate(table.actions) if action is not None}
+    elif definition['type'] == NON_DETERMINISTE:
+        definition['transitions'] = {tuple(cle): [tuple(action) for action in actions]
+                                     for cle, actions in definition['transitions']}
+    else:
+        definition['transitions'] = {tuple(cle): tuple(action) for cle, action in definition['transitions']}
+    return definition, table
+
+
+def charger_texte(texte: Union[str, bytes], repertoire_cache: Optional[str] = REPERTOIRE_CACHE):
+    """
+    Charge une machine depuis le contenu d'un fichier JSON.
+
+    Args:
+        texte (str | bytes): Contenu du fichier
+        repertoire_cache (str, optional): Répertoire du cache compilé
+            (None pour le désactiver)
+
+    Returns:
+        Moteur prêt à l'emploi (voir construire())
+
+    Raises:
+        ValueError: Si le JSON est invalide ou la définition incohérente
+
+    Note:
+        Le cache est facultatif : un répertoire non sûr est ignoré, un
+        fichier de cache illisible ou périmé est reconstruit, et un échec
+        d'écriture (répertoire en lecture seule, disque plein) n'empêche
+        pas le chargement.
+    """
+    if isinstance(texte, str):
+        texte = texte.encode('utf-8')
+    chemin = None
+    if repertoire_cache and _repertoire_prive(repertoire_cache):
+        empreinte = hashlib.sha256(texte).hexdigest()
+        chemin = os.path.join(repertoire_cache, f"{empreinte}.v{VERSION_CACHE}.json")
+        try:
+            with open(chemin, 'r', encoding='utf-8') as fichier:
+                donnees = json.load(fichier)
+            return construire(*_deserialiser(donnees))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
+
+    try:
+        donnees = json.loads(texte)
+    except json.JSONDecodeError as erreur:
+        raise ValueError(f"JSON invalide : {erreur}") from None
+    definition = valider(donnees)
+    machine = construire(definition)
+
+    if chemin is not None:
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        try:
+            with open(temporaire, 'w', encoding='utf-8') as fichier:
+                json.dump(_serialiser(definition, machine), fichier)
+            os.replace(temporaire, chemin)
+        except (OSError, TypeError, ValueError):
+            try:
+                os.remove(temporaire)
+            except OSError:
+                pass
+    return machine
+
+
+def charger_fichier(chemin: str, repertoire_cache: Optional[str] = REPERTOIRE_CACHE):
+    """
+    Charge une machine depuis un fichier JSON (voir charger_texte()).
+
+    Args:
+        chemin (str): Fichier de définition
+        repertoire_cache (str, optional): Répertoire du cache compilé
+
+    Returns:
+        Moteur prêt à l'emploi
+    """
+    with open(chemin, 'rb') as fichier:
+        return charger_texte(fichier.read(), repertoire_cache)
+
+
+def exporter(machine: MachineDeTuring, nom: str = '') -> Dict:
+    """
+    Convertit une MachineDeTuring en définition JSON (inverse de charger_texte()).
+
+    Args:
+        machine (MachineDeTuring): Machine à exporter
+        nom (str, optional): Nom de la machine
+
+    Returns:
+        Dict: Définition sérialisable avec json.dump
+    """
+    return {
+        'type': DETERMINISTE,
+        'nom': nom,
+        'etat_initial': machine.etat_initial,
+        'etats_finaux': sorted(machine.etats_finaux),
+        'blanc': machine.symbole_blanc,
+        'etats': sorted(machine.etats),
+        'alphabet_entree': sorted(machine.alphabet_entree),
+        'alphabet_travail': sorted(machine.alphabet_travail),
+        'transitions': [[etat, lu, *action] for (etat, lu), action in sorted(machine.transitions.items())],
+    }
@@ -0,0 +1,317 @@
+"""
+Génération d'une fonction Python spécialisée pour chaque machine.
+
+Au lieu d'interpréter la fonction de transition (un accès au dictionnaire
+ou à la table compilée par étape), la machine est traduite en code source :
+chaque état devient un bloc étiqueté ``if etat == k`` dans une boucle, et
+chaque transition une branche ``if lu == code`` dont l'écriture, le
+déplacement et le changement d'état sont des constantes. Une transition
+qui reste dans le même état ne repasse pas par l'aiguillage des états
+(``continue`` dans la boucle du bloc) ; les balayages δ(q, s) = (q, s, d)
+sont franchis d'un seul saut, comme dans executer_rapide. Les vérifications
+d'extension du ruban ne sont émises que pour les états où la tête peut
+arriver par la droite ou par la gauche.
+
+Le source est compilé une fois avec compile()/exec puis mis en cache par
+empreinte canonique de la machine (voir cache.empreinte_machine) et par
+codes des symboles : les états y portent leur numéro canonique. Il reste
+consultable (FonctionGeneree.source, inspect.getsource) pour le débogage.
+
+Les résultats sont identiques à ceux de MachineDeTuring.executer et de
+DeterministicTuringMachine.simulate (trace 'none' ou 'summary').
+"""
+import linecache
+import weakref
+from typing import Callable, Dict, List, Set, Tuple
+
+from simulators6.cache import empreinte_machine, noms_etats
+from simulators6.compilation import DEPLACEMENTS
+from simulators6.options_trace import NONE, SUMMARY, lire_options
+
+# Causes d'arrêt retournées par les fonctions générées
+TIMEOUT = 0
+ACCEPTE = 1
+BLOQUE = 2
+
+Transitions = Dict[Tuple[str, str], Tuple[str, str, str]]
+
+
+class FonctionGeneree:
+    """
+    Fonction spécialisée pour une fonction de transition.
+
+    Attributes:
+        empreinte (str): Empreinte canonique de la machine
+        codes (Dict[str, int]): Codes des symboles utilisés par le source
+        source (str): Code source généré
+        fonction (Callable): ``fonction(cases, pos, debut, max_etapes)`` ;
+            exécute la machine depuis l'état initial sur le tampon ``cases``
+            (modifié sur place, blanc = 0) et retourne
+            ``(etat, pos, debut, etapes, decalage, arret)`` : numéro canonique
+            de l'état atteint, tête et première case visitée (indices dans
+            ``cases``), nombre d'étapes, cases ajoutées à gauche du tampon et
+            cause d'arrêt (TIMEOUT, ACCEPTE ou BLOQUE)
+    """
+
+    def __init__(self, empreinte: str, codes: Dict[str, int], source: str):
+        self.empreinte = empreinte
+        self.codes = codes
+        self.source = source
+        nom_fichier = f"<machine {empreinte[:12]}>"
+        # Source enregistré pour les traces d'erreur et inspect.getsource
+        linecache.cache[nom_fichier] = (len(source), None, source.splitlines(True), nom_fichier)
+        espace = {}
+        exec(compile(source, nom_fichier, 'exec'), espace)
+        self.fonction = espace['executer_machine']
+
+    def __repr__(self) -> str:
+        return f"FonctionGeneree({self.empreinte[:12]}, {self.source.count(chr(10))} lignes)"
+
+
+def generer_source(transitions: Transitions, numeros: Dict[str, int], etats_finaux: Set[str],
+                   codes: Dict[str, int], deplacement: Callable[[str], int]) -> str:
+    """
+    Traduit une fonction de transition en code source Python.
+
+    Args:
+        transitions (Dict): Transitions {(état, symbole): (état, symbole, direction)}
+        numeros (Dict[str, int]): Numérotation canonique des états accessibles
+            (l'état initial a le numéro 0)
+        etats_finaux (Set[str]): États d'acceptation
+        codes (Dict[str, int]): Code de chaque symbole des transitions
+        deplacement (Callable[[str], int]): Déplacement associé à une direction
+
+    Returns:
+        str: Source d'une fonction ``executer_machine`` (voir FonctionGeneree)
+    """
+    sortantes: Dict[int, List[Tuple[str, str, int, int]]] = {numero: [] for numero in numeros.values()}
+    arrivees: Dict[int, Set[int]] = {numero: set() for numero in numeros.values()}
+    arrivees[0].add(1)   # le ruban de départ peut être vide (mot vide d'une DTM)
+    finaux = {numeros[etat] for etat in etats_finaux if etat in numeros}
+    for (etat, lu), (nouvel_etat, ecrit, direction) in transitions.items():
+        if etat not in numeros or numeros[etat] in finaux:
+            continue   # transition jamais appliquée
+        sortantes[numeros[etat]].append((lu, ecrit, deplacement(direction), numeros[nouvel_etat]))
+        arrivees[numeros[nouvel_etat]].add(deplacement(direction))
+
+    # Premières cases hors des balayages vers la droite : recherche en C par expression régulière
+    motifs: List[str] = []
+    lignes = [
+        "def executer_machine(cases, pos, debut, max_etapes):",
+        "    etapes = 0",
+        "    decalage = 0",
+        "    etat = 0",
+        "    while True:",
+    ]
+    for numero in range(len(numeros)):
+        lignes.append(f"        {'if' if numero == 0 else 'elif'} etat == {numero}:")
+        boucle = numero not in finaux and bool(sortantes[numero])
+        retrait = ' ' * (16 if boucle else 12)
+        if boucle:
+            lignes.append("            while True:")
+        lignes.append(f"{retrait}if etapes >= max_etapes:")
+        lignes.append(f"{retrait}    return {numero}, pos, debut, etapes, decalage, {TIMEOUT}")
+        if 1 in arrivees[numero]:
+            lignes.append(f"{retrait}if pos == len(cases):")
+            lignes.append(f"{retrait}    cases.append(0)")
+        if -1 in arrivees[numero]:
+            lignes += [
+                f"{retrait}{'elif' if 1 in arrivees[numero] else 'if'} pos < debut:",
+                f"{retrait}    if debut == 0:",
+                f"{retrait}        reserve = max(len(cases), 8)",
+                f"{retrait}        cases[0:0] = bytes(reserve)",
+                f"{retrait}        debut += reserve",
+                f"{retrait}        pos += reserve",
+                f"{retrait}        decalage += reserve",
+                f"{retrait}    debut -= 1",
+            ]
+        if not boucle:
+            arret = ACCEPTE if numero in finaux else BLOQUE
+            lignes.append(f"{retrait}return {numero}, pos, debut, etapes, decalage, {arret}")
+            continue
+
+        lignes.append(f"{retrait}lu = cases[pos]")
+        # Balayages : δ(q, s) = (q, s, d) pour tous les s d'un ensemble, franchis d'un seul saut
+        branches = sorted(sortantes[numero], key=lambda t: codes[t[0]])
+        for sens in (1, -1):
+            balayes = tuple(codes[lu] for lu, ecrit, mouvement, suivant in branches
+                            if suivant == numero and ecrit == lu and mouvement == sens)
+            if not balayes:
+                continue
+            branches = [branche for branche in branches if codes[branche[0]] not in balayes]
+            lignes.append(f"{retrait}if lu in {balayes!r}:   # balayage {sens:+d}")
+            if sens > 0:
+                motif = b'[^' + b''.join(b'\\x%02x' % code for code in balayes) + b']'
+                motifs.append(f"MOTIF_{len(motifs)} = re.compile({motif!r})")
+                lignes += [
+                    f"{retrait}    fin = MOTIF_{len(motifs) - 1}.search(cases, pos)",
+                    f"{retrait}    saut = (fin.start() if fin else len(cases)) - pos",
+                ]
+            else:
+                lignes += [
+                    f"{retrait}    fin = pos - 1",
+                    f"{retrait}    while fin >= debut and cases[fin] in {balayes!r}:",
+                    f"{retrait}        fin -= 1",
+                    f"{retrait}    saut = pos - fin",
+                ]
+            lignes += [
+                f"{retrait}    if saut > max_etapes - etapes:",
+                f"{retrait}        saut = max_etapes - etapes",
+                f"{retrait}    pos += {'' if sens > 0 else '-'}saut",
+                f"{retrait}    etapes += saut",
+                f"{retrait}    continue",
+            ]
+        for rang, (lu, ecrit, mouvement, suivant) in enumerate(branches):
+            lignes.append(f"{retrait}{'if' if rang == 0 else 'elif'} lu == {codes[lu]}:   "
+                          f"# {lu!r} -> {ecrit!r}, {mouvement:+d}, état {suivant}")
+            if ecrit != lu:
+                lignes.append(f"{retrait}    cases[pos] = {codes[ecrit]}")
+            if mouvement:
+                lignes.append(f"{retrait}    pos += {mouvement}")
+            lignes.append(f"{retrait}    etapes += 1")
+            if suivant == numero:
+                lignes.append(f"{retrait}    continue")
+            else:
+                lignes.append(f"{retrait}    etat = {suivant}")
+                lignes.append(f"{retrait}    break")
+        lignes.append(f"{retrait}return {numero}, pos, debut, etapes, decalage, {BLOQUE}")
+    return '\n'.join(["import re", *motifs, "", ""] + lignes) + '\n'
+
+
+# Fonctions générées, par (empreinte, codes des symboles)
+_FONCTIONS: Dict[Tuple, FonctionGeneree] = {}
+# Fonction et numérotation des états de chaque machine déjà traduite
+_MACHINES = weakref.WeakKeyDictionary()
+
+
+def _obtenir(machine, transitions: Transitions, etat_initial: str, etats_finaux: Set[str], blanc: str,
+             codes: Dict[str, int], deplacement: Callable[[str], int]) -> Tuple[FonctionGeneree, List[str]]:
+    """Retourne la fonction générée d'une machine et la table numéro canonique -> état."""
+    empreinte, numeros = empreinte_machine(transitions, etat_initial, etats_finaux, blanc, deplacement)
+    cle = (empreinte, tuple(sorted(codes.items())))
+    generee = _FONCTIONS.get(cle)
+    if generee is None:
+        source = generer_source(transitions, numeros, etats_finaux, codes, deplacement)
+        generee = _FONCTIONS[cle] = FonctionGeneree(empreinte, codes, source)
+    _MACHINES[machine] = (generee, noms_etats(numeros))
+    return _MACHINES[machine]
+
+
+def fonction_machine(machine) -> FonctionGeneree:
+    """
+    Fonction générée pour une MachineDeTuring (mise en cache).
+
+    Args:
+        machine (MachineDeTuring): Machine à traduire
+
+    Returns:
+        FonctionGeneree: Fonction travaillant sur les codes du ruban de la machine
+
+    Note:
+        Comme pour compiler(), la fonction de transition ne doit plus être
+        modifiée après la première traduction.
+    """
+    connue = _MACHINES.get(machine)
+    if connue is not None:
+        return connue[0]
+    ruban = machine.ruban
+    codes = {}
+    for (_, symbole), (_, ecrit, _) in machine.transitions.items():
+        codes[symbole] = ruban.code(symbole)
+        codes[ecrit] = ruban.code(ecrit)
+    return _obtenir(machine, machine.transitions, machine.etat_initial, machine.etats_finaux,
+                    machine.symbole_blanc, codes, lambda direction: DEPLACEMENTS.get(direction, 0))[0]
+
+
+def executer_genere(machine, mot: str, max_etapes: int = 1000, trace: str = NONE) -> Dict:
+    """
+    MachineDeTuring.executer par la fonction générée pour la machine.
+
+    Args:
+        machine (MachineDeTuring): Machine à exécuter
+        mot (str): Mot d'entrée
+        max_etapes (int, optional): Nombre maximum d'étapes. Défaut: 1000
+        trace (str, optional): 'none' ou 'summary' ; les niveaux pas à pas
+            passent par executer_rapide(). Défaut: 'none'
+
+    Returns:
+        Dict: Même résultat que executer() ; l'état de la machine (ruban,
+              tête, état courant, compteur d'étapes) est mis à jour de même
+    """
+    if lire_options(trace).niveau not in (NONE, SUMMARY):
+        return machine.executer_rapide(mot, max_etapes, trace)
+    generee = fonction_machine(machine)
+    noms = _MACHINES[machine][1]
+    machine.initialiser_ruban(mot, trace)
+    ruban = machine.ruban
+    etat, pos, debut, etapes, decalage, arret = generee.fonction(ruban.cases, ruban.debut + machine.position_tete,
+                                                                 ruban.debut, max_etapes)
+    ruban.debut = debut
+    ruban.origine += decalage
+    machine.position_tete = pos - debut
+    machine.etat_courant = noms[etat]
+    machine.nb_etapes = etapes
+    machine.terminer_trace()
+
+    resultat = {
+        'accepte': arret == ACCEPTE,
+        'etat_final': machine.etat_courant,
+        'ruban_final': ruban.contenu().strip(machine.symbole_blanc),
+        'nb_etapes': etapes,
+        'trace': machine.trace
+    }
+    if arret == BLOQUE:
+        resultat['raison'] = 'Pas de transition définie'
+    elif arret == TIMEOUT:
+        resultat['raison'] = f'Timeout après {max_etapes} étapes'
+    return resultat
+
+
+def fonction_dtm(dtm) -> FonctionGeneree:
+    """
+    Fonction générée pour une DeterministicTuringMachine (mise en cache).
+
+    Args:
+        dtm (DeterministicTuringMachine): Machine à traduire
+
+    Returns:
+        FonctionGeneree: Fonction travaillant sur des codes de symboles
+            (blanc '_' = 0, dans l'ordre des symboles sinon)
+    """
+    connue = _MACHINES.get(dtm)
+    if connue is not None:
+        return connue[0]
+    symboles = {symbole for (_, lu), (_, ecrit, _) in dtm.transitions.items() for symbole in (lu, ecrit)}
+    symboles.discard('_')
+    codes = {'_': 0, **{symbole: code for code, symbole in enumerate(sorted(symboles), 1)}}
+    return _obtenir(dtm, dtm.transitions, dtm.start_state, dtm.accept_states, '_', codes,
+                    lambda direction: 1 if direction == 'R' else -1)[0]
+
+
+def simulate_genere(dtm, input_tape: str, trace: str = NONE, detect_loops: bool = False,
+                    prune: bool = False) -> Dict:
+    """
+    DeterministicTuringMachine.simulate par la fonction générée pour la machine.
+
+    Args:
+        dtm (DeterministicTuringMachine): Machine à simuler
+        input_tape (str): Mot d'entrée
+        trace, detect_loops, prune: Comme pour simulate() ; seule la trace
+            'none' sans détection ni élagage passe par la fonction générée,
+            les autres options par simulate()
+
+    Returns:
+        Dict: Même résultat que simulate()
+    """
+    if lire_options(trace).niveau != NONE or detect_loops or prune:
+        return dtm.simulate(input_tape, trace, detect_loops, prune)
+    generee = fonction_dtm(dtm)
+    # Les symboles absents des transitions partagent un code qui ne déclenche aucune transition
+    autre = len(generee.codes)
+    cases = bytearray(generee.codes.get(symbole, autre) for symbole in input_tape)
+    _, _, _, etapes, _, arret = generee.fonction(cases, 0, 0, 1000)
+    if arret == ACCEPTE:
+        return {'path': [], 'steps': etapes}
+    if arret == BLOQUE:
+        return {'path': [], 'error': 'No transition', 'steps': etapes}
+    return {'timeout': True, 'path': [], 'steps': etapes}
@@ -0,0 +1,148 @@
+"""
+Exécution d'une machine sur un corpus de mots, répartie sur plusieurs processus.
+
+La machine est envoyée une seule fois à chaque processus (initialiseur du
+pool) puis les mots sont distribués par blocs de ``chunksize``. Pour les
+gros corpus, les mots sont placés dans un segment de mémoire partagée :
+les tâches ne transportent plus que des intervalles d'indices.
+"""
+import pickle
+from array import array
+from itertools import accumulate
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Au-delà de cette taille (en octets), le corpus passe par la mémoire partagée
+SEUIL_MEMOIRE_PARTAGEE = 1 << 20
+
+# État propre à chaque processus de travail (initialisé par _initialiser)
+_machine = None
+_max_etapes = 1000
+_corpus = None
+
+
+def executer_mot(machine, mot: str, max_etapes: int = 1000) -> Dict:
+    """
+    Exécute une machine sur un mot, sans trace.
+
+    Args:
+        machine: MachineDeTuring ou DeterministicTuringMachine
+        mot (str): Mot d'entrée
+        max_etapes (int, optional): Nombre maximum d'étapes. Défaut: 1000
+
+    Returns:
+        Dict: Résultat de l'exécution sans la clé 'trace' ; contient toujours
+              'accepte' et 'nb_etapes'
+    """
+    if hasattr(machine, 'executer_rapide'):
+        resultat = machine.executer_rapide(mot, max_etapes, trace='none')
+        del resultat['trace']
+        return resultat
+    # DeterministicTuringMachine : budget fixe de 1000 étapes
+    resultat = machine.simulate(mot, trace='none')
+    del resultat['path']
+    resultat['accepte'] = not ({'error', 'timeout', 'loop'} & resultat.keys())
+    resultat['nb_etapes'] = resultat['steps']
+    return resultat
+
+
+class _Corpus:
+    """Mots stockés en mémoire partagée : octets UTF-8 concaténés et table des décalages."""
+
+    def __init__(self, nom_donnees: str, nom_decalages: str, nb_mots: int):
+        self._donnees = SharedMemory(nom_donnees)
+        self._decalages_memoire = SharedMemory(nom_decalages)
+        self._decalages = self._decalages_memoire.buf.cast('q')[:nb_mots + 1]
+
+    def mots(self, debut: int, fin: int) -> Iterator[str]:
+        donnees = self._donnees.buf
+        decalages = self._decalages
+        for i in range(debut, fin):
+            yield bytes(donnees[decalages[i]:decalages[i + 1]]).decode('utf-8')
+
+
+def _initialiser(machine_serialisee: bytes, max_etapes: int, corpus: Optional[Tuple[str, str, int]]):
+    global _machine, _max_etapes, _corpus
+    _machine = pickle.loads(machine_serialisee)
+    _max_etapes = max_etapes
+    _corpus = _Corpus(*corpus) if corpus else None
+
+
+def _traiter(tache: Tuple[int, int, Optional[List[str]]]) -> Tuple[int, List[Dict]]:
+    debut, fin, mots = tache
+    if mots is None:
+        mots = _corpus.mots(debut, fin)
+    return debut, [executer_mot(_machine, mot, _max_etapes) for mot in mots]
+
+
+def _partager(mots: Sequence[str]) -> Tuple[SharedMemory, SharedMemory]:
+    """Copie le corpus dans deux segments de mémoire partagée (données, décalages)."""
+    encodes = [mot.encode('utf-8') for mot in mots]
+    decalages = array('q', accumulate((len(e) for e in encodes), initial=0))
+    donnees = SharedMemory(create=True, size=max(1, decalages[-1]))
+    table = SharedMemory(create=True, size=len(decalages) * decalages.itemsize)
+    donnees.buf[:decalages[-1]] = b''.join(encodes)
+    table.buf[:len(decalages) * decalages.itemsize] = decalages.tobytes()
+    return donnees, table
+
+
+def run_batch(machine, words: Iterable[str], workers: Optional[int] = None, chunksize: int = 1024,
+              max_etapes: int = 1000, ordered: bool = True) -> Union[List[Dict], Iterator[Tuple[int, Dict]]]:
+    """
+    Exécute une machine sur chaque mot d'un corpus, en parallèle.
+
+    Args:
+        machine: MachineDeTuring (executer_rapide) ou DeterministicTuringMachine (simulate)
+        words (Iterable[str]): Mots d'entrée
+        workers (int, optional): Nombre de processus (par défaut : nombre de
+            cœurs). 1 exécute tout dans le processus courant
+        chunksize (int, optional): Nombre de mots par tâche. Défaut: 1024
+        max_etapes (int, optional): Nombre maximum d'étapes par mot. Défaut: 1000
+        ordered (bool, optional): True pour une liste dans l'ordre des mots ;
+            False pour un itérateur de couples (indice, résultat) produits au
+            fil de l'eau, dans l'ordre de terminaison des blocs
+
+    Returns:
+        List[Dict] ou Iterator[Tuple[int, Dict]]: Résultat de chaque mot
+            (voir executer_mot), avec son nombre d'étapes
+
+    Note:
+        Au-delà de SEUIL_MEMOIRE_PARTAGEE octets, le corpus est placé en
+        mémoire partagée et les tâches ne contiennent que des indices.
+    """
+    resultats = _executer_lot(machine, list(words), workers, max(1, chunksize), max_etapes, ordered)
+    if ordered:
+        ordonnes = []
+        for _, bloc in sorted(resultats, key=lambda paire: paire[0]):
+            ordonnes.extend(bloc)
+        return ordonnes
+    return ((debut + i, resultat) for debut, bloc in resultats for i, resultat in enumerate(bloc))
+
+
+def _executer_lot(machine, mots: List[str], workers: Optional[int], chunksize: int,
+                  max_etapes: int, ordered: bool) -> Iterator[Tuple[int, List[Dict]]]:
+    """Produit les blocs (indice du premier mot, résultats) au fur et à mesure."""
+    if workers == 1 or len(mots) <= chunksize:
+        for debut in range(0, len(mots), chunksize):
+            yield debut, [executer_mot(machine, mot, max_etapes) for mot in mots[debut:debut + chunksize]]
+        return
+
+    partage = None
+    if sum(len(mot) for mot in mots) > SEUIL_MEMOIRE_PARTAGEE:
+        partage = _partager(mots)
+        corpus = (partage[0].name, partage[1].name, len(mots))
+        taches = ((debut, min(debut + chunksize, len(mots)), None) for debut in range(0, len(mots), chunksize))
+    else:
+        corpus = None
+        taches = ((debut, debut + chunksize, mots[debut:debut + chunksize]) for debut in range(0, len(mots), chunksize))
+
+    try:
+        with Pool(workers, initializer=_initialiser,
+                  initargs=(pickle.dumps(machine), max_etapes, corpus)) as pool:
+            yield from (pool.imap if ordered else pool.imap_unordered)(_traiter, taches)
+    finally:
+        if partage is not None:
+            for segment in partage:
+                segment.close()
+                segment.unlink()
@@ -1,7 +1,14 @@
 import streamlit as st
 import streamlit as st
 import time
-from typing import Dict, Set, List, Tuple, Optional
+from typing import Dict, Iterator, Set, List, Tuple, Optional
+from simulators6.ruban import Ruban
+from simulators6.compilation import DEPLACEMENTS, TableCompilee
+from simulators6.boucles import DetecteurBoucle, confirmer_cycle
+from simulators6.trace_execution import TraceEchantillonnee, TraceExecution, VueConfiguration
+from simulators6.options_trace import FULL, NONE, SAMPLED, SUMMARY, lire_options
+from simulators6.reprise import restaurer, sauvegarder
+from simulators6.analyse import analyser, etats_morts
 
 class MachineDeTuring:
     """
@@ -23,13 +30,16 @@ class MachineDeTuring:
         etat_initial (str): État de départ
         etats_finaux (Set[str]): États d'acceptation
         symbole_blanc (str): Symbole pour les cases vides
-        ruban (List[str]): Contenu actuel du ruban
+        ruban (Ruban): Contenu actuel du ruban (bi-infini, un octet par case)
         position_tete (int): Position de la tête de lecture/écriture
         etat_courant (str): État actuel de la machine
-        trace (List[Dict]): Historique des configurations
+        trace (TraceExecution): Historique des configurations (encodé par différences)
         nb_etapes (int): Nombre d'étapes exécutées
     """
     
+    # Étapes entre deux examens de l'horloge pour les points de contrôle
+    PAS_CONTROLE = 1 << 16
+    
     def __init__(self, etats: Set[str], alphabet_entree: Set[str], 
                  alphabet_travail: Set[str], transitions: Dict[Tuple[str, str], Tuple[str, str, str]], 
                  etat_initial: str, etats_finaux: Set[str], symbole_blanc: str = '_'):
@@ -74,30 +84,50 @@ class MachineDeTuring:
         self.symbole_blanc = symbole_blanc
         
         # État d'exécution (initialisé par initialiser_ruban)
-        self.ruban = []
+        self.ruban = Ruban(symbole_blanc, sorted(alphabet_travail - {symbole_blanc}))
         self.position_tete = 0
         self.etat_courant = etat_initial
-        self.trace = []
+        self.trace = TraceExecution(self.ruban)
         self.nb_etapes = 0
+        self._tables = {}
+        self._options_trace = lire_options(FULL)
+        self._detecteur = None
         
-    def initialiser_ruban(self, mot: str):
+    def initialiser_ruban(self, mot: str, trace: str = FULL):
         """
         Initialise le ruban avec le mot d'entrée et remet la machine à l'état initial.
         
         Args:
             mot (str): Mot d'entrée à placer sur le ruban
                       Si vide, initialise avec un symbole blanc
+            trace (str, optional): Niveau de trace ('none', 'summary',
+                'sampled[:N]', 'reservoir:N' ou 'full'). Défaut: 'full'
         
         Note:
             - La tête de lecture est positionnée au début du mot
             - L'état courant est remis à l'état initial
             - La trace et le compteur d'étapes sont réinitialisés
         """
-        self.ruban = list(mot) if mot else [self.symbole_blanc]
+        self.ruban.charger(mot)
         self.position_tete = 0
         self.etat_courant = self.etat_initial
-        self.trace = []
         self.nb_etapes = 0
+        self.initialiser_trace(trace)
+        
+    def initialiser_trace(self, trace: str = FULL):
+        """
+        Remplace la trace par une trace vide du niveau demandé.
+        
+        Args:
+            trace (str, optional): Niveau de trace, voir options_trace. Défaut: 'full'
+        """
+        self._options_trace = options = lire_options(trace)
+        if options.niveau == FULL:
+            self.trace = TraceExecution(self.ruban)
+        elif options.niveau == SAMPLED:
+            self.trace = TraceEchantillonnee(self.ruban, options)
+        else:
+            self.trace = []
         
     def etendre_ruban_si_necessaire(self):
         """
@@ -108,15 +138,16 @@ class MachineDeTuring:
         - Si la tête va à droite de la fin, ajoute un symbole blanc à la fin
         
         Note:
-            Cette méthode est appelée automatiquement avant chaque lecture/écriture
+            Cette méthode est appelée automatiquement avant chaque lecture/écriture.
+            Les deux extensions sont en O(1) amorti (voir Ruban).
         """
         if self.position_tete < 0:
             # Tête à gauche du ruban : ajouter une case vide au début
-            self.ruban.insert(0, self.symbole_blanc)
+            self.ruban.etendre_gauche()
             self.position_tete = 0  # Réajuster la position
         elif self.position_tete >= len(self.ruban):
             # Tête à droite du ruban : ajouter une case vide à la fin
-            self.ruban.append(self.symbole_blanc)
+            self.ruban.etendre_droite()
             
     def obtenir_symbole_courant(self) -> str:
         """
@@ -174,12 +205,66 @@ class MachineDeTuring:
         Note:
             Utilisé pour l'affichage et la trace d'exécution
         """
-        ruban_str = ''.join(self.ruban)
+        ruban_str = self.ruban.contenu()
         # Ajouter des marqueurs pour la position de la tête
         if 0 <= self.position_tete < len(self.ruban):
             return f"{ruban_str[:self.position_tete]}[{self.ruban[self.position_tete]}]{ruban_str[self.position_tete+1:]}"
         return ruban_str
         
+    def enregistrer_configuration(self, symbole_ecrit: Optional[str] = None):
+        """
+        Ajoute la configuration courante à la trace d'exécution.
+        
+        Args:
+            symbole_ecrit (str, optional): Symbole que la transition va écrire
+                sous la tête. None pour une configuration d'arrêt.
+        
+        Note:
+            Seuls l'état, la position et les symboles lu/écrit sont stockés ;
+            la configuration complète du ruban est reconstruite à la demande
+            par TraceExecution. Sans effet aux niveaux 'none' et 'summary'.
+        """
+        if self._options_trace.aucune:
+            return
+        ruban = self.ruban
+        position = ruban.debut + self.position_tete
+        ecrit = -1 if symbole_ecrit is None else ruban.code(symbole_ecrit)
+        self.trace.enregistrer(self.etat_courant, position - ruban.origine, ruban.cases[position], ecrit)
+        
+    def configuration_courante(self) -> Dict:
+        """
+        Retourne la configuration courante au format des entrées de la trace.
+        
+        Returns:
+            Dict: {'etape', 'etat', 'symbole_lu', 'position', 'ruban'}
+        """
+        if 0 <= self.position_tete < len(self.ruban):
+            symbole = self.ruban[self.position_tete]
+        else:
+            symbole = self.symbole_blanc
+        return {
+            'etape': self.nb_etapes,
+            'etat': self.etat_courant,
+            'symbole_lu': symbole,
+            'position': self.position_tete,
+            'ruban': self.obtenir_configuration_ruban()
+        }
+        
+    def terminer_trace(self):
+        """
+        Finalise la trace à la fin d'une exécution selon le niveau demandé.
+        
+        Note:
+            - 'sampled' : la trace devient la liste des étapes échantillonnées
+            - 'summary' : la trace ne contient que la configuration finale
+            - 'none' et 'full' : la trace est laissée telle quelle
+        """
+        niveau = self._options_trace.niveau
+        if niveau == SAMPLED:
+            self.trace = self.trace.entrees()
+        elif niveau == SUMMARY:
+            self.trace = [self.configuration_courante()]
+        
     def executer_etape(self) -> bool:
         """
         Exécute une seule étape de la machine de Turing.
@@ -205,22 +290,24 @@ class MachineDeTuring:
         symbole_courant = self.obtenir_symbole_courant()
         cle_transition = (self.etat_courant, symbole_courant)
         
-        # Enregistrer la configuration AVANT la transition
-        self.trace.append({
-            'etape': self.nb_etapes,
-            'etat': self.etat_courant,
-            'symbole_lu': symbole_courant,
-            'position': self.position_tete,
-            'ruban': self.obtenir_configuration_ruban()
-        })
-        
         # Vérifier si une transition existe pour cette configuration
         if cle_transition not in self.transitions:
+            # Enregistrer la configuration d'arrêt (aucune écriture)
+            self.enregistrer_configuration()
             return False  # Pas de transition définie, arrêt de l'exécution
             
         # Récupérer et appliquer la transition
         nouvel_etat, nouveau_symbole, direction = self.transitions[cle_transition]
         
+        # Enregistrer la configuration AVANT la transition
+        self.enregistrer_configuration(nouveau_symbole)
+        
+        # Mettre à jour le haché de la configuration (détection de boucles)
+        if self._detecteur is not None:
+            tete = self.position_tete + self.ruban.debut - self.ruban.origine
+            self._detecteur.appliquer(self.etat_courant, tete, symbole_courant, nouveau_symbole,
+                                      nouvel_etat, tete + DEPLACEMENTS.get(direction, 0))
+        
         # Appliquer les modifications
         self.ecrire_symbole(nouveau_symbole)
         self.deplacer_tete(direction)
@@ -229,7 +316,70 @@ class MachineDeTuring:
         
         return True  # Exécution peut continuer
         
-    def executer(self, mot: str, max_etapes: int = 1000) -> Dict:
+    def detecter_cycle(self, etape: int, etat: str, tete: int) -> Optional[Tuple[int, int]]:
+        """
+        Signale la configuration courante au détecteur de boucles.
+        
+        Args:
+            etape (int): Numéro de l'étape courante
+            etat (str): État courant
+            tete (int): Position logique de la tête (voir Ruban.origine)
+        
+        Returns:
+            Optional[Tuple[int, int]]: (début du cycle, longueur du cycle) si
+                la configuration s'est déjà produite, None sinon
+        
+        Note:
+            Une égalité de haché est confirmée en rejouant le cycle sur une
+            copie de la configuration : il n'y a pas de faux positif.
+        """
+        precedente = self._detecteur.observer(etape)
+        if precedente is None:
+            return None
+        longueur = etape - precedente
+        cases = dict(self.ruban.cases_non_blanches())
+        if confirmer_cycle(self.transitions, etat, tete, cases, self.symbole_blanc, longueur,
+                           lambda direction: DEPLACEMENTS.get(direction, 0), self.etats_finaux):
+            return precedente, longueur
+        return None
+        
+    def _preparer_detecteur(self, detecter_boucles: bool, etat, codes: bool = False):
+        """
+        Crée (ou désactive) le détecteur de boucles pour une nouvelle exécution.
+        
+        Args:
+            detecter_boucles (bool): False pour désactiver la détection
+            etat: État initial, sous la forme utilisée pendant l'exécution
+            codes (bool, optional): True si l'exécution manipule les codes
+                entiers de la table compilée plutôt que les chaînes
+        """
+        if not detecter_boucles:
+            self._detecteur = None
+            return
+        ruban = self.ruban
+        if codes:
+            cases = ((i - ruban.origine, ruban.cases[i]) for i in range(ruban.debut, len(ruban.cases)))
+        else:
+            cases = ruban.cases_non_blanches()
+        self._detecteur = DetecteurBoucle(etat, self.position_tete + ruban.debut - ruban.origine, cases,
+                                          0 if codes else self.symbole_blanc)
+        
+    def _resultat_boucle(self, cycle_debut: int, cycle_longueur: int) -> Dict:
+        """Résultat d'une exécution arrêtée par la détection de boucle."""
+        return {
+            'accepte': False,
+            'etat_final': self.etat_courant,
+            'ruban_final': self.ruban.contenu().strip(self.symbole_blanc),
+            'nb_etapes': self.nb_etapes,
+            'trace': self.trace,
+            'raison': (f"Boucle infinie : la configuration de l'étape {cycle_debut} "
+                       f"se répète tous les {cycle_longueur} pas"),
+            'cycle_debut': cycle_debut,
+            'cycle_longueur': cycle_longueur
+        }
+        
+    def executer(self, mot: str, max_etapes: int = 1000, trace: str = FULL,
+                 detecter_boucles: bool = False) -> Dict:
         """
         Exécute complètement la machine de Turing sur un mot d'entrée.
         
@@ -237,6 +387,11 @@ class MachineDeTuring:
             mot (str): Mot d'entrée à traiter
             max_etapes (int, optional): Nombre maximum d'étapes pour éviter
                                       les boucles infinies. Défaut: 1000
+            trace (str, optional): Niveau de trace, voir options_trace.
+                'none' pour les exécutions en lot. Défaut: 'full'
+            detecter_boucles (bool, optional): Arrête l'exécution dès qu'une
+                configuration se répète, au lieu d'attendre max_etapes.
+                Coûte O(1) par étape et O(étapes) en mémoire. Défaut: False
         
         Returns:
             Dict: Résultat de l'exécution contenant :
@@ -244,34 +399,77 @@ class MachineDeTuring:
                 'etat_final' (str): État final atteint
                 'ruban_final' (str): Contenu final du ruban (sans symboles blancs)
                 'nb_etapes' (int): Nombre d'étapes exécutées
-                'trace' (List[Dict]): Trace complète de l'exécution
+                'trace': Trace de l'exécution, toujours parcourable comme une
+                    liste de dictionnaires (TraceExecution au niveau 'full',
+                    étapes échantillonnées, configuration finale seule, ou vide)
                 'raison' (str, optionnel): Raison de l'arrêt si non accepté
+                'cycle_debut', 'cycle_longueur' (int, optionnels): Étape où
+                    commence le cycle et longueur du cycle, si une boucle
+                    infinie a été détectée
         
         Note:
             Un mot est accepté si la machine atteint un état final.
             L'exécution s'arrête si :
             - Un état final est atteint (accepté)
             - Aucune transition n'est définie (rejeté)
+            - Une configuration se répète (boucle infinie, si detecter_boucles)
             - Le nombre maximum d'étapes est atteint (timeout)
         """
-        self.initialiser_ruban(mot)
+        etapes = self.iter_etapes(mot, max_etapes, trace, detecter_boucles)
+        while True:
+            try:
+                next(etapes)
+            except StopIteration as fin:
+                return fin.value
+        
+    def iter_etapes(self, mot: str, max_etapes: int = 1000, trace: str = NONE,
+                    detecter_boucles: bool = False) -> Iterator[VueConfiguration]:
+        """
+        Exécute la machine pas à pas, sous forme de générateur.
+        
+        Args:
+            mot (str): Mot d'entrée à traiter
+            max_etapes (int, optional): Nombre maximum d'étapes. Défaut: 1000
+            trace (str, optional): Niveau de trace conservé dans self.trace,
+                comme pour executer(). Défaut: 'none' (mémoire constante)
+            detecter_boucles (bool, optional): Comme pour executer(). Défaut: False
+        
+        Yields:
+            VueConfiguration: Configuration courante, avant chaque transition
+                et pour la configuration d'arrêt (mêmes étapes que la trace)
+        
+        Returns:
+            Dict: Résultat de executer(), valeur de StopIteration
+        
+        Note:
+            La machine n'avance que lorsque l'appelant demande la vue
+            suivante : l'exécution peut être suspendue et reprise à volonté.
+            Une vue n'est valable que jusqu'à la demande suivante.
+        """
+        self.initialiser_ruban(mot, trace)
+        self._preparer_detecteur(detecter_boucles, self.etat_courant)
         
         # Boucle principale d'exécution
         while self.nb_etapes < max_etapes:
+            # Vérifier si la configuration s'est déjà produite (boucle infinie)
+            if self._detecteur is not None:
+                tete = self.position_tete + self.ruban.debut - self.ruban.origine
+                cycle = self.detecter_cycle(self.nb_etapes, self.etat_courant, tete)
+                if cycle is not None:
+                    self.terminer_trace()
+                    return self._resultat_boucle(*cycle)
+            
+            yield VueConfiguration(self, self.obtenir_symbole_courant())
+                
             # Vérifier si on a atteint un état final
             if self.etat_courant in self.etats_finaux:
                 # Ajouter la configuration finale à la trace
-                self.trace.append({
-                    'etape': self.nb_etapes,
-                    'etat': self.etat_courant,
-                    'symbole_lu': self.obtenir_symbole_courant(),
-                    'position': self.position_tete,
-                    'ruban': self.obtenir_configuration_ruban()
-                })
+                self.enregistrer_configuration()
+                self.terminer_trace()
                 return {
                     'accepte': True,
                     'etat_final': self.etat_courant,
-                    'ruban_final': ''.join(self.ruban).strip(self.symbole_blanc),
+                    'ruban_final': self.ruban.contenu().strip(self.symbole_blanc),
                     'nb_etapes': self.nb_etapes,
                     'trace': self.trace
                 }
@@ -279,25 +477,268 @@ class MachineDeTuring:
             # Essayer d'exécuter une étape
             if not self.executer_etape():
                 # Pas de transition possible - mot rejeté
+                self.terminer_trace()
                 return {
                     'accepte': False,
                     'etat_final': self.etat_courant,
-                    'ruban_final': ''.join(self.ruban).strip(self.symbole_blanc),
+                    'ruban_final': self.ruban.contenu().strip(self.symbole_blanc),
                     'nb_etapes': self.nb_etapes,
                     'trace': self.trace,
                     'raison': 'Pas de transition définie'
                 }
                 
         # Timeout atteint - probablement une boucle infinie
+        self.terminer_trace()
         return {
             'accepte': False,
             'etat_final': self.etat_courant,
-            'ruban_final': ''.join(self.ruban).strip(self.symbole_blanc),
+            'ruban_final': self.ruban.contenu().strip(self.symbole_blanc),
             'nb_etapes': self.nb_etapes,
             'trace': self.trace,
             'raison': f'Timeout après {max_etapes} étapes'
         }
 
+    def compiler(self, rejet_anticipe: bool = False, minimiser: bool = False) -> TableCompilee:
+        """
+        Compile la fonction de transition en table d'entiers denses.
+        
+        Args:
+            rejet_anticipe (bool, optional): Retire les transitions sortantes
+                des états morts (voir analyse.etats_morts) : une exécution
+                s'arrête dès qu'elle entre dans un tel état. Défaut: False
+            minimiser (bool, optional): Compile la table minimisée (voir
+                analyse.minimiser) : états accessibles seulement, un état
+                par classe d'équivalence, couples impossibles retirés.
+                Chaque état d'origine y a le code du représentant de sa
+                classe. Défaut: False
+        
+        Returns:
+            TableCompilee: Table plate indexée par état * |Γ| + symbole
+        
+        Note:
+            La table est mise en cache. Elle est recompilée automatiquement
+            si le ruban a interné de nouveaux symboles depuis (par exemple un
+            symbole d'entrée hors de l'alphabet de travail).
+        """
+        for (_, symbole), (_, ecrit, _) in self.transitions.items():
+            self.ruban.code(symbole)
+            self.ruban.code(ecrit)
+        cle = (rejet_anticipe, minimiser)
+        table = self._tables.get(cle)
+        if table is None or table.nb_symboles != len(self.ruban.symboles):
+            transitions, etats, finaux, representants = self.transitions, self.etats, self.etats_finaux, {}
+            if minimiser:
+                rapport = analyser(self)
+                transitions, representants = rapport.transitions_minimisees, rapport.representants
+                etats = set(representants.values())
+                finaux = {etat for etat in self.etats_finaux if etat in etats}
+            morts = etats_morts(transitions, finaux, etats) if rejet_anticipe else ()
+            table = self._tables[cle] = TableCompilee(
+                transitions, self.etat_initial, finaux,
+                self.ruban.codes, self.ruban.symboles, etats, morts)
+            for etat, representant in representants.items():
+                table.codes_etats.setdefault(etat, table.codes_etats[representant])
+        return table
+        
+    def charger_table(self, table: TableCompilee):
+        """
+        Installe une table déjà compilée (par exemple relue avec
+        TableCompilee.depuis_donnees()), à la place de compiler().
+        
+        Args:
+            table (TableCompilee): Table de cette machine, compilée par
+                compiler() sans option
+        
+        Raises:
+            ValueError: Si les symboles de la table ne correspondent pas au
+                ruban de la machine (table compilée pour une autre machine)
+        """
+        for symbole in table.symboles:
+            self.ruban.code(symbole)
+        if self.ruban.symboles != table.symboles or table.etats[0] != self.etat_initial:
+            raise ValueError("Table compilée pour une autre machine")
+        self._tables[(False, False)] = table
+        
+    def executer_rapide(self, mot: str, max_etapes: int = 1000, trace: str = FULL,
+                        detecter_boucles: bool = False, point_de_controle: Optional[str] = None,
+                        intervalle_controle: float = 5.0, rejet_anticipe: bool = False,
+                        minimiser: bool = False) -> Dict:
+        """
+        Exécute la machine sur la table compilée, sans appel de méthode par étape.
+        
+        Args:
+            mot (str): Mot d'entrée à traiter
+            max_etapes (int, optional): Nombre maximum d'étapes. Défaut: 1000
+            trace (str, optional): Niveau de trace, comme pour executer().
+                Aux niveaux 'none' et 'summary', aucune étape n'est
+                enregistrée dans la boucle. Défaut: 'full'
+            detecter_boucles (bool, optional): Comme pour executer(). Les
+                balayages sont alors exécutés pas à pas. Défaut: False
+            point_de_controle (str, optional): Fichier où l'état d'exécution
+                est sauvegardé périodiquement (voir reprise), pour pouvoir
+                reprendre l'exécution avec reprendre(). Défaut: aucun
+            intervalle_controle (float, optional): Secondes minimum entre deux
+                sauvegardes. Défaut: 5.0
+            rejet_anticipe (bool, optional): Rejette le mot dès que la machine
+                entre dans un état mort (qui ne mène à aucun état final), sans
+                attendre max_etapes ; 'raison' l'indique. Défaut: False
+            minimiser (bool, optional): Exécute la table minimisée (voir
+                compiler()) : mêmes acceptation, ruban et nombre d'étapes,
+                mais les états fusionnés portent le nom du représentant de
+                leur classe (trace et 'etat_final'). Ignoré si le mot
+                contient un symbole hors de l'alphabet d'entrée. Défaut: False
+        
+        Returns:
+            Dict: Même résultat que executer(), trace comprise
+        
+        Note:
+            La boucle travaille directement sur les octets du ruban et sur
+            la table compilée, avec uniquement des variables locales.
+            L'état de la machine (ruban, tête, état, compteur) est mis à jour
+            à la fin, comme après executer().
+            
+            Sans trace pas à pas ('none', 'summary'), les balayages repérés
+            par la compilation (boucles δ(q, s) = (q, s, d)) sont franchis en
+            un seul saut : la tête va directement à la première case hors
+            du balayage et les cases parcourues sont ajoutées au compteur
+            d'étapes. Le nombre d'étapes et le résultat restent exacts.
+        """
+        self.initialiser_ruban(mot, trace)
+        # La table minimisée n'est équivalente que sur les mots de l'alphabet d'entrée
+        minimiser = minimiser and set(mot) <= self.alphabet_entree
+        return self._executer_table(max_etapes, detecter_boucles, point_de_controle, intervalle_controle,
+                                    rejet_anticipe, minimiser)
+        
+    def reprendre(self, chemin: str, max_etapes: int = 1000, trace: str = NONE,
+                  detecter_boucles: bool = False, point_de_controle: Optional[str] = None,
+                  intervalle_controle: float = 5.0, rejet_anticipe: bool = False) -> Dict:
+        """
+        Reprend une exécution à partir d'un point de contrôle.
+        
+        Args:
+            chemin (str): Point de contrôle écrit par executer_rapide() ou
+                reprise.sauvegarder(), éventuellement par un autre processus
+            max_etapes (int, optional): Nombre maximum d'étapes, compté depuis
+                le début de l'exécution (étapes déjà faites comprises)
+            trace (str, optional): Niveau de trace de la partie reprise. Défaut: 'none'
+            detecter_boucles, point_de_controle, intervalle_controle, rejet_anticipe:
+                Comme pour executer_rapide()
+        
+        Returns:
+            Dict: Même résultat que executer_rapide() ; 'nb_etapes' compte
+                  toutes les étapes depuis le début
+        
+        Raises:
+            ValueError: Si le point de contrôle a été écrit pour une autre machine
+        """
+        restaurer(self, chemin)
+        self.initialiser_trace(trace)
+        return self._executer_table(max_etapes, detecter_boucles, point_de_controle, intervalle_controle,
+                                    rejet_anticipe)
+        
+    def _executer_table(self, max_etapes: int, detecter_boucles: bool, point_de_controle: Optional[str],
+                        intervalle_controle: float, rejet_anticipe: bool, minimiser: bool = False) -> Dict:
+        """Boucle de executer_rapide(), à partir de la configuration courante de la machine."""
+        table = self.compiler(rejet_anticipe, minimiser)
+        ruban = self.ruban
+        cases = ruban.cases
+        actions = table.actions
+        finaux = table.finaux
+        n = table.nb_symboles
+        etats = table.etats
+        enregistrer = None if self._options_trace.aucune else self.trace.enregistrer
+        etat = table.codes_etats[self.etat_courant]
+        self._preparer_detecteur(detecter_boucles, etat, codes=True)
+        detecteur = self._detecteur
+        balayages = table.balayages if enregistrer is None and detecteur is None else None
+        
+        debut = ruban.debut
+        pos = debut + self.position_tete
+        origine = ruban.origine
+        etapes = self.nb_etapes
+        raison = None
+        cycle = None
+        # Les points de contrôle sont examinés toutes les PAS_CONTROLE étapes,
+        # sur le même test que le timeout (aucun coût par étape)
+        limite = min(max_etapes, etapes + self.PAS_CONTROLE) if point_de_controle else max_etapes
+        prochaine_sauvegarde = time.monotonic() + intervalle_controle
+        
+        while True:
+            if etapes >= limite:
+                if etapes >= max_etapes:
+                    raison = f'Timeout après {max_etapes} étapes'
+                    break
+                if time.monotonic() >= prochaine_sauvegarde:
+                    ruban.debut = debut
+                    self.position_tete = pos - debut
+                    self.etat_courant = etats[etat]
+                    self.nb_etapes = etapes
+                    sauvegarder(self, point_de_controle)
+                    prochaine_sauvegarde = time.monotonic() + intervalle_controle
+                limite = min(max_etapes, etapes + self.PAS_CONTROLE)
+                continue
+            if detecteur is not None:
+                ruban.debut = debut
+                cycle = self.detecter_cycle(etapes, etats[etat], pos - origine)
+                if cycle is not None:
+                    break
+            # Extension du ruban (même ordre que obtenir_symbole_courant)
+            if pos == len(cases):
+                cases.append(0)
+            elif pos < debut:
+                ruban.debut = debut
+                ruban.etendre_gauche()
+                debut = pos = ruban.debut
+                origine = ruban.origine
+            lu = cases[pos]
+            if finaux[etat]:
+                if enregistrer:
+                    enregistrer(etats[etat], pos - origine, lu)
+                break
+            i = etat * n + lu
+            action = actions[i]
+            if action is None:
+                if enregistrer:
+                    enregistrer(etats[etat], pos - origine, lu)
+                raison = 'Pas de transition définie'
+                break
+            if detecteur is not None:
+                detecteur.appliquer(etat, pos - origine, lu, action[1], action[0], pos - origine + action[2])
+            if balayages:
+                balayage = balayages[i]
+                if balayage is not None:
+                    # Balayage : sauter toutes les cases qui bouclent sur cet état
+                    saut = min(balayage.longueur(cases, pos, debut), limite - etapes)
+                    pos += balayage.deplacement * saut
+                    etapes += saut
+                    continue
+            if enregistrer:
+                enregistrer(etats[etat], pos - origine, lu, action[1])
+            etat, cases[pos], deplacement = action
+            pos += deplacement
+            etapes += 1
+        
+        if raison is not None and table.morts[etat] and etapes < max_etapes:
+            raison = f"État mort : {etats[etat]} ne mène à aucun état final"
+        ruban.debut = debut
+        self.position_tete = pos - debut
+        self.etat_courant = table.etats[etat]
+        self.nb_etapes = etapes
+        self.terminer_trace()
+        if cycle is not None:
+            return self._resultat_boucle(*cycle)
+        
+        resultat = {
+            'accepte': raison is None,
+            'etat_final': self.etat_courant,
+            'ruban_final': ruban.contenu().strip(self.symbole_blanc),
+            'nb_etapes': etapes,
+            'trace': self.trace
+        }
+        if raison is not None:
+            resultat['raison'] = raison
+        return resultat
+
 # ============================================================================
 # MACHINES DE TURING PRÉDÉFINIES POUR LES TESTS
 # ============================================================================
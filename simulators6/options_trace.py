@@ -0,0 +1,131 @@
+"""
+Niveaux de trace communs à tous les simulateurs.
+
+Chaque moteur (MachineDeTuring, MultiTapeTuringMachine, tm_2tape_palindrome,
+tm_3tape_sort, DeterministicTuringMachine) accepte le même paramètre
+``trace=`` :
+
+- ``'none'``        : aucune trace (exécution la plus rapide) ;
+- ``'summary'``     : uniquement la configuration finale, plus les compteurs ;
+- ``'sampled'``     : une étape sur 100 ;
+  ``'sampled:N'``   : une étape sur N ;
+  ``'reservoir:N'`` : N étapes tirées uniformément (échantillonnage par réservoir) ;
+- ``'full'``        : toutes les étapes (comportement historique, par défaut).
+
+Les booléens sont aussi acceptés : ``True`` équivaut à ``'full'`` et
+``False`` à ``'none'``.
+"""
+import random
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+NONE = 'none'
+SUMMARY = 'summary'
+SAMPLED = 'sampled'
+FULL = 'full'
+
+NIVEAUX = (NONE, SUMMARY, SAMPLED, FULL)
+PAS_PAR_DEFAUT = 100
+
+
+class OptionsTrace:
+    """
+    Niveau de trace décodé.
+
+    Attributes:
+        niveau (str): Un des niveaux de NIVEAUX
+        pas (int): Pour 'sampled' : une étape conservée sur ``pas``
+        reservoir (Optional[int]): Pour 'sampled' : taille du réservoir
+            (remplace ``pas`` s'il est défini)
+    """
+
+    def __init__(self, niveau: str = FULL, pas: int = PAS_PAR_DEFAUT, reservoir: Optional[int] = None):
+        self.niveau = niveau
+        self.pas = pas
+        self.reservoir = reservoir
+
+    @property
+    def aucune(self) -> bool:
+        """True si aucune étape intermédiaire n'est enregistrée ('none' ou 'summary')."""
+        return self.niveau in (NONE, SUMMARY)
+
+    def __repr__(self) -> str:
+        if self.niveau != SAMPLED:
+            return f"OptionsTrace({self.niveau!r})"
+        if self.reservoir is not None:
+            return f"OptionsTrace('reservoir:{self.reservoir}')"
+        return f"OptionsTrace('sampled:{self.pas}')"
+
+
+def lire_options(trace: Union[str, bool, OptionsTrace] = FULL) -> OptionsTrace:
+    """
+    Décode la valeur du paramètre ``trace=``.
+
+    Args:
+        trace (str | bool | OptionsTrace): Niveau demandé (voir le module)
+
+    Returns:
+        OptionsTrace: Options correspondantes
+
+    Raises:
+        ValueError: Si le niveau ou la taille d'échantillon est invalide
+    """
+    if isinstance(trace, OptionsTrace):
+        return trace
+    if trace is True:
+        return OptionsTrace(FULL)
+    if trace is False:
+        return OptionsTrace(NONE)
+
+    nom, _, parametre = str(trace).partition(':')
+    if nom in (NONE, SUMMARY, FULL) and not parametre:
+        return OptionsTrace(nom)
+    if nom in (SAMPLED, 'reservoir'):
+        try:
+            taille = int(parametre) if parametre else PAS_PAR_DEFAUT
+        except ValueError:
+            taille = 0
+        if taille < 1:
+            raise ValueError(f"Taille d'échantillon invalide : {trace!r}")
+        if nom == 'reservoir':
+            return OptionsTrace(SAMPLED, reservoir=taille)
+        return OptionsTrace(SAMPLED, pas=taille)
+    raise ValueError(f"Niveau de trace inconnu : {trace!r} (attendu : {', '.join(NIVEAUX)})")
+
+
+class Echantillonneur:
+    """
+    Sélectionne les étapes d'une trace échantillonnée.
+
+    Les entrées ne sont construites (via ``fabrique``) que si l'étape est
+    conservée : les étapes ignorées ne sont jamais rendues.
+    """
+
+    def __init__(self, options: OptionsTrace, graine: Optional[int] = 0):
+        self.options = options
+        self._aleatoire = random.Random(graine)
+        self._elements: List[Tuple[int, Any]] = []
+        self._vus = 0
+
+    def ajouter(self, index: int, fabrique: Callable[[], Any]):
+        """
+        Propose l'étape ``index`` à l'échantillon.
+
+        Args:
+            index (int): Numéro de l'étape
+            fabrique (Callable): Construit l'entrée de trace si elle est conservée
+        """
+        reservoir = self.options.reservoir
+        self._vus += 1
+        if reservoir is None:
+            if index % self.options.pas == 0:
+                self._elements.append((index, fabrique()))
+        elif len(self._elements) < reservoir:
+            self._elements.append((index, fabrique()))
+        else:
+            j = self._aleatoire.randrange(self._vus)
+            if j < reservoir:
+                self._elements[j] = (index, fabrique())
+
+    def elements(self) -> List[Any]:
+        """Retourne les entrées conservées, dans l'ordre des étapes."""
+        return [element for _, element in sorted(self._elements, key=lambda paire: paire[0])]
@@ -0,0 +1,159 @@
+"""
+Points de contrôle : sauvegarde et reprise d'une exécution longue.
+
+Un point de contrôle contient tout l'état d'exécution d'une machine
+(ruban compact, tête, état, compteur d'étapes) dans un fichier :
+
+    MTREPRISE1\\n
+    {en-tête JSON}\\n
+    <ruban compressé (zlib)>
+
+Le ruban est stocké comme une suite de codes d'un octet (table des
+symboles dans l'en-tête), puis compressé : quelques kilo-octets suffisent
+même pour des millions de cases, et l'écriture peut être répétée toutes
+les quelques secondes. L'état est identifié par son numéro canonique
+(voir cache.empreinte_machine) : la reprise est possible dans un autre
+processus, sur une machine construite avec la même fonction de transition,
+et l'empreinte est vérifiée au chargement.
+
+Les traces d'exécution ne font pas partie du point de contrôle.
+"""
+import json
+import os
+import zlib
+from array import array
+from typing import Dict, List, Tuple
+
+from simulators6.cache import empreinte_machine, noms_etats
+
+ENTETE = b'MTREPRISE1\n'
+NIVEAU_COMPRESSION = 1   # rapide : le point de contrôle est écrit pendant l'exécution
+
+
+def _ecrire(chemin: str, entete: Dict, donnees: bytes):
+    """Écrit un point de contrôle de façon atomique (fichier temporaire puis renommage)."""
+    temporaire = f"{chemin}.{os.getpid()}.tmp"
+    with open(temporaire, 'wb') as fichier:
+        fichier.write(ENTETE)
+        fichier.write(json.dumps(entete, ensure_ascii=False).encode('utf-8') + b'\n')
+        fichier.write(zlib.compress(donnees, NIVEAU_COMPRESSION))
+    os.replace(temporaire, chemin)
+
+
+def lire(chemin: str) -> Tuple[Dict, bytes]:
+    """
+    Lit un point de contrôle.
+
+    Args:
+        chemin (str): Fichier écrit par sauvegarder()
+
+    Returns:
+        Tuple[Dict, bytes]: En-tête et codes du ruban (décompressés)
+
+    Raises:
+        ValueError: Si le fichier n'est pas un point de contrôle
+    """
+    with open(chemin, 'rb') as fichier:
+        contenu = fichier.read()
+    if not contenu.startswith(ENTETE):
+        raise ValueError(f"{chemin} n'est pas un point de contrôle")
+    entete, _, donnees = contenu[len(ENTETE):].partition(b'\n')
+    return json.loads(entete), zlib.decompress(donnees)
+
+
+def _empreinte(machine) -> Tuple[str, Dict[str, int]]:
+    if hasattr(machine, 'ruban'):
+        return empreinte_machine(machine.transitions, machine.etat_initial,
+                                 machine.etats_finaux, machine.symbole_blanc)
+    return empreinte_machine(machine.transitions, '1', set(machine.accept_states), machine.blank,
+                             lambda direction: 1 if direction == 'R' else -1)
+
+
+def _verifier(machine, entete: Dict, chemin: str) -> List[str]:
+    """Vérifie que le point de contrôle correspond à la machine ; retourne les noms d'états."""
+    empreinte, numeros = _empreinte(machine)
+    if entete['moteur'] != type(machine).__name__ or entete['empreinte'] != empreinte:
+        raise ValueError(f"Le point de contrôle {chemin} a été écrit pour une autre machine")
+    return noms_etats(numeros)
+
+
+def sauvegarder(machine, chemin: str):
+    """
+    Écrit l'état d'exécution d'une machine dans un point de contrôle.
+
+    Args:
+        machine: MachineDeTuring ou UniversalTuringMachine
+        chemin (str): Fichier de destination (remplacé atomiquement)
+    """
+    empreinte, numeros = _empreinte(machine)
+    if hasattr(machine, 'ruban'):
+        ruban = machine.ruban
+        entete = {
+            'moteur': type(machine).__name__,
+            'empreinte': empreinte,
+            'etat': numeros[machine.etat_courant],
+            'nb_etapes': machine.nb_etapes,
+            'gauche': ruban.debut - ruban.origine,
+            'tete': machine.position_tete + ruban.debut - ruban.origine,
+            'symboles': ruban.symboles,
+        }
+        _ecrire(chemin, entete, ruban.cases[ruban.debut:])
+        return
+
+    symboles = sorted(set(machine.tape))
+    codes = {symbole: code for code, symbole in enumerate(symboles)}
+    cases = array('B' if len(symboles) <= 256 else 'I', (codes[symbole] for symbole in machine.tape))
+    entete = {
+        'moteur': type(machine).__name__,
+        'empreinte': empreinte,
+        'etat': numeros[machine.state],
+        'steps': machine.steps,
+        'head': machine.head,
+        'origin': machine.origin,
+        'symboles': symboles,
+        'codage': cases.typecode,
+    }
+    _ecrire(chemin, entete, cases.tobytes())
+
+
+def restaurer(machine, chemin: str):
+    """
+    Replace une machine dans l'état enregistré par un point de contrôle.
+
+    Args:
+        machine: MachineDeTuring ou UniversalTuringMachine, construite avec
+            la même fonction de transition que la machine sauvegardée
+        chemin (str): Fichier écrit par sauvegarder()
+
+    Raises:
+        ValueError: Si le fichier ne correspond pas à cette machine
+
+    Note:
+        Le coût est proportionnel à la taille du ruban, pas au nombre
+        d'étapes déjà exécutées.
+    """
+    entete, donnees = lire(chemin)
+    noms = _verifier(machine, entete, chemin)
+
+    if hasattr(machine, 'ruban'):
+        ruban = machine.ruban
+        traduction = bytearray(range(256))
+        for code, symbole in enumerate(entete['symboles']):
+            traduction[code] = ruban.code(symbole)
+        ruban.cases = bytearray(donnees.translate(traduction)) or bytearray(1)
+        ruban.debut = 0
+        ruban.origine = -entete['gauche']
+        machine.position_tete = entete['tete'] - entete['gauche']
+        machine.etat_courant = noms[entete['etat']]
+        machine.nb_etapes = entete['nb_etapes']
+        return
+
+    cases = array(entete['codage'])
+    cases.frombytes(donnees)
+    symboles = entete['symboles']
+    machine.tape = [symboles[code] for code in cases]
+    machine.head = entete['head']
+    machine.origin = entete['origin']
+    machine.state = noms[entete['etat']]
+    machine.steps = entete['steps']
+    machine.loop = None
@@ -0,0 +1,162 @@
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class Ruban:
+    """
+    Ruban bi-infini compact pour la machine de Turing.
+
+    Les symboles sont internés en petits entiers (le symbole blanc a toujours
+    le code 0) et chaque case occupe un octet dans un unique ``bytearray``.
+    Le tampon garde une réserve de cases blanches à gauche de la première
+    case utilisée : étendre le ruban vers la gauche consomme cette réserve,
+    qui est doublée lorsqu'elle est épuisée. L'extension est donc en O(1)
+    amorti dans les deux directions, au lieu du ``list.insert(0, ...)`` en
+    O(n) de la version précédente.
+
+    Les indices publics (``ruban[i]``) sont relatifs à la case la plus à
+    gauche déjà visitée, exactement comme avec l'ancienne liste de symboles.
+
+    Attributes:
+        symbole_blanc (str): Symbole des cases vides (code 0)
+        symboles (List[str]): Table code -> symbole
+        codes (Dict[str, int]): Table symbole -> code
+        cases (bytearray): Tampon des cases, réserve de gauche comprise
+        debut (int): Indice dans ``cases`` de la case la plus à gauche du ruban
+        origine (int): Indice dans ``cases`` de la case initiale du mot
+    """
+
+    MAX_SYMBOLES = 256
+
+    def __init__(self, symbole_blanc: str = '_', symboles: Iterable[str] = ()):
+        """
+        Initialise un ruban vide.
+
+        Args:
+            symbole_blanc (str, optional): Symbole des cases vides. Défaut: '_'
+            symboles (Iterable[str], optional): Symboles à interner d'avance,
+                dans l'ordre de leurs codes (après le blanc)
+        """
+        self.symbole_blanc = symbole_blanc
+        self.symboles: List[str] = []
+        self.codes: Dict[str, int] = {}
+        self._traduction: Dict[int, str] = {}
+        self._caracteres_simples = True
+        self.code(symbole_blanc)
+        for symbole in symboles:
+            self.code(symbole)
+
+        self.cases = bytearray()
+        self.debut = 0
+        self.origine = 0
+
+    def code(self, symbole: str) -> int:
+        """
+        Retourne le code d'un symbole, en l'internant si nécessaire.
+
+        Raises:
+            ValueError: Si l'alphabet dépasse 256 symboles distincts
+        """
+        code = self.codes.get(symbole)
+        if code is None:
+            code = len(self.symboles)
+            if code >= self.MAX_SYMBOLES:
+                raise ValueError(f"Le ruban ne peut pas contenir plus de {self.MAX_SYMBOLES} symboles distincts")
+            self.symboles.append(symbole)
+            self.codes[symbole] = code
+            if len(symbole) == 1:
+                self._traduction[ord(symbole)] = chr(code)
+            else:
+                self._caracteres_simples = False
+        return code
+
+    def charger(self, mot: str):
+        """
+        Place un mot sur le ruban, à partir de la position 0.
+
+        Args:
+            mot (str): Mot d'entrée. Si vide, le ruban contient un seul blanc
+        """
+        if not mot:
+            self.cases = bytearray(1)
+        elif isinstance(mot, str) and self._caracteres_simples:
+            for symbole in set(mot):
+                self.code(symbole)
+            self.cases = bytearray(mot.translate(self._traduction), 'latin-1')
+        else:
+            self.cases = bytearray(self.code(symbole) for symbole in mot)
+        self.debut = 0
+        self.origine = 0
+
+    def etendre_gauche(self):
+        """Ajoute une case blanche à gauche du ruban (O(1) amorti)."""
+        if self.debut == 0:
+            reserve = max(len(self.cases), 8)
+            self.cases[0:0] = bytes(reserve)
+            self.debut += reserve
+            self.origine += reserve
+        self.debut -= 1
+
+    def etendre_droite(self):
+        """Ajoute une case blanche à droite du ruban (O(1) amorti)."""
+        self.cases.append(0)
+
+    def contenu(self) -> str:
+        """
+        Retourne le contenu du ruban sous forme de chaîne.
+
+        Returns:
+            str: Concaténation des symboles, de la case la plus à gauche
+                 à la case la plus à droite
+        """
+        return self.decoder(self.cases[self.debut:])
+
+    def decoder(self, octets: bytes) -> str:
+        """
+        Convertit une suite de codes en chaîne de symboles.
+
+        Args:
+            octets (bytes): Codes de cases (par exemple une copie du ruban)
+
+        Returns:
+            str: Concaténation des symboles correspondants
+        """
+        if self._caracteres_simples:
+            inverse = {code: symbole for code, symbole in enumerate(self.symboles)}
+            return bytes(octets).decode('latin-1').translate(inverse)
+        symboles = self.symboles
+        return ''.join(symboles[code] for code in octets)
+
+    def cases_non_blanches(self) -> Iterator[Tuple[int, str]]:
+        """
+        Parcourt les cases non blanches du ruban.
+
+        Returns:
+            Iterator[Tuple[int, str]]: Couples (position logique, symbole), la
+                position logique 0 étant la première case du mot d'entrée
+        """
+        symboles = self.symboles
+        for i in range(self.debut, len(self.cases)):
+            code = self.cases[i]
+            if code:
+                yield i - self.origine, symboles[code]
+
+    def __len__(self) -> int:
+        return len(self.cases) - self.debut
+
+    def __getitem__(self, position: int) -> str:
+        if not 0 <= position < len(self.cases) - self.debut:
+            raise IndexError("position hors du ruban")
+        return self.symboles[self.cases[self.debut + position]]
+
+    def __setitem__(self, position: int, symbole: str):
+        if not 0 <= position < len(self.cases) - self.debut:
+            raise IndexError("position hors du ruban")
+        self.cases[self.debut + position] = self.code(symbole)
+
+    def __iter__(self) -> Iterator[str]:
+        symboles = self.symboles
+        for code in self.cases[self.debut:]:
+            yield symboles[code]
+
+    def __repr__(self) -> str:
+        return f"Ruban({self.contenu()!r})"
@@ -0,0 +1,259 @@
+from array import array
+from collections.abc import Sequence
+from typing import Callable, Dict, Hashable, Iterator, List, Optional
+
+from simulators6.options_trace import Echantillonneur, OptionsTrace
+from simulators6.ruban import Ruban
+
+
+def configuration(etape: int, etat: str, symbole: str, position: int, ruban_str: str) -> Dict:
+    """Construit l'entrée de trace d'une étape (tête marquée entre crochets)."""
+    return {
+        'etape': etape,
+        'etat': etat,
+        'symbole_lu': symbole,
+        'position': position,
+        'ruban': f"{ruban_str[:position]}[{symbole}]{ruban_str[position+1:]}"
+    }
+
+
+class VueConfiguration:
+    """
+    Vue légère sur la configuration courante d'une machine en cours d'exécution.
+
+    L'état, le symbole lu et la position sont copiés (quelques octets) ;
+    le ruban n'est rendu en chaîne qu'à la demande, à partir du ruban de
+    la machine. La vue n'est donc valable que tant que la machine n'a pas
+    exécuté l'étape suivante.
+
+    Attributes:
+        etape (int): Numéro de l'étape
+        etat (str): État courant
+        symbole_lu (str): Symbole sous la tête
+        position (int): Position de la tête sur le ruban
+    """
+
+    __slots__ = ('etape', 'etat', 'symbole_lu', 'position', '_machine')
+
+    def __init__(self, machine, symbole_lu: str):
+        self.etape = machine.nb_etapes
+        self.etat = machine.etat_courant
+        self.symbole_lu = symbole_lu
+        self.position = machine.position_tete
+        self._machine = machine
+
+    def _verifier(self):
+        if self._machine.nb_etapes != self.etape:
+            raise RuntimeError(f"La configuration de l'étape {self.etape} n'est plus courante")
+
+    @property
+    def ruban(self) -> str:
+        """Ruban avec la tête marquée entre crochets (comme dans la trace)."""
+        self._verifier()
+        return self._machine.obtenir_configuration_ruban()
+
+    def en_dict(self) -> Dict:
+        """Retourne la configuration au format des entrées de la trace."""
+        self._verifier()
+        return configuration(self.etape, self.etat, self.symbole_lu, self.position,
+                             self._machine.ruban.contenu())
+
+    def __repr__(self) -> str:
+        return f"VueConfiguration(etape={self.etape}, etat={self.etat!r}, position={self.position})"
+
+
+class TraceExecution(Sequence):
+    """
+    Trace d'exécution compacte, encodée par différences.
+
+    Pour chaque étape, seuls l'état, la position de la tête, le symbole lu
+    et le symbole écrit sont enregistrés (quelques octets). Une image
+    complète du ruban est conservée toutes les ``intervalle`` étapes ; la
+    configuration d'une étape quelconque est reconstruite à la demande en
+    rejouant les écritures depuis l'image précédente.
+
+    La mémoire passe ainsi de O(étapes × longueur du ruban) à
+    O(étapes + longueur du ruban × étapes / intervalle), tout en gardant
+    l'interface d'une liste de dictionnaires :
+    ``{'etape', 'etat', 'symbole_lu', 'position', 'ruban'}``.
+
+    Attributes:
+        intervalle (int): Nombre d'étapes entre deux images du ruban
+    """
+
+    INTERVALLE_IMAGES = 512
+
+    def __init__(self, ruban: Ruban, intervalle: int = INTERVALLE_IMAGES):
+        """
+        Initialise une trace vide attachée à un ruban.
+
+        Args:
+            ruban (Ruban): Ruban de la machine (fournit les codes des symboles
+                et les images périodiques)
+            intervalle (int, optional): Étapes entre deux images. Défaut: 512
+        """
+        self.intervalle = max(1, intervalle)
+        self._ruban = ruban
+        self._etats: List[str] = []
+        self._codes_etats: Dict[str, int] = {}
+        self._etat = array('H')
+        self._position = array('q')   # positions logiques (0 = première case du mot)
+        self._lu = bytearray()
+        self._ecrit = array('h')      # -1 : pas d'écriture (configuration d'arrêt)
+        self._images = []             # (position logique de la 1re case, octets du ruban)
+
+    def enregistrer(self, etat: str, position: int, lu: int, ecrit: int = -1):
+        """
+        Ajoute une étape à la trace.
+
+        Args:
+            etat (str): État courant avant la transition
+            position (int): Position logique de la tête (voir Ruban.origine)
+            lu (int): Code du symbole lu
+            ecrit (int, optional): Code du symbole écrit par la transition,
+                -1 si aucune transition n'est appliquée
+
+        Note:
+            Doit être appelée avant l'écriture sur le ruban : c'est la
+            configuration précédant la transition qui est enregistrée.
+        """
+        if len(self._lu) % self.intervalle == 0:
+            ruban = self._ruban
+            self._images.append((ruban.debut - ruban.origine, bytes(ruban.cases[ruban.debut:])))
+        code = self._codes_etats.get(etat)
+        if code is None:
+            code = self._codes_etats[etat] = len(self._etats)
+            self._etats.append(etat)
+        self._etat.append(code)
+        self._position.append(position)
+        self._lu.append(lu)
+        self._ecrit.append(ecrit)
+
+    def _configuration(self, index: int, gauche: int, cases: bytearray) -> Dict:
+        """Construit le dictionnaire d'une étape à partir du ruban reconstruit."""
+        return configuration(index, self._etats[self._etat[index]], self._ruban.symboles[self._lu[index]],
+                             self._position[index] - gauche, self._ruban.decoder(cases))
+
+    @staticmethod
+    def _etendre(gauche: int, cases: bytearray, position: int) -> int:
+        """Étend le ruban reconstruit jusqu'à la position donnée ; retourne la nouvelle gauche."""
+        if position < gauche:
+            cases[0:0] = bytes(gauche - position)
+            return position
+        if position >= gauche + len(cases):
+            cases.extend(bytes(position - gauche - len(cases) + 1))
+        return gauche
+
+    def renommer(self, nom: Callable[[Hashable], Hashable]) -> 'TraceExecution':
+        """
+        Copie de la trace aux états renommés, détachée du ruban de la machine.
+
+        Args:
+            nom (Callable): Nouveau nom de chaque état (par exemple un
+                numéro canonique, voir cache.empreinte_machine)
+
+        Returns:
+            TraceExecution: Trace qui partage les étapes et les images de
+                celle-ci et garde sa propre copie de la table des symboles :
+                elle reste lisible après une autre exécution de la machine,
+                et se sérialise sans le ruban (quelques octets par étape)
+
+        Note:
+            La trace d'origine ne doit plus recevoir d'étapes.
+        """
+        copie = TraceExecution.__new__(TraceExecution)
+        copie.__dict__.update(self.__dict__)
+        copie._ruban = Ruban(self._ruban.symbole_blanc, self._ruban.symboles[1:])
+        copie._etats = [nom(etat) for etat in self._etats]
+        copie._codes_etats = {etat: code for code, etat in enumerate(copie._etats)}
+        return copie
+
+    def __len__(self) -> int:
+        return len(self._lu)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            debut, fin, pas = index.indices(len(self))
+            if pas == 1:
+                return list(self.iterer(debut, fin))
+            return [self[i] for i in range(debut, fin, pas)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("étape hors de la trace")
+
+        premiere = index - index % self.intervalle
+        gauche, image = self._images[premiere // self.intervalle]
+        cases = bytearray(image)
+        for j in range(premiere, index):
+            gauche = self._etendre(gauche, cases, self._position[j])
+            if self._ecrit[j] >= 0:
+                cases[self._position[j] - gauche] = self._ecrit[j]
+        gauche = self._etendre(gauche, cases, self._position[index])
+        return self._configuration(index, gauche, cases)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self.iterer()
+
+    def iterer(self, debut: int = 0, fin: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Configurations des étapes debut à fin - 1, reconstruites au fil de la lecture.
+
+        Args:
+            debut (int, optional): Première étape. Défaut: 0
+            fin (int, optional): Étape de fin (exclue). Défaut: la fin de la trace
+
+        Note:
+            Le rejeu part de l'image qui précède ``debut`` : une page de la
+            trace coûte au plus ``intervalle`` étapes de plus que sa longueur.
+        """
+        fin = len(self) if fin is None else min(fin, len(self))
+        if debut >= fin:
+            return
+        premiere = debut - debut % self.intervalle
+        gauche, image = self._images[premiere // self.intervalle]
+        cases = bytearray(image)
+        for index in range(premiere, fin):
+            position = self._position[index]
+            gauche = self._etendre(gauche, cases, position)
+            if index >= debut:
+                yield self._configuration(index, gauche, cases)
+            if self._ecrit[index] >= 0:
+                cases[position - gauche] = self._ecrit[index]
+
+    def __eq__(self, autre) -> bool:
+        if isinstance(autre, Sequence):
+            return len(self) == len(autre) and list(self) == list(autre)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"TraceExecution({len(self)} étapes)"
+
+
+class TraceEchantillonnee:
+    """
+    Enregistreur de trace pour le niveau 'sampled'.
+
+    Même interface d'enregistrement que TraceExecution, mais seules les
+    étapes retenues par l'échantillonneur (une sur N, ou réservoir de N)
+    sont rendues en dictionnaires, au moment où elles sont enregistrées.
+    """
+
+    def __init__(self, ruban: Ruban, options: OptionsTrace):
+        self._ruban = ruban
+        self._echantillon = Echantillonneur(options)
+        self._nb_etapes = 0
+
+    def enregistrer(self, etat: str, position: int, lu: int, ecrit: int = -1):
+        """Propose l'étape courante à l'échantillon (voir TraceExecution.enregistrer)."""
+        ruban = self._ruban
+        self._echantillon.ajouter(self._nb_etapes, lambda: configuration(
+            self._nb_etapes, etat, ruban.symboles[lu],
+            position + ruban.origine - ruban.debut, ruban.contenu()))
+        self._nb_etapes += 1
+
+    def entrees(self) -> List[Dict]:
+        """Retourne les configurations conservées, dans l'ordre des étapes."""
+        return self._echantillon.elements()
@@ -0,0 +1,150 @@
+"""
+Exécution simultanée d'une machine déterministe sur de nombreux mots (NumPy).
+
+Tous les rubans sont rangés dans un tableau 2-D d'octets (mots × cases) ;
+les positions des têtes et les états courants sont des vecteurs. Une étape
+fait avancer d'un coup toutes les exécutions encore en cours : lecture,
+consultation de la table compilée et écriture se font par indexation
+avancée (« fancy indexing »). Les lignes terminées sont retirées des
+vecteurs actifs.
+
+Les résultats (acceptation, nombre d'étapes, état final, raison, ruban
+final) sont identiques à ceux de MachineDeTuring.executer.
+"""
+from typing import Dict, Iterable, Set, Tuple
+
+import numpy as np
+
+from simulators6.machin_de_turing import MachineDeTuring
+
+# Marge initiale (en cases) de part et d'autre des mots
+MARGE = 16
+
+
+def executer_vectorise(machine: MachineDeTuring, mots: Iterable[str], max_etapes: int = 1000) -> Dict:
+    """
+    Exécute une machine sur tous les mots à la fois, en pas synchronisés.
+
+    Args:
+        machine (MachineDeTuring): Machine déterministe
+        mots (Iterable[str]): Mots d'entrée
+        max_etapes (int, optional): Nombre maximum d'étapes par mot. Défaut: 1000
+
+    Returns:
+        Dict: Résultats, un élément par mot, dans l'ordre des mots :
+            'accepte' (np.ndarray[bool]): True si le mot est accepté
+            'nb_etapes' (np.ndarray[int]): Nombre d'étapes exécutées
+            'etat_final' (List[str]): État atteint
+            'raison' (List[Optional[str]]): Raison de l'arrêt si non accepté
+            'ruban_final' (List[str]): Contenu final du ruban (sans blancs)
+
+    Note:
+        Le coût d'une étape est proportionnel au nombre d'exécutions encore
+        actives ; le ruban de chaque ligne s'élargit (par doublement) dès
+        qu'une tête atteint un bord.
+    """
+    mots = list(mots)
+    ruban = machine.ruban
+    for mot in mots:
+        for symbole in set(mot):
+            ruban.code(symbole)
+    table = machine.compiler()
+    n = table.nb_symboles
+
+    # Table compilée sous forme de trois vecteurs indexés par état * n + symbole
+    suivant = np.full(len(table.actions), -1, dtype=np.int64)
+    ecrit = np.zeros(len(table.actions), dtype=np.uint8)
+    deplacement = np.zeros(len(table.actions), dtype=np.int64)
+    for i, action in enumerate(table.actions):
+        if action is not None:
+            suivant[i], ecrit[i], deplacement[i] = action
+    finaux = np.frombuffer(bytes(table.finaux), dtype=np.uint8).astype(bool)
+
+    # Rubans : une ligne par mot, blanc = 0
+    longueur = max((len(mot) for mot in mots), default=0)
+    gauche = MARGE
+    rubans = np.zeros((len(mots), gauche + longueur + MARGE), dtype=np.uint8)
+    for ligne, mot in enumerate(mots):
+        ruban.charger(mot)
+        rubans[ligne, gauche:gauche + len(ruban.cases)] = np.frombuffer(bytes(ruban.cases), dtype=np.uint8)
+
+    nb_etapes = np.zeros(len(mots), dtype=np.int64)
+    etats_finals = np.zeros(len(mots), dtype=np.int64)
+    arret = np.zeros(len(mots), dtype=np.int8)   # 0 : timeout, 1 : accepté, 2 : pas de transition
+
+    # Vecteurs des exécutions actives
+    actifs = np.arange(len(mots))
+    tetes = np.full(len(mots), gauche, dtype=np.int64)
+    etats = np.full(len(mots), table.initial, dtype=np.int64)
+
+    for etape in range(max_etapes):
+        if not len(actifs):
+            break
+        lus = rubans[actifs, tetes]
+        indices = etats * n + lus
+        nouveaux = suivant[indices]
+        arretes = finaux[etats] | (nouveaux < 0)
+        if arretes.any():
+            lignes = actifs[arretes]
+            nb_etapes[lignes] = etape
+            etats_finals[lignes] = etats[arretes]
+            arret[lignes] = np.where(finaux[etats[arretes]], 1, 2)
+            continuent = ~arretes
+            actifs, tetes, indices, nouveaux = (actifs[continuent], tetes[continuent],
+                                                indices[continuent], nouveaux[continuent])
+        rubans[actifs, tetes] = ecrit[indices]
+        tetes = tetes + deplacement[indices]
+        etats = nouveaux
+
+        # Élargir les rubans si une tête a atteint un bord
+        if len(tetes) and tetes.min() < 0:
+            extension = rubans.shape[1]
+            rubans = np.concatenate([np.zeros((len(mots), extension), dtype=np.uint8), rubans], axis=1)
+            tetes += extension
+        if len(tetes) and tetes.max() >= rubans.shape[1]:
+            rubans = np.concatenate([rubans, np.zeros_like(rubans)], axis=1)
+
+    # Exécutions arrivées au bout du budget
+    nb_etapes[actifs] = max_etapes
+    etats_finals[actifs] = etats
+
+    blanc = machine.symbole_blanc
+    raisons = (f'Timeout après {max_etapes} étapes', None, 'Pas de transition définie')
+    return {
+        'accepte': arret == 1,
+        'nb_etapes': nb_etapes,
+        'etat_final': [table.etats[code] for code in etats_finals],
+        'raison': [raisons[code] for code in arret],
+        'ruban_final': [ruban.decoder(ligne.tobytes()).strip(blanc) for ligne in rubans]
+    }
+
+
+def machine_depuis_dtm(transitions: Dict[Tuple[str, str], Tuple[str, str, str]],
+                       etat_initial: str = 'q0', etats_finaux: Set[str] = frozenset({'q_accept'}),
+                       symbole_blanc: str = '_') -> MachineDeTuring:
+    """
+    Construit la MachineDeTuring équivalente à une DeterministicTuringMachine.
+
+    Args:
+        transitions (Dict): Transitions de la DeterministicTuringMachine
+        etat_initial (str, optional): État de départ. Défaut: 'q0'
+        etats_finaux (Set[str], optional): États d'acceptation. Défaut: {'q_accept'}
+        symbole_blanc (str, optional): Symbole blanc. Défaut: '_'
+
+    Returns:
+        MachineDeTuring: Machine de mêmes résultats et nombres d'étapes
+
+    Note:
+        DeterministicTuringMachine déplace la tête à gauche pour toute
+        direction autre que 'R' (y compris 'S') : les directions sont
+        converties en conséquence.
+    """
+    converties = {cle: (etat, ecrit, 'R' if direction == 'R' else 'L')
+                  for cle, (etat, ecrit, direction) in transitions.items()}
+    etats = {etat_initial, *etats_finaux}
+    symboles = {symbole_blanc}
+    for (etat, lu), (nouvel_etat, ecrit, _) in transitions.items():
+        etats.update((etat, nouvel_etat))
+        symboles.update((lu, ecrit))
+    return MachineDeTuring(etats, symboles - {symbole_blanc}, symboles, converties,
+                           etat_initial, set(etats_finaux), symbole_blanc)
@@ -0,0 +1,213 @@
+"""
+Mode lot : une opération de simulators7 sur chaque ligne d'un corpus.
+
+Le fichier (une entrée par ligne) est lu par blocs de lignes ; chaque bloc
+est traité d'un coup puis ses résultats sont émis dans l'ordre des lignes,
+ce qui permet de produire le CSV au fil de la lecture :
+
+- palindromes : les lignes d'un bloc sont regroupées par longueur ; chaque
+  groupe devient un tableau NumPy (lignes × caractères) comparé en une fois
+  à son miroir ``tableau[:, ::-1]``. Les lignes sont comparées caractère
+  par caractère, comme is_palindrome() : une ligne non ASCII est décodée
+  en UTF-8 (un octet invalide compte pour un caractère) et rangée avec les
+  lignes de même nombre de caractères, en points de code sur 32 bits ;
+- opérations unaires : seules les longueurs des opérandes sont lues (un
+  bytes.find par ligne), puis le calcul se fait sur des vecteurs d'entiers,
+  sans jamais construire de chaîne unaire.
+"""
+import csv
+import io
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+OPERATIONS = ('palindrome', 'add', 'sub', 'mul', 'div')
+BLOCK_SIZE = 1 << 16   # lignes par bloc
+
+HEADERS = {
+    'palindrome': ('ligne', 'longueur', 'palindrome'),
+    'add': ('ligne', 'a', 'b', 'resultat', 'erreur'),
+    'sub': ('ligne', 'a', 'b', 'resultat', 'erreur'),
+    'mul': ('ligne', 'a', 'b', 'resultat', 'erreur'),
+    'div': ('ligne', 'a', 'b', 'quotient', 'reste', 'erreur'),
+}
+
+
+class BatchStats:
+    """
+    Compteurs d'un traitement par lot.
+
+    Attributs :
+    -----------
+    lines : int
+        Nombre de lignes traitées
+    errors : int
+        Nombre de lignes en erreur (format ou division par zéro)
+    bytes : int
+        Nombre d'octets lus
+    seconds : float
+        Durée du traitement
+    """
+
+    def __init__(self):
+        self.lines = 0
+        self.errors = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    @property
+    def lines_per_second(self) -> float:
+        """Débit en lignes par seconde."""
+        return self.lines / self.seconds if self.seconds else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        """Débit en Mo lus par seconde."""
+        return self.bytes / self.seconds / 1e6 if self.seconds else 0.0
+
+
+def _palindromes(lines: List[bytes]) -> Tuple[np.ndarray, List[int]]:
+    """
+    Palindromes d'un bloc : lignes regroupées par longueur, comparées en bloc à leur miroir.
+
+    Retour :
+    --------
+    (np.ndarray, List[int])
+        Résultat de chaque ligne et sa longueur en caractères
+    """
+    result = np.ones(len(lines), dtype=bool)
+    lengths = []
+    # Clé (longueur, largeur) : octets pour les lignes ASCII, points de code UTF-32 sinon
+    groups: Dict[Tuple[int, int], List[int]] = {}
+    wide: Dict[int, bytes] = {}
+    for index, line in enumerate(lines):
+        if line.isascii():
+            key = (len(line), 1)
+        else:
+            text = line.decode('utf-8', 'surrogateescape')
+            wide[index] = text.encode('utf-32-le', 'surrogatepass')
+            key = (len(text), 4)
+        lengths.append(key[0])
+        groups.setdefault(key, []).append(index)
+    for (length, width), indices in groups.items():
+        if length < 2:
+            continue
+        data = b''.join(lines[i] for i in indices) if width == 1 else b''.join(wide[i] for i in indices)
+        table = np.frombuffer(data, dtype=np.uint8 if width == 1 else '<u4').reshape(len(indices), length)
+        half = length // 2
+        result[indices] = (table[:, :half] == table[:, :length - half - 1:-1]).all(axis=1)
+    return result, lengths
+
+
+def _operands(lines: List[bytes]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Longueurs des opérandes 'gauche#droite' de chaque ligne, et lignes mal formées."""
+    left = np.zeros(len(lines), dtype=np.int64)
+    right = np.zeros(len(lines), dtype=np.int64)
+    invalid = np.zeros(len(lines), dtype=bool)
+    for index, line in enumerate(lines):
+        position = line.find(b'#')
+        if position < 0 or line.find(b'#', position + 1) >= 0:
+            invalid[index] = True
+        else:
+            left[index] = position
+            right[index] = len(line) - position - 1
+    return left, right, invalid
+
+
+def _block_rows(operation: str, lines: List[bytes], first: int, stats: BatchStats) -> List[Tuple]:
+    """Lignes du CSV pour un bloc d'entrées (numérotées à partir de ``first``)."""
+    numbers = range(first, first + len(lines))
+    if operation == 'palindrome':
+        result, lengths = _palindromes(lines)
+        return list(zip(numbers, lengths, result.tolist()))
+
+    a, b, invalid = _operands(lines)
+    # Tableau d'objets : un tableau de chaînes à largeur fixe tronquerait les messages
+    error = np.full(len(lines), '', dtype=object)
+    error[invalid] = 'format'
+    if operation == 'add':
+        columns = [a + b]
+    elif operation == 'sub':
+        columns = [np.maximum(a - b, 0)]
+    elif operation == 'mul':
+        columns = [a * b]
+    else:
+        zero = (b == 0) & ~invalid
+        error[zero] = 'division par zéro'
+        divisor = np.where(b == 0, 1, b)
+        columns = [a // divisor, a % divisor]
+    failed = error != ''
+    stats.errors += int(failed.sum())
+    columns = [np.where(failed, '', column.astype(str)) for column in columns]
+    a_text = np.where(invalid, '', a.astype(str))
+    b_text = np.where(invalid, '', b.astype(str))
+    return list(zip(numbers, a_text.tolist(), b_text.tolist(), *(c.tolist() for c in columns), error.tolist()))
+
+
+def iter_rows(operation: str, file: Iterable[bytes], block_size: int = BLOCK_SIZE,
+              stats: Optional[BatchStats] = None) -> Iterator[List[Tuple]]:
+    """
+    Exécute une opération sur chaque ligne d'un fichier, bloc par bloc.
+
+    Paramètres :
+    ------------
+    operation : str
+        'palindrome', 'add', 'sub', 'mul' ou 'div'
+    file : fichier binaire (ou itérable de lignes bytes)
+        Corpus, une entrée par ligne ('\\n' ou '\\r\\n')
+    block_size : int
+        Nombre de lignes traitées ensemble
+    stats : BatchStats
+        Compteurs mis à jour au fil du traitement (facultatif)
+
+    Retour :
+    --------
+    Iterator[List[Tuple]]
+        Les lignes du CSV (voir HEADERS), un bloc à la fois, dans l'ordre
+        du fichier
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Opération inconnue : {operation!r} (attendu : {', '.join(OPERATIONS)})")
+    stats = BatchStats() if stats is None else stats
+    start = time.perf_counter() - stats.seconds
+    block: List[bytes] = []
+    for line in file:
+        stats.bytes += len(line)
+        block.append(line.rstrip(b'\r\n'))
+        if len(block) == block_size:
+            rows = _block_rows(operation, block, stats.lines + 1, stats)
+            stats.lines += len(block)
+            stats.seconds = time.perf_counter() - start
+            yield rows
+            block = []
+    if block:
+        rows = _block_rows(operation, block, stats.lines + 1, stats)
+        stats.lines += len(block)
+        stats.seconds = time.perf_counter() - start
+        yield rows
+
+
+def iter_csv(operation: str, file: Iterable[bytes], block_size: int = BLOCK_SIZE,
+             stats: Optional[BatchStats] = None) -> Iterator[str]:
+    """
+    Résultats d'un traitement par lot au format CSV, produits au fil de la lecture.
+
+    Retour :
+    --------
+    Iterator[str]
+        Un morceau de CSV par bloc de lignes (le premier commence par
+        l'en-tête, voir HEADERS)
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(HEADERS.get(operation, ()))
+    chunk = buffer.getvalue()
+    for rows in iter_rows(operation, file, block_size, stats):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield chunk + buffer.getvalue()
+        chunk = ''
+    if chunk:
+        yield chunk
@@ -1,3 +1,10 @@
+import mmap
+import os
+
+# Taille des blocs comparés à chaque extrémité (octets)
+CHUNK_SIZE = 1 << 20
+
+
 def is_palindrome(w: str) -> bool:
     """
     Vérifie si une chaîne de caractères est un palindrome.
@@ -36,3 +43,71 @@ def is_palindrome(w: str) -> bool:
 
     return True  # Toutes les paires correspondent, c'est un palindrome
 
+
+
+def is_palindrome_buffer(buffer, chunk_size: int = CHUNK_SIZE, strip_newline: bool = True) -> bool:
+    """
+    Vérifie qu'une zone mémoire (bytes, memoryview, mmap) est un palindrome.
+
+    Les deux extrémités sont comparées par blocs de taille fixe : le bloc de
+    début est lu dans l'ordre, le bloc de fin est lu puis retourné par
+    tranche ([::-1]), et les deux sont comparés d'un seul coup. Seuls deux
+    blocs sont copiés à la fois, quelle que soit la taille des données.
+
+    Paramètres :
+    ------------
+    buffer : bytes | memoryview | mmap
+        Données à tester (comparées octet par octet)
+    chunk_size : int
+        Taille des blocs comparés
+    strip_newline : bool
+        Ignore un saut de ligne final ('\\n' ou '\\r\\n'), comme à la fin
+        d'un fichier texte
+
+    Retour :
+    --------
+    bool
+        True si les données sont un palindrome, False sinon.
+    """
+    left, right = 0, len(buffer)
+    if strip_newline and right and buffer[right - 1:right] == b'\n':
+        right -= 2 if buffer[max(right - 2, 0):right] == b'\r\n' else 1
+
+    # Blocs symétriques : [left, left + k) et [right - k, right)
+    while right - left > 1:
+        k = min(chunk_size, (right - left) // 2)
+        if bytes(buffer[left:left + k]) != bytes(buffer[right - k:right])[::-1]:
+            return False
+        left += k
+        right -= k
+    return True
+
+
+def is_palindrome_file(path: str, chunk_size: int = CHUNK_SIZE, strip_newline: bool = True) -> bool:
+    """
+    Vérifie qu'un fichier est un palindrome, sans le charger en mémoire.
+
+    Le fichier est projeté en mémoire (mmap) et ses deux extrémités sont
+    comparées par blocs (voir is_palindrome_buffer) : la lecture se fait à
+    la vitesse du disque, avec une mémoire bornée par deux blocs.
+
+    Paramètres :
+    ------------
+    path : str
+        Chemin du fichier (comparé octet par octet : symboles ASCII ou
+        d'un octet)
+    chunk_size : int
+        Taille des blocs comparés
+    strip_newline : bool
+        Ignore un saut de ligne final
+
+    Retour :
+    --------
+    bool
+        True si le contenu du fichier est un palindrome, False sinon.
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return True   # mmap refuse les fichiers vides
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return is_palindrome_buffer(data, chunk_size, strip_newline)
@@ -0,0 +1,366 @@
+"""
+Vraies machines de Turing pour les opérations de simulators7.
+
+Chaque opération (palindrome, addition, soustraction, multiplication,
+division) existe aussi sous forme de table de transitions, exécutée par le
+moteur rapide de simulators6 (MachineDeTuring.executer_rapide : table
+compilée et balayages franchis d'un seul saut). Une exécution rapporte le
+nombre exact d'étapes et l'espace utilisé (cases du ruban visitées), et son
+résultat est comparé à la forme close (is_palindrome, compute_value) qui
+sert d'oracle.
+
+Formats des rubans :
+
+- palindrome : le mot, effacé par les deux bouts ; accepté ou rejeté ;
+- add, sub, mul : '1^a#1^b' -> '1^résultat' ;
+- div : '1^a#1^b' -> '1^q#1^r' (quotient, reste), rejeté si b = 0.
+
+Complexité en étapes : linéaire pour add, quadratique pour palindrome, sub,
+mul et div (la multiplication écrit en plus a × b cases).
+
+Les machines sont construites une fois par processus et partagées : une
+exécution modifie leur ruban, leur tête et leur état, et se fait donc sous
+le verrou de la machine (voir run()).
+"""
+import threading
+import time
+import weakref
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+from simulators6.machin_de_turing import MachineDeTuring
+from simulators7.palindrome import is_palindrome
+from simulators7.unary import UnaryValue, parse_operands
+from simulators7 import unary_add, unary_sub, unary_mul, unary_div
+
+OPERATIONS = ('palindrome', 'add', 'sub', 'mul', 'div')
+ACCEPT = 'accept'
+
+# Un verrou par machine partagée (les sessions Streamlit sont des threads)
+_LOCKS: 'weakref.WeakKeyDictionary[MachineDeTuring, threading.Lock]' = weakref.WeakKeyDictionary()
+_LOCKS_GUARD = threading.Lock()
+
+
+def _machine(transitions: Dict[Tuple[str, str], Tuple[str, str, str]], initial: str,
+             alphabet: Iterable[str], blank: str = '_') -> MachineDeTuring:
+    """Construit une MachineDeTuring à partir de sa table (états et alphabets déduits)."""
+    states = {initial, ACCEPT}
+    symbols = {blank, *alphabet}
+    for (state, read), (new_state, written, _) in transitions.items():
+        states.update((state, new_state))
+        symbols.update((read, written))
+    return MachineDeTuring(states, set(alphabet), symbols, transitions, initial, {ACCEPT}, blank)
+
+
+def _lock(machine: MachineDeTuring) -> threading.Lock:
+    """Verrou qui protège le ruban d'une machine partagée pendant une exécution."""
+    with _LOCKS_GUARD:
+        lock = _LOCKS.get(machine)
+        if lock is None:
+            lock = _LOCKS[machine] = threading.Lock()
+        return lock
+
+
+def _loop(state: str, symbols: Iterable[str], direction: str) -> Dict[Tuple[str, str], Tuple[str, str, str]]:
+    """Transitions qui parcourent les symboles donnés sans les modifier (balayage)."""
+    return {(state, symbol): (state, symbol, direction) for symbol in symbols}
+
+
+@lru_cache(maxsize=32)
+def palindrome_machine(alphabet: Tuple[str, ...], blank: str = '_') -> MachineDeTuring:
+    """
+    Machine reconnaissant les palindromes sur un alphabet donné.
+
+    À chaque passage, le premier symbole est effacé et mémorisé dans l'état,
+    la tête va au bout du mot, vérifie et efface le dernier symbole, puis
+    revient au début : n/2 allers-retours, O(n²) étapes.
+
+    Paramètres :
+    ------------
+    alphabet : Tuple[str, ...]
+        Symboles du mot (sans le blanc)
+    blank : str
+        Symbole blanc
+    """
+    transitions = {('start', blank): (ACCEPT, blank, 'S')}
+    for symbol in alphabet:
+        transitions[('start', symbol)] = (f'carry_{symbol}', blank, 'R')
+        transitions.update(_loop(f'carry_{symbol}', alphabet, 'R'))
+        transitions[(f'carry_{symbol}', blank)] = (f'check_{symbol}', blank, 'L')
+        transitions[(f'check_{symbol}', symbol)] = ('back', blank, 'L')
+        transitions[(f'check_{symbol}', blank)] = (ACCEPT, blank, 'S')
+    transitions.update(_loop('back', alphabet, 'L'))
+    transitions[('back', blank)] = ('start', blank, 'R')
+    return _machine(transitions, 'start', alphabet, blank)
+
+
+@lru_cache(maxsize=None)
+def add_machine() -> MachineDeTuring:
+    """
+    Addition unaire : '#' devient '1', puis le dernier '1' est effacé (O(a + b) étapes).
+    """
+    transitions = {
+        ('scan', '1'): ('scan', '1', 'R'),
+        ('scan', '#'): ('to_end', '1', 'R'),
+        **_loop('to_end', '1', 'R'),
+        ('to_end', '_'): ('erase', '_', 'L'),
+        ('erase', '1'): (ACCEPT, '_', 'S'),
+    }
+    return _machine(transitions, 'scan', '1#')
+
+
+@lru_cache(maxsize=None)
+def sub_machine() -> MachineDeTuring:
+    """
+    Soustraction tronquée : le dernier '1' de b et le premier '1' de a sont
+    effacés tour à tour, jusqu'à épuisement de b (reste a - b) ou de a
+    (résultat 0, les '1' restants de b sont effacés). O((a + b) × min(a, b)) étapes.
+    """
+    transitions = {
+        **_loop('right', '1#', 'R'),
+        ('right', '_'): ('erase_b', '_', 'L'),
+        ('erase_b', '1'): ('left', '_', 'L'),
+        ('erase_b', '#'): (ACCEPT, '_', 'S'),
+        **_loop('left', '1#', 'L'),
+        ('left', '_'): ('erase_a', '_', 'R'),
+        ('erase_a', '1'): ('right', '_', 'R'),
+        ('erase_a', '#'): ('clear', '_', 'R'),
+        ('clear', '1'): ('clear', '_', 'R'),
+        ('clear', '_'): (ACCEPT, '_', 'S'),
+    }
+    return _machine(transitions, 'right', '1#')
+
+
+@lru_cache(maxsize=None)
+def mul_machine() -> MachineDeTuring:
+    """
+    Multiplication unaire : pour chaque '1' de a (marqué X), b est recopié
+    '1' par '1' (marqués Y) à la fin du ruban, après un '=' ; a, b et '='
+    sont effacés à la fin. O(a × b × (b + a × b)) étapes.
+    """
+    transitions = {
+        **_loop('start', '1#', 'R'),
+        ('start', '_'): ('rewind', '=', 'L'),
+        **_loop('rewind', '1#=', 'L'),
+        ('rewind', 'X'): ('next_a', 'X', 'R'),
+        ('rewind', '_'): ('next_a', '_', 'R'),
+        ('next_a', '1'): ('to_b', 'X', 'R'),
+        ('next_a', '#'): ('erase_x', '#', 'L'),
+        **_loop('to_b', '1', 'R'),
+        ('to_b', '#'): ('next_b', '#', 'R'),
+        **_loop('next_b', 'Y', 'R'),
+        ('next_b', '1'): ('to_end', 'Y', 'R'),
+        ('next_b', '='): ('restore', '=', 'L'),
+        **_loop('to_end', '1=', 'R'),
+        ('to_end', '_'): ('back', '1', 'L'),
+        **_loop('back', '1=', 'L'),
+        ('back', 'Y'): ('next_b', 'Y', 'R'),
+        ('restore', 'Y'): ('restore', '1', 'L'),
+        ('restore', '#'): ('rewind', '#', 'L'),
+        ('erase_x', 'X'): ('erase_x', '_', 'L'),
+        ('erase_x', '_'): ('clean', '_', 'R'),
+        ('clean', '_'): ('clean', '_', 'R'),
+        ('clean', '#'): ('clean', '_', 'R'),
+        ('clean', '1'): ('clean', '_', 'R'),
+        ('clean', '='): (ACCEPT, '_', 'R'),
+    }
+    return _machine(transitions, 'start', '1#')
+
+
+@lru_cache(maxsize=None)
+def div_machine() -> MachineDeTuring:
+    """
+    Division euclidienne par soustractions répétées.
+
+    Un '=' est écrit à gauche du mot et le quotient s'accumule à sa gauche.
+    À chaque tour, chaque '1' de b (Z pendant la recherche, puis Y) est
+    apparié au '1' non marqué de a le plus à droite (X) ; un tour complet
+    ajoute un '1' au quotient. Quand a est épuisé au milieu d'un tour, les r
+    '1' déjà appariés forment le reste : ils sont recopiés après le '=', qui
+    devient '#'. Rejeté si b = 0. O(a × (a + b)) étapes.
+    """
+    transitions = {
+        # Vérification du diviseur, puis '=' à gauche du mot
+        **_loop('check', '1', 'R'),
+        ('check', '#'): ('check_b', '#', 'R'),
+        ('check_b', '1'): ('rewind', '1', 'L'),
+        **_loop('rewind', '1#', 'L'),
+        ('rewind', '_'): ('find_b', '=', 'R'),
+        # Un tour : apparier chaque '1' de b à un '1' de a
+        **_loop('find_b', '1=X', 'R'),
+        ('find_b', '#'): ('next_b', '#', 'R'),
+        **_loop('next_b', 'Y', 'R'),
+        ('next_b', '1'): ('seek_a', 'Z', 'L'),
+        ('next_b', '_'): ('restore', '_', 'L'),
+        **_loop('seek_a', 'Y#X', 'L'),
+        ('seek_a', '1'): ('back_z', 'X', 'R'),
+        ('seek_a', '='): ('partial', '=', 'R'),
+        **_loop('back_z', 'X#Y', 'R'),
+        ('back_z', 'Z'): ('next_b', 'Y', 'R'),
+        # Tour complet : b est restauré et le quotient augmente
+        ('restore', 'Y'): ('restore', '1', 'L'),
+        ('restore', '#'): ('to_q', '#', 'L'),
+        **_loop('to_q', '1X', 'L'),
+        ('to_q', '='): ('add_q', '=', 'L'),
+        **_loop('add_q', '1', 'L'),
+        ('add_q', '_'): ('find_b', '1', 'R'),
+        # a épuisé : les Y (reste) sont recopiés après le '=', le reste est effacé
+        **_loop('partial', 'X#Y', 'R'),
+        ('partial', 'Z'): ('erase_rest', '_', 'R'),
+        ('erase_rest', '1'): ('erase_rest', '_', 'R'),
+        ('erase_rest', '_'): ('take_y', '_', 'L'),
+        **_loop('take_y', '_', 'L'),
+        ('take_y', 'Y'): ('to_eq', '_', 'L'),
+        ('take_y', '#'): ('erase_x', '_', 'L'),
+        **_loop('to_eq', 'Y#X1', 'L'),
+        ('to_eq', '='): ('put_one', '=', 'R'),
+        **_loop('put_one', '1', 'R'),
+        ('put_one', 'X'): ('to_y', '1', 'R'),
+        **_loop('to_y', 'X#Y', 'R'),
+        ('to_y', '_'): ('take_y', '_', 'L'),
+        ('erase_x', 'X'): ('erase_x', '_', 'L'),
+        **_loop('erase_x', '1', 'L'),
+        ('erase_x', '='): (ACCEPT, '#', 'S'),
+    }
+    return _machine(transitions, 'check', '1#')
+
+
+MACHINES = {'add': add_machine, 'sub': sub_machine, 'mul': mul_machine, 'div': div_machine}
+ORACLES = {'add': unary_add.compute_value, 'sub': unary_sub.compute_value,
+           'mul': unary_mul.compute_value, 'div': unary_div.compute_value}
+
+
+class MachineRun:
+    """
+    Résultat d'une exécution d'une opération sur sa machine de Turing.
+
+    Attributs :
+    -----------
+    operation : str
+        Opération exécutée (voir OPERATIONS)
+    accepted : bool
+        True si la machine s'est arrêtée dans son état d'acceptation
+    value : bool | UnaryValue | Tuple[UnaryValue, UnaryValue] | None
+        Résultat lu sur le ruban final (None si la machine n'a pas terminé)
+    expected : bool | UnaryValue | Tuple[UnaryValue, UnaryValue]
+        Résultat de la forme close (oracle)
+    steps : int
+        Nombre exact d'étapes de la machine
+    space : int
+        Nombre de cases du ruban visitées (mot d'entrée compris)
+    seconds : float
+        Durée de l'exécution
+    timed_out : bool
+        True si max_steps a été atteint avant l'arrêt de la machine
+    """
+
+    def __init__(self, operation, accepted, value, expected, steps, space, seconds, timed_out):
+        self.operation = operation
+        self.accepted = accepted
+        self.value = value
+        self.expected = expected
+        self.steps = steps
+        self.space = space
+        self.seconds = seconds
+        self.timed_out = timed_out
+
+    def __repr__(self) -> str:
+        return (f"MachineRun({self.operation}, value={self.value!r}, steps={self.steps}, "
+                f"space={self.space})")
+
+
+def _read_value(operation: str, accepted: bool, output: str):
+    """Décode le ruban final d'une machine arithmétique."""
+    if operation == 'palindrome':
+        return accepted
+    if not accepted:
+        return None
+    if operation == 'div':
+        return parse_operands(output)
+    if output.count('1') != len(output):
+        raise RuntimeError(f"Ruban final inattendu pour '{operation}' : {output[:40]!r}")
+    return UnaryValue(len(output))
+
+
+def run(operation: str, tape: str, max_steps: int = 10 ** 12) -> MachineRun:
+    """
+    Exécute une opération sur sa machine de Turing et vérifie le résultat.
+
+    Paramètres :
+    ------------
+    operation : str
+        'palindrome', 'add', 'sub', 'mul' ou 'div'
+    tape : str
+        Mot d'entrée ('1^a#1^b' pour les opérations arithmétiques)
+    max_steps : int
+        Nombre maximum d'étapes de la machine
+
+    Retour :
+    --------
+    MachineRun
+        Résultat, étapes, espace et durée
+
+    Exceptions :
+    ------------
+    ValueError :
+        Si l'entrée n'a pas le format de l'opération (ou division par zéro)
+    RuntimeError :
+        Si la machine, arrêtée, ne donne pas le résultat de la forme close
+    """
+    if operation == 'palindrome':
+        expected = is_palindrome(tape)
+        symbols = tuple(sorted(set(tape)))
+        machine = palindrome_machine(symbols, '_' if '_' not in symbols else '\x00')
+    elif operation in MACHINES:
+        expected = ORACLES[operation](tape)
+        if tape.count('1') != len(tape) - 1:
+            raise ValueError("Format attendu : '1…1#1…1'")
+        machine = MACHINES[operation]()
+    else:
+        raise ValueError(f"Opération inconnue : {operation!r} (attendu : {', '.join(OPERATIONS)})")
+
+    with _lock(machine):
+        start = time.perf_counter()
+        result = machine.executer_rapide(tape, max_steps, trace='none')
+        seconds = time.perf_counter() - start
+        space = len(machine.ruban)
+    timed_out = not result['accepte'] and result['nb_etapes'] >= max_steps
+    value = None if timed_out else _read_value(operation, result['accepte'], result['ruban_final'])
+    if not timed_out and value != expected:
+        raise RuntimeError(f"La machine '{operation}' donne {value!r} au lieu de {expected!r}")
+    return MachineRun(operation, result['accepte'], value, expected, result['nb_etapes'],
+                      space, seconds, timed_out)
+
+
+def sample_input(operation: str, size: int) -> str:
+    """
+    Entrée de taille ``size`` pour mesurer une opération.
+
+    Retour :
+    --------
+    str
+        Palindrome de longueur ``size`` sur {a, b}, ou '1^a#1^b' avec
+        a + b + 1 = size (a ≈ 2b, pour des résultats non triviaux)
+    """
+    if operation == 'palindrome':
+        half = ('ab' * size)[:size // 2]
+        return half + 'a' * (size % 2) + half[::-1]
+    b = max((size - 1) // 3, 1)
+    return '1' * max(size - 1 - b, 0) + '#' + '1' * b
+
+
+def measure(operation: str, sizes: Iterable[int], max_steps: int = 10 ** 12) -> List[Dict]:
+    """
+    Croissance des étapes et de l'espace en fonction de la taille de l'entrée.
+
+    Retour :
+    --------
+    List[Dict]
+        Une ligne par taille : 'taille', 'etapes', 'espace', 'secondes'
+    """
+    rows = []
+    for size in sizes:
+        result = run(operation, sample_input(operation, size), max_steps)
+        rows.append({'taille': size, 'etapes': result.steps, 'espace': result.space,
+                     'secondes': result.seconds})
+    return rows
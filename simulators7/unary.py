@@ -0,0 +1,143 @@
+"""
+Valeurs unaires compactes pour les opérations de simulators7.
+
+Un entier unaire '111…1' est représenté par son nombre de symboles, sans
+jamais construire la chaîne : un produit ou un quotient de plusieurs
+millions reste un simple entier. La chaîne n'est rendue que sur demande
+(render(), preview()).
+
+Les entrées 'gauche#droite' sont lues sans copie : un seul str.find
+localise le séparateur, et les longueurs des opérandes s'en déduisent
+(str, bytes ou mmap).
+"""
+import mmap
+from typing import Optional, Tuple, Union
+
+Tape = Union[str, bytes, bytearray, mmap.mmap]
+
+
+class UnaryValue:
+    """
+    Entier naturel en unaire, stocké sous forme de compteur.
+
+    Attributs :
+    -----------
+    count : int
+        Nombre de symboles '1' de la représentation unaire
+    """
+
+    __slots__ = ('count',)
+
+    def __init__(self, count: int):
+        if count < 0:
+            raise ValueError("Une valeur unaire ne peut pas être négative")
+        self.count = count
+
+    def render(self, zero: str = '') -> str:
+        """
+        Construit la chaîne unaire complète (coût proportionnel à la valeur).
+
+        Paramètres :
+        ------------
+        zero : str
+            Chaîne retournée pour la valeur 0 ('' par défaut, '0' pour la
+            convention de la soustraction et du reste)
+        """
+        return '1' * self.count if self.count else zero
+
+    def preview(self, width: int = 40, zero: str = '') -> str:
+        """
+        Aperçu borné de la chaîne unaire, pour l'affichage.
+
+        Retour :
+        --------
+        str
+            La chaîne complète si elle tient en ``width`` symboles, sinon
+            ses ``width`` premiers symboles suivis de la longueur totale
+        """
+        if self.count <= width:
+            return self.render(zero)
+        return f"{'1' * width}… ({self.count} symboles)"
+
+    def __int__(self) -> int:
+        return self.count
+
+    def __index__(self) -> int:
+        return self.count
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, UnaryValue):
+            return self.count == other.count
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.count)
+
+    def __repr__(self) -> str:
+        return f"UnaryValue({self.count})"
+
+
+def parse_operands(tape: Tape, start: int = 0, end: Optional[int] = None) -> Tuple[UnaryValue, UnaryValue]:
+    """
+    Lit deux entiers unaires séparés par '#', sans copier l'entrée.
+
+    Paramètres :
+    ------------
+    tape : str | bytes | bytearray | mmap
+        Entrée 'gauche#droite' (ou une zone de cette entrée)
+    start, end : int
+        Zone à lire (toute l'entrée par défaut)
+
+    Retour :
+    --------
+    Tuple[UnaryValue, UnaryValue]
+        Les deux opérandes (longueurs des blocs de part et d'autre du '#')
+
+    Exceptions :
+    ------------
+    ValueError :
+        Si l'entrée ne contient pas exactement un '#'
+    """
+    end = len(tape) if end is None else end
+    separator = '#' if isinstance(tape, str) else b'#'
+    position = tape.find(separator, start, end)
+    if position < 0:
+        raise ValueError("Format attendu : deux nombres unaires séparés par '#'")
+    if tape.find(separator, position + 1, end) >= 0:
+        raise ValueError("L'entrée contient plusieurs '#'")
+    return UnaryValue(position - start), UnaryValue(end - position - 1)
+
+
+def add(left: UnaryValue, right: UnaryValue) -> UnaryValue:
+    """Somme de deux valeurs unaires."""
+    return UnaryValue(left.count + right.count)
+
+
+def sub(left: UnaryValue, right: UnaryValue) -> UnaryValue:
+    """Différence tronquée à zéro : max(left - right, 0)."""
+    return UnaryValue(max(left.count - right.count, 0))
+
+
+def mul(left: UnaryValue, right: UnaryValue) -> UnaryValue:
+    """Produit de deux valeurs unaires."""
+    return UnaryValue(left.count * right.count)
+
+
+def div(left: UnaryValue, right: UnaryValue) -> Tuple[UnaryValue, UnaryValue]:
+    """
+    Division euclidienne de deux valeurs unaires.
+
+    Retour :
+    --------
+    Tuple[UnaryValue, UnaryValue]
+        (quotient, reste)
+
+    Exceptions :
+    ------------
+    ValueError :
+        Levée si le diviseur est nul (division par zéro)
+    """
+    if right.count == 0:
+        raise ValueError("Division par zéro")
+    quotient, remainder = divmod(left.count, right.count)
+    return UnaryValue(quotient), UnaryValue(remainder)
@@ -1,3 +1,21 @@
+from simulators7.unary import UnaryValue, add, parse_operands
+
+
+def compute_value(w: str) -> UnaryValue:
+    """
+    Addition unaire sur valeurs compactes : '111#11' => UnaryValue(5)
+
+    L'entrée est lue sans copie (voir unary.parse_operands) et la somme
+    n'est jamais construite sous forme de chaîne.
+
+    Exceptions :
+    ------------
+    ValueError :
+        Levée si l'entrée ne contient pas exactement un '#'
+    """
+    return add(*parse_operands(w))
+
+
 def compute(w: str) -> str:
     """
     Fonction de calcul simple représentant une addition unaire.
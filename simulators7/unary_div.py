@@ -1,3 +1,19 @@
+from simulators7.unary import UnaryValue, div, parse_operands
+
+
+def compute_value(tape: str) -> tuple[UnaryValue, UnaryValue]:
+    """
+    Division euclidienne sur valeurs compactes : '1111#11' => (UnaryValue(2), UnaryValue(0))
+
+    Exceptions :
+    ------------
+    ValueError :
+        Levée si l'entrée ne contient pas exactement un '#', ou si le
+        diviseur est vide (division par zéro)
+    """
+    return div(*parse_operands(tape))
+
+
 def compute(tape: str) -> tuple[str, str]:
     """
     Division euclidienne en unaire : '1111#11' => ('11', '0')  (4 ÷ 2)
@@ -1,3 +1,21 @@
+from simulators7.unary import UnaryValue, mul, parse_operands
+
+
+def compute_value(tape: str) -> UnaryValue:
+    """
+    Multiplication unaire sur valeurs compactes : '111#11' => UnaryValue(6)
+
+    Le produit reste un compteur : aucune chaîne de a × b symboles n'est
+    allouée (voir UnaryValue.render pour l'obtenir).
+
+    Exceptions :
+    ------------
+    ValueError :
+        Levée si l'entrée ne contient pas exactement un '#'
+    """
+    return mul(*parse_operands(tape))
+
+
 def compute(tape: str) -> str:
     """
     Multiplie deux entiers en unaire : '111#11' => '111111' (3 × 2 = 6)
@@ -1,3 +1,18 @@
+from simulators7.unary import UnaryValue, parse_operands, sub
+
+
+def compute_value(w: str) -> UnaryValue:
+    """
+    Soustraction unaire sur valeurs compactes : '1111#11' => UnaryValue(2)
+
+    Exceptions :
+    ------------
+    ValueError :
+        Levée si l'entrée ne contient pas exactement un '#'
+    """
+    return sub(*parse_operands(w))
+
+
 def compute(w: str) -> str:
     """
     Soustraction en unaire : calcule max(len(left) - len(right), 0)
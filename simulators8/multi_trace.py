@@ -0,0 +1,177 @@
+"""
+Trace paresseuse d'une machine de Turing à k rubans.
+
+Chaque étape n'enregistre que l'état, la position des k têtes et les k
+symboles écrits (coût O(k)). Le début de la zone visitée de chaque ruban
+(à partir de min(0, case la plus à gauche)) n'est recopié que toutes
+les ``keyframe_interval`` étapes ; la chaîne d'une étape (même format que
+MultiTapeTuringMachine.snapshot) n'est construite que lorsqu'on la lit, en
+rejouant les écritures depuis l'image précédente.
+"""
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional
+
+from simulators8.paged_tape import BLANK
+
+SNAPSHOT_WIDTH = 30          # nombre de cases affichées par ruban
+KEYFRAME_INTERVAL = 512      # étapes entre deux images du début des rubans
+
+
+def format_snapshot(state, cells, heads, width: int = SNAPSHOT_WIDTH) -> str:
+    """Chaîne d'une configuration : état, puis début de chaque ruban et position de sa tête."""
+    return f"{state} | " + " || ".join(
+        "".join(cells[i][:width])[:width] + f" (H{heads[i]})" for i in range(len(heads))
+    )
+
+
+class MultiTapeTrace(Sequence):
+    """
+    Trace complète ('full') d'une MultiTapeTuringMachine, rendue à la demande.
+
+    Se comporte comme la liste de chaînes historique : ``trace[i]``,
+    ``len(trace)``, itération et tranches.
+
+    Attributs :
+    -----------
+    width : int
+        Nombre de cases affichées par ruban
+    keyframe_interval : int
+        Nombre d'étapes entre deux images du début des rubans
+    """
+
+    def __init__(self, machine, width: int = SNAPSHOT_WIDTH,
+                 keyframe_interval: int = KEYFRAME_INTERVAL, entries: Optional[List[str]] = None):
+        """
+        Paramètres :
+        ------------
+        machine : MultiTapeTuringMachine
+            Machine dont les rubans fournissent les images périodiques
+        entries : list
+            Entrées déjà rendues, conservées en tête de trace (facultatif)
+        """
+        self.width = width
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._machine = machine
+        self._k = machine.k
+        self._entries = list(entries or [])
+        self._state_names: List[str] = []
+        self._state_codes: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._symbol_codes: Dict[str, int] = {}
+        self._states = array('H')
+        self._heads = array('q')      # k positions par étape, à plat
+        self._written = array('H')    # k symboles écrits par étape, à plat
+        self._keyframe_steps = array('q')
+        self._keyframes = []          # par ruban : (low, high, cases affichées)
+        self._keyframe_due = True
+
+    def invalidate(self):
+        """Force une image à la prochaine étape (rubans modifiés hors transition)."""
+        self._keyframe_due = True
+
+    def _code(self, codes: Dict[str, int], names: List[str], name: str) -> int:
+        code = codes.get(name)
+        if code is None:
+            code = codes[name] = len(names)
+            names.append(name)
+        return code
+
+    def record(self, state: str, heads: List[int], written=None):
+        """
+        Ajoute une étape à la trace.
+
+        Paramètres :
+        ------------
+        state : str
+            État après la transition
+        heads : list
+            Positions des têtes après la transition
+        written : sequence ou None
+            Symboles écrits par la transition, aux positions des têtes de
+            l'étape précédente ; None pour une configuration sans transition
+            (une image est alors prise)
+        """
+        index = len(self._states)
+        if written is None or self._keyframe_due or index % self.keyframe_interval == 0:
+            self._keyframe_steps.append(index)
+            self._keyframes.append([(tape.low, tape.high, tape.window(self.width)) for tape in self._machine.tapes])
+            self._keyframe_due = False
+            written = ()
+        codes, names = self._symbol_codes, self._symbols
+        self._written.extend([self._code(codes, names, s) for s in written] if written else [0] * self._k)
+        self._states.append(self._code(self._state_codes, self._state_names, state))
+        self._heads.extend(heads)
+
+    def _render(self, index: int, views: List[list]) -> str:
+        k = self._k
+        return format_snapshot(self._state_names[self._states[index]], [view[2] for view in views],
+                               self._heads[index * k:index * k + k], self.width)
+
+    def _visit(self, view: list, position: int):
+        """Étend la zone visitée d'un ruban reconstruit [low, high, cases affichées]."""
+        low, high, cells = view
+        start = min(0, low)
+        if position < low:
+            view[0] = low = position
+            if position < start:
+                cells[0:0] = [BLANK] * (start - position)
+                del cells[self.width:]
+                start = position
+        if position > high:
+            view[1] = high = position
+        cells.extend([BLANK] * (min(high + 1, start + self.width) - start - len(cells)))
+
+    def _apply(self, index: int, views: List[list]):
+        """Rejoue sur ``views`` l'étape ``index`` (écritures puis déplacements)."""
+        k = self._k
+        for i in range(k):
+            view = views[i]
+            position = self._heads[(index - 1) * k + i]
+            self._visit(view, position)
+            offset = position - min(0, view[0])
+            if offset < len(view[2]):
+                view[2][offset] = self._symbols[self._written[index * k + i]]
+            self._visit(view, self._heads[index * k + i])
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._states)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("étape hors de la trace")
+        if index < len(self._entries):
+            return self._entries[index]
+        index -= len(self._entries)
+        frame = bisect_right(self._keyframe_steps, index) - 1
+        first = self._keyframe_steps[frame]
+        views = [[low, high, list(cells)] for low, high, cells in self._keyframes[frame]]
+        for j in range(first + 1, index + 1):
+            self._apply(j, views)
+        return self._render(index, views)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._entries
+        frame, views = 0, []
+        for index in range(len(self._states)):
+            if frame < len(self._keyframe_steps) and self._keyframe_steps[frame] == index:
+                views = [[low, high, list(cells)] for low, high, cells in self._keyframes[frame]]
+                frame += 1
+            else:
+                self._apply(index, views)
+            yield self._render(index, views)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Sequence):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"MultiTapeTrace({len(self)} étapes)"
@@ -0,0 +1,112 @@
+"""
+Ruban bi-infini creux, découpé en pages, pour les machines à k rubans.
+
+Les cases sont stockées par pages de PAGE_SIZE octets (un code de symbole
+par case, 0 pour le blanc 'B'), allouées à la première écriture d'un
+symbole non blanc, de part et d'autre de l'origine. Une région blanche ne
+coûte aucune mémoire, et l'accès à une case quelconque (y compris aux
+positions négatives) se fait en O(1) : une recherche dans le dictionnaire
+des pages, puis un indice dans la page.
+"""
+from typing import Dict, Iterable, Iterator, List
+
+BLANK = 'B'
+PAGE_BITS = 12
+PAGE_SIZE = 1 << PAGE_BITS   # cases par page
+PAGE_MASK = PAGE_SIZE - 1
+
+
+class PagedTape:
+    """
+    Ruban bi-infini d'une MultiTapeTuringMachine.
+
+    Attributs :
+    -----------
+    low, high : int
+        Bornes de la zone visitée (cases lues par une tête, écrites, ou
+        contenu initial) ; high < low pour un ruban vide
+    symbols : List[str]
+        Symboles du ruban, indexés par leur code (0 : le blanc)
+    """
+
+    def __init__(self, content: Iterable[str] = (BLANK,)):
+        """
+        Paramètres :
+        ------------
+        content : str ou liste de symboles
+            Contenu initial, écrit à partir de la position 0
+        """
+        self.pages: Dict[int, bytearray] = {}
+        self.symbols: List[str] = [BLANK]
+        self.codes: Dict[str, int] = {BLANK: 0}
+        self.low = 0
+        self.high = -1
+        for position, symbol in enumerate(content):
+            self[position] = symbol
+
+    def _code(self, symbol: str) -> int:
+        code = self.codes.get(symbol)
+        if code is None:
+            if len(self.symbols) == 256:
+                raise ValueError("Un ruban ne peut pas contenir plus de 256 symboles distincts")
+            code = self.codes[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return code
+
+    def visit(self, position: int):
+        """Étend la zone visitée jusqu'à ``position`` (tête déplacée sur une case)."""
+        if position < self.low:
+            self.low = position
+        if position > self.high:
+            self.high = position
+
+    def __getitem__(self, position: int) -> str:
+        page = self.pages.get(position >> PAGE_BITS)
+        return BLANK if page is None else self.symbols[page[position & PAGE_MASK]]
+
+    def __setitem__(self, position: int, symbol: str):
+        if position < self.low:
+            self.low = position
+        if position > self.high:
+            self.high = position
+        code = self.codes.get(symbol)
+        if code is None:
+            code = self._code(symbol)
+        page = self.pages.get(position >> PAGE_BITS)
+        if page is None:
+            if code == 0:
+                return  # blanc sur une page jamais écrite : rien à allouer
+            page = self.pages[position >> PAGE_BITS] = bytearray(PAGE_SIZE)
+        page[position & PAGE_MASK] = code
+
+    def window(self, width: int) -> List[str]:
+        """
+        Début de la zone visitée, pour l'affichage.
+
+        Retour :
+        --------
+        List[str]
+            Les ``width`` premières cases à partir de min(0, low), au plus
+            jusqu'à la dernière case visitée
+        """
+        start = min(0, self.low)
+        return [self[position] for position in range(start, min(self.high + 1, start + width))]
+
+    def __len__(self) -> int:
+        """Nombre de cases de la zone visitée (de min(0, low) à high)."""
+        return max(0, self.high + 1 - min(0, self.low))
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(min(0, self.low), self.high + 1):
+            yield self[position]
+
+    def __str__(self) -> str:
+        return "".join(self)
+
+    @property
+    def memory(self) -> int:
+        """Octets alloués pour les cases (pages non blanches)."""
+        return len(self.pages) * PAGE_SIZE
+
+    def __repr__(self) -> str:
+        return f"PagedTape({len(self)} cases visitées, {len(self.pages)} pages)"
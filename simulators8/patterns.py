@@ -0,0 +1,120 @@
+"""
+Motifs de transition par ruban pour les machines à k rubans.
+
+Dans une clé de transition ``(état, lu_1, ..., lu_k)``, un symbole lu peut
+être remplacé par ANY ('*') : la transition s'applique quel que soit le
+symbole sous cette tête. Dans la liste des symboles écrits, SAME ('=')
+réécrit le symbole lu sur ce ruban. Une machine à 3 ou 4 rubans s'écrit
+ainsi en quelques motifs au lieu de |Q|·|Γ|ᵏ transitions explicites :
+
+    {('copie', '0', '*'): ('copie', ['=', '0'], ['R', 'R']), ...}
+
+Les motifs sont compilés par état en un index de bitsets : pour chaque
+ruban, un masque des motifs compatibles avec chaque symbole (motifs qui
+l'attendent explicitement, ou ANY sur ce ruban). Une recherche fait le ET
+des k masques (O(k)) et retient le motif compatible le plus prioritaire :
+le plus spécifique (le moins de ANY), puis le premier défini. Les clés
+explicites restent dans un dictionnaire consulté en premier, et chaque
+configuration déjà résolue par motif y est mémorisée.
+"""
+from typing import Dict, List, Optional, Tuple
+
+ANY = '*'
+SAME = '='
+
+Action = Tuple[str, List[str], List[str]]
+
+
+class TransitionIndex:
+    """
+    Table de transitions d'une machine à k rubans, avec motifs ANY et SAME.
+
+    Attributs :
+    -----------
+    exact : Dict[tuple, Action]
+        Transitions explicites, plus les configurations déjà résolues
+    patterns : Dict[str, List[Tuple[tuple, Action]]]
+        Motifs contenant ANY, par état, du plus au moins prioritaire
+    """
+
+    MEMO_LIMIT = 1 << 16   # configurations résolues mémorisées au plus
+
+    def __init__(self, k: int, transitions: Dict[tuple, Action]):
+        """
+        Paramètres :
+        ------------
+        k : int
+            Nombre de rubans
+        transitions : dict
+            {(état, lu_1, ..., lu_k): (nouvel_état, [écrits], [directions])}
+
+        Exceptions :
+        ------------
+        ValueError :
+            Si une clé n'a pas k symboles lus
+        """
+        self.k = k
+        self.exact: Dict[tuple, Action] = {}
+        self.patterns: Dict[str, List[Tuple[tuple, Action]]] = {}
+        for order, (key, action) in enumerate(transitions.items()):
+            if len(key) != k + 1:
+                raise ValueError(f"Transition {key!r} : {k} symboles lus attendus")
+            if ANY in key[1:]:
+                self.patterns.setdefault(key[0], []).append((key, action))
+            elif SAME in action[1]:
+                self.exact[key] = self._resolve(key[1:], action)
+            else:
+                self.exact[key] = action
+        self._memo = 0
+
+        # Par état : masques par ruban {symbole: bits} et bits des ANY
+        self._masks: Dict[str, List[Dict[str, int]]] = {}
+        self._any: Dict[str, List[int]] = {}
+        for state, patterns in self.patterns.items():
+            patterns.sort(key=lambda pattern: pattern[0][1:].count(ANY))   # tri stable : ordre de définition
+            masks = [{} for _ in range(k)]
+            any_masks = [0] * k
+            for bit, (key, _) in enumerate(patterns):
+                for i, symbol in enumerate(key[1:]):
+                    if symbol == ANY:
+                        any_masks[i] |= 1 << bit
+                    else:
+                        masks[i][symbol] = masks[i].get(symbol, 0) | 1 << bit
+            self._masks[state] = masks
+            self._any[state] = any_masks
+
+    @staticmethod
+    def _resolve(symbols: tuple, action: Action) -> Action:
+        """Remplace SAME par le symbole lu sur chaque ruban."""
+        new_state, written, directions = action
+        return new_state, [read if out == SAME else out for read, out in zip(symbols, written)], directions
+
+    def lookup(self, state: str, symbols: tuple) -> Optional[Action]:
+        """
+        Transition applicable dans l'état ``state`` sous les symboles lus.
+
+        Retour :
+        --------
+        Action ou None
+            (nouvel_état, [écrits], [directions]) avec SAME résolu, ou None
+            si aucune transition ni aucun motif ne s'applique
+        """
+        key = (state,) + symbols
+        action = self.exact.get(key)
+        if action is not None or state not in self._masks:
+            return action
+        masks, any_masks = self._masks[state], self._any[state]
+        candidates = -1
+        for i in range(self.k):
+            candidates &= masks[i].get(symbols[i], 0) | any_masks[i]
+            if not candidates:
+                return None
+        action = self._resolve(symbols, self.patterns[state][(candidates & -candidates).bit_length() - 1][1])
+        if self._memo < self.MEMO_LIMIT:
+            self.exact[key] = action
+            self._memo += 1
+        return action
+
+    def __len__(self) -> int:
+        """Nombre de transitions et de motifs définis (hors configurations mémorisées)."""
+        return len(self.exact) - self._memo + sum(map(len, self.patterns.values()))
@@ -0,0 +1,248 @@
+"""
+Compilation d'une machine à k rubans en machine à un seul ruban.
+
+Construction classique à pistes multiples : chaque case du ruban unique
+porte k pistes, et chaque piste un symbole du ruban correspondant et une
+marque '^' si la tête de ce ruban est sur cette case. Une étape de la
+machine à k rubans est simulée en deux balayages :
+
+1. lecture (vers la droite) : depuis une case à gauche de toutes les
+   marques, la tête avance en relevant le symbole sous chaque marque,
+   jusqu'à la dernière marque ; la transition à appliquer est alors connue ;
+2. écriture (vers la gauche) : la tête revient en traitant chaque marque :
+   elle écrit le nouveau symbole de la piste et déplace la marque d'une
+   case (un aller-retour pour un déplacement à droite, la case suivante du
+   balayage pour un déplacement à gauche), puis s'arrête une case à gauche
+   de la marque la plus à gauche : le balayage de lecture suivant commence.
+
+Le ruban unique est un Ruban de simulators6 (bi-infini, codé sur un octet) :
+la machine obtenue est une MachineDeTuring exécutée par executer_rapide(),
+dont la compilation saute d'un coup les cases sans marque des balayages.
+Le nombre de pistes est limité par les 256 symboles d'un ruban :
+(2·|Γ|)ᵏ ≤ 256 (par exemple k = 2 avec |Γ| ≤ 8, k = 3 avec |Γ| ≤ 3).
+"""
+import itertools
+from collections import deque
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from simulators6.machin_de_turing import MachineDeTuring
+from simulators6.ruban import Ruban
+from simulators8.paged_tape import BLANK
+from simulators8.patterns import ANY, SAME
+
+MARK = '^'
+
+Cell = Tuple[Tuple[str, bool], ...]
+
+
+def cell_name(cell: Cell) -> str:
+    """Symbole du ruban unique pour une case : pistes séparées par '|', '^' sur les têtes."""
+    return "[" + "|".join(symbol + (MARK if marked else "") for symbol, marked in cell) + "]"
+
+
+class SingleTapeMachine:
+    """
+    Machine à un ruban équivalente à une MultiTapeTuringMachine.
+
+    Attributs :
+    -----------
+    k : int
+        Nombre de rubans simulés (pistes)
+    machine : MachineDeTuring
+        Machine à un ruban compilée
+    cells : Dict[str, Cell]
+        Symbole du ruban unique -> contenu des k pistes
+    """
+
+    def __init__(self, k: int, machine: MachineDeTuring, cells: Dict[str, Cell]):
+        self.k = k
+        self.machine = machine
+        self.cells = cells
+        self._names = {cell: name for name, cell in cells.items()}
+
+    def encode(self, contents: Sequence[Iterable[str]]) -> List[str]:
+        """
+        Mot d'entrée du ruban unique pour le contenu initial des k rubans.
+
+        Paramètres :
+        ------------
+        contents : liste de k chaînes (ou listes de symboles)
+            Contenu de chaque ruban à partir de la position 0, têtes en 0
+        """
+        tapes = [list(content) for content in contents]
+        tapes += [[] for _ in range(self.k - len(tapes))]
+        width = max(1, max(map(len, tapes)))
+        try:
+            return [self._names[tuple((tape[p] if p < len(tape) else BLANK, p == 0) for tape in tapes)]
+                    for p in range(width)]
+        except KeyError:
+            raise ValueError("Symbole d'entrée absent de l'alphabet de la machine compilée") from None
+
+    def decode(self, ruban: Ruban) -> Tuple[List[str], List[int]]:
+        """
+        Contenu des k rubans simulés et position de leurs têtes.
+
+        Retour :
+        --------
+        (List[str], List[int])
+            Contenu de chaque piste (sans les blancs de bord) et position
+            de chaque tête, relative à l'origine du ruban unique
+        """
+        tracks = [[] for _ in range(self.k)]
+        heads = [0] * self.k
+        for position in range(len(ruban)):
+            cell = self.cells[ruban[position]]
+            for i, (symbol, marked) in enumerate(cell):
+                tracks[i].append(symbol)
+                if marked:
+                    heads[i] = position - (ruban.origine - ruban.debut)
+        return ["".join(track).strip(BLANK) for track in tracks], heads
+
+    def run(self, contents: Sequence[Iterable[str]], max_steps: int = 10 ** 7) -> Dict:
+        """
+        Exécute la machine à un ruban sur le contenu initial des k rubans.
+
+        Retour :
+        --------
+        Dict
+            Résultat de executer_rapide (sans trace), plus 'rubans' et
+            'tetes' : les k rubans simulés décodés
+        """
+        result = self.machine.executer_rapide(self.encode(contents), max_steps, trace='none')
+        result['rubans'], result['tetes'] = self.decode(self.machine.ruban)
+        return result
+
+
+def compile_single_tape(machine, input_alphabet: Iterable[str] = ()) -> SingleTapeMachine:
+    """
+    Compile une MultiTapeTuringMachine en machine à un ruban (pistes multiples).
+
+    Paramètres :
+    ------------
+    machine : MultiTapeTuringMachine
+        Machine à k rubans (les motifs '*' et '=' sont acceptés), compilée
+        depuis son état initial quel que soit son état courant
+    input_alphabet : Iterable[str]
+        Symboles d'entrée qui n'apparaissent dans aucune transition
+
+    Retour :
+    --------
+    SingleTapeMachine
+        Machine équivalente : même acceptation, mêmes rubans finaux
+
+    Exceptions :
+    ------------
+    ValueError :
+        Si l'alphabet des pistes dépasse 256 symboles
+    """
+    k, index = machine.k, machine.index
+    alphabet = {BLANK, *input_alphabet}
+    for key, (_, written, _) in machine.transitions.items():
+        alphabet.update(symbol for symbol in key[1:] if symbol != ANY)
+        alphabet.update(symbol for symbol in written if symbol != SAME)
+    alphabet = sorted(alphabet)
+    if (2 * len(alphabet)) ** k > Ruban.MAX_SYMBOLES:
+        raise ValueError(f"{k} pistes sur {len(alphabet)} symboles : (2·{len(alphabet)})^{k} cases dépassent "
+                         f"les {Ruban.MAX_SYMBOLES} symboles d'un ruban")
+
+    cells = {}
+    for cell in itertools.product(itertools.product(alphabet, (False, True)), repeat=k):
+        name = cell_name(cell)
+        if name in cells:
+            raise ValueError(f"Symboles ambigus dans les pistes : {name}")
+        cells[name] = cell
+    blank = cell_name(((BLANK, False),) * k)
+    tracks = range(k)
+    cell_names = {cell: name for name, cell in cells.items()}
+    marks = {cell: frozenset(i for i in tracks if cell[i][1]) for cell in cells.values()}
+
+    def with_marks(cell, marks):
+        return tuple((symbol, flag or i in marks) for i, (symbol, flag) in enumerate(cell))
+
+    # États : ('lire', q, symboles relevés, marques à poser), ('ecrire', action, traités, marques à poser),
+    # ('droite', action, traités, marques à droite, marques à gauche), ('retour', action, traités, marques à gauche)
+    # et ('bloque',), sans transition
+    actions: List[Tuple] = []
+    action_ids: Dict[Tuple, int] = {}
+    names: Dict[Tuple, str] = {}
+
+    def name(state) -> str:
+        text = names.get(state)
+        if text is None:
+            text = names[state] = repr(state)
+            pending.append(state)
+        return text
+
+    def after_cell(number, done, left):
+        """État suivant, une case plus à gauche : écriture ou, si tout est traité, lecture suivante."""
+        if len(done) == k:
+            return ('lire', actions[number][0], (None,) * k, left)
+        return ('ecrire', number, done, left)
+
+    pending = deque()
+    start = name(('lire', machine.start_state, (None,) * k, frozenset()))
+    transitions = {}
+    finals = set()
+    while pending:
+        state = pending.popleft()
+        kind = state[0]
+        if kind == 'lire' and state[1] in machine.accept_states and not state[3]:
+            finals.add(names[state])
+            continue
+        if kind == 'bloque':
+            continue
+        for symbol, cell in cells.items():
+            key = (names[state], symbol)
+            if kind == 'lire':
+                _, q, reads, place = state
+                if any(reads[i] is not None for i in marks[cell]) or any(cell[i][1] for i in place):
+                    continue   # deux marques sur une même piste : case impossible
+                new = with_marks(cell, place)
+                if q in machine.accept_states:
+                    # Acceptation : poser les dernières marques avant de s'arrêter
+                    transitions[key] = (name(('lire', q, reads, frozenset())), cell_names[new], 'S')
+                    continue
+                reads = tuple(cell[i][0] if new[i][1] else reads[i] for i in tracks)
+                if None in reads:
+                    transitions[key] = (name(('lire', q, reads, frozenset())), cell_names[new], 'R')
+                    continue
+                action = index.lookup(q, reads)
+                if action is None:
+                    # Blocage : aucune transition applicable (les marques sont posées avant l'arrêt)
+                    transitions[key] = (name(('bloque',)), cell_names[new], 'S')
+                    continue
+                action = (action[0], tuple(action[1]), tuple(action[2]))
+                number = action_ids.setdefault(action, len(actions))
+                if number == len(actions):
+                    actions.append(action)
+                transitions[key] = (name(('ecrire', number, frozenset(), frozenset())), cell_names[new], 'S')
+            elif kind == 'ecrire':
+                _, number, done, place = state
+                if any(cell[i][1] for i in place):
+                    continue
+                _, written, directions = actions[number]
+                todo = marks[cell] - done
+                new = list(with_marks(cell, place))
+                right, left = set(), set()
+                for i in todo:
+                    new[i] = (written[i], directions[i] == 'S')
+                    (right if directions[i] == 'R' else left if directions[i] == 'L' else set()).add(i)
+                done = done | todo
+                new = cell_names[tuple(new)]
+                if right:
+                    transitions[key] = (name(('droite', number, done, frozenset(right), frozenset(left))), new, 'R')
+                else:
+                    transitions[key] = (name(after_cell(number, done, frozenset(left))), new, 'L')
+            elif kind == 'droite':
+                _, number, done, right, left = state
+                if any(cell[i][1] for i in right):
+                    continue
+                transitions[key] = (name(('retour', number, done, left)), cell_names[with_marks(cell, right)], 'L')
+            else:
+                _, number, done, left = state
+                transitions[key] = (name(after_cell(number, done, left)), symbol, 'L')
+
+    states = set(names.values())
+    single = MachineDeTuring(states, set(cells), set(cells), transitions, start, finals, blank)
+    single.compiler()
+    return SingleTapeMachine(k, single, cells)
@@ -1,71 +1,180 @@
 # tm_2tape_palindrome.py
-def run(w):
+import itertools
+
+from simulators6.options_trace import FULL, NONE, SUMMARY, Echantillonneur, lire_options
+from simulators8.patterns import ANY, SAME
+from simulators8.tm_multi import MultiTapeTuringMachine
+
+# La même machine sous forme de table de transitions à 2 rubans (w ∈ {0,1}*) :
+# copie de w sur le ruban 2, retour de la tête 2 au début, puis comparaison
+TRANSITIONS = {
+    **{('copy', x, 'B'): ('copy', [x, x], ['R', 'R']) for x in '01'},
+    ('copy', '#', 'B'): ('rewind', ['#', 'B'], ['R', 'L']),
+    **{('rewind', ANY, x): ('rewind', [SAME, x], ['S', 'L']) for x in '01'},
+    ('rewind', ANY, 'B'): ('compare', [SAME, 'B'], ['S', 'R']),
+    **{('compare', x, x): ('compare', [x, x], ['R', 'R']) for x in '01'},
+    ('compare', 'B', 'B'): ('q_accept', ['B', 'B'], ['S', 'S']),
+}
+
+def multi_tape_machine(trace=NONE):
     """
-    Fonction simulant une machine de Turing à deux rubans pour vérifier si
-    une chaîne de la forme 'mot#mot' est un palindrome (deux parties identiques).
-    
-    Paramètre :
-    - w (str) : chaîne d'entrée contenant exactement un '#' séparant deux parties.
-    
-    Retour :
-    - (bool, list) : un booléen indiquant si la chaîne est valide palindrome,
-      et une liste de chaînes décrivant la trace détaillée de l'exécution.
+    Retourne la machine à 2 rubans (MultiTapeTuringMachine) reconnaissant
+    L = {w#w | w ∈ {0,1}*} ; le mot est à placer sur le ruban 1.
+    """
+    return MultiTapeTuringMachine(2, TRANSITIONS, start_state='copy', trace=trace)
+
+def _steps(w):
+    """
+    Générateur des étapes de la machine (w doit contenir un '#').
+
+    Produit d'abord la fabrique des lignes d'initialisation, puis une
+    fabrique par étape de copie ou de comparaison. Chaque fabrique rend
+    les lignes de son étape à partir des rubans courants : elle doit être
+    appelée avant de passer à l'étape suivante. La valeur de retour du
+    générateur (StopIteration.value) est le résultat de la machine.
     """
-    
-    trace = []  # Liste pour stocker la trace des étapes de l'exécution
-    
-    # Vérification de la présence du symbole '#' obligatoire
-    if "#" not in w:
-        return False, ["Erreur : # manquant"]
-    
-    # Séparation de la chaîne en deux parties, avant et après le '#'
-    left, right = w.split("#")
-    
     # Initialisation des deux rubans
-    tape1 = list(w)       # Ruban 1 : contient toute la chaîne d'entrée
-    tape2 = list(left)    # Ruban 2 : copie initiale de la partie gauche (avant '#')
-    
+    tape1 = list(w)                 # Ruban 1 : contient toute la chaîne d'entrée
+    tape2 = list(w[:w.find("#")])   # Ruban 2 : copie initiale de la partie gauche (avant '#')
+
     # Initialisation des positions des têtes de lecture sur les rubans
     pos1 = 0  # position de la tête sur ruban 1
     pos2 = 0  # position de la tête sur ruban 2
-    
-    # Ajout des informations initiales dans la trace
-    trace.append(f"Initialisation:")
-    trace.append(f"Ruban 1: {''.join(tape1)} (position {pos1})")
-    trace.append(f"Ruban 2: {''.join(tape2)} (position {pos2})")
-    trace.append("---")
-    
+    steps = 0
+
+    def tapes():
+        return [f"Ruban 1: {''.join(tape1)} (position {pos1})",
+                f"Ruban 2: {''.join(tape2)} (position {pos2})"]
+
+    yield lambda: ["Initialisation:"] + tapes() + ["---"]
+
     # Phase 1 : copie des symboles avant '#' du ruban 1 vers le ruban 2
     while pos1 < len(tape1) and tape1[pos1] != '#':
-        trace.append(f"Étape {len(trace)}: Copie '{tape1[pos1]}' du ruban 1 au ruban 2")
+        # Numérotation historique : 4 lignes par étape, après les 4 lignes d'initialisation
+        label = f"Étape {4 + 4 * steps}: Copie '{tape1[pos1]}' du ruban 1 au ruban 2"
         tape2[pos2] = tape1[pos1]  # copie du symbole
         pos1 += 1
         pos2 += 1
-        trace.append(f"Ruban 1: {''.join(tape1)} (position {pos1})")
-        trace.append(f"Ruban 2: {''.join(tape2)} (position {pos2})")
-        trace.append("---")
-    
+        yield lambda: [label] + tapes() + ["---"]
+        steps += 1
+
     pos1 += 1  # On saute le symbole '#'
     pos2 = 0   # Retour à la position initiale du ruban 2 pour comparaison
-    
+
     # Phase 2 : comparaison caractère par caractère entre la partie droite et la copie
-    result = True  # flag indiquant si les deux parties sont identiques
-    
     while pos1 < len(tape1) and pos2 < len(tape2):
-        trace.append(f"Étape {len(trace)}: Comparaison '{tape1[pos1]}' (ruban1) et '{tape2[pos2]}' (ruban2)")
+        label = f"Étape {4 + 4 * steps}: Comparaison '{tape1[pos1]}' (ruban1) et '{tape2[pos2]}' (ruban2)"
         if tape1[pos1] != tape2[pos2]:
             # Si un caractère ne correspond pas, ce n'est pas un palindrome
-            result = False
-            break
+            yield lambda: [label]
+            return False
+        pos1 += 1
+        pos2 += 1
+        yield lambda: [label] + tapes() + ["---"]
+        steps += 1
+
+    return pos1 >= len(tape1) and pos2 >= len(tape2)
+
+def _drain(generator, consume):
+    """Passe chaque élément du générateur à consume() et retourne sa valeur de retour."""
+    while True:
+        try:
+            item = next(generator)
+        except StopIteration as stop:
+            return stop.value
+        consume(item)
+
+def iter_trace(w):
+    """
+    Trace complète de la machine, produite ligne par ligne à la demande.
+
+    Mêmes lignes que run(w, trace='full'), mais seules les lignes lues
+    sont construites : l'affichage des n premières lignes ne coûte que
+    les n premières étapes.
+
+    Paramètres :
+    - w (str) : chaîne d'entrée 'mot#mot'
+
+    Retour :
+    - générateur de chaînes (lignes de trace, "---" entre les étapes) ;
+      sa valeur de retour (StopIteration.value) est le résultat de la machine
+    """
+    if "#" not in w:
+        yield "Erreur : # manquant"
+        return False
+    steps = _steps(w)
+    while True:
+        try:
+            lines = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        yield from lines()
+
+def _run_fast(w, separator):
+    """
+    Exécute la machine sans trace, sur l'entrée elle-même : le ruban 2 est
+    une copie de w[:separator], donc ses cases se lisent directement dans w.
+
+    Retour :
+    - (bool, int, int, int) : résultat, nombre d'étapes, positions finales des têtes
+    """
+    n = len(w)
+    steps = separator   # Phase 1 : une copie par symbole avant le '#'
+    pos1 = separator + 1
+    pos2 = 0
+    # Phase 2 : comparaison, sans allocation par étape
+    while pos1 < n and pos2 < separator:
+        steps += 1
+        if w[pos1] != w[pos2]:
+            return False, steps, pos1, pos2
         pos1 += 1
         pos2 += 1
-        trace.append(f"Ruban 1: {''.join(tape1)} (position {pos1})")
-        trace.append(f"Ruban 2: {''.join(tape2)} (position {pos2})")
-        trace.append("---")
-    
-    # Vérification que les deux parties ont la même longueur
-    if pos1 < len(tape1) or pos2 < len(tape2):
-        result = False
-    
-    # Retourne le résultat et la trace d'exécution complète
+    return pos1 >= n and pos2 >= separator, steps, pos1, pos2
+
+def run(w, trace=FULL):
+    """
+    Fonction simulant une machine de Turing à deux rubans pour vérifier si
+    une chaîne de la forme 'mot#mot' est un palindrome (deux parties identiques).
+
+    Paramètres :
+    - w (str) : chaîne d'entrée contenant un '#' séparant deux parties.
+    - trace : niveau de trace ('none', 'summary', 'sampled[:N]', 'reservoir:N', 'full').
+      Une étape de copie ou de comparaison est l'unité d'échantillonnage.
+      Avec 'none' (ou False), l'exécution est en O(n) sans allocation par étape.
+      Aux niveaux 'full' et 'sampled', le résultat est celui de la passe tracée :
+      la machine n'est exécutée qu'une fois.
+
+    Retour :
+    - (bool, list) : un booléen indiquant si la chaîne est valide palindrome,
+      et une liste de chaînes décrivant la trace détaillée de l'exécution.
+    """
+    options = lire_options(trace)
+
+    # Vérification de la présence du symbole '#' obligatoire
+    separator = w.find("#")
+    if separator < 0:
+        return False, [] if options.niveau == NONE else ["Erreur : # manquant"]
+
+    if options.niveau in (NONE, SUMMARY):
+        result, steps, pos1, pos2 = _run_fast(w, separator)
+        if options.niveau == NONE:
+            return result, []
+        # Configuration finale et compteur
+        return result, [f"Résultat: {'accepté' if result else 'rejeté'}",
+                        f"Ruban 1: {w} (position {pos1})",
+                        f"Ruban 2: {w[:separator]} (position {pos2})",
+                        f"Étapes: {steps}"]
+    if options.niveau == FULL:
+        trace = []
+        return _drain(iter_trace(w), trace.append), trace
+
+    # 'sampled' : étapes retenues (les lignes ne sont construites que pour elles)
+    sampler = Echantillonneur(options)
+    steps = _steps(w)
+    next(steps)   # pas d'initialisation dans une trace échantillonnée
+    index = itertools.count()
+    result = _drain(steps, lambda lines: sampler.ajouter(next(index), lines))
+    trace = []
+    for lines in sampler.elements():
+        trace.extend(lines)
     return result, trace
@@ -1,4 +1,6 @@
-def run(input_str):
+from simulators6.options_trace import FULL, SAMPLED, SUMMARY, Echantillonneur, lire_options
+
+def run(input_str, trace=FULL):
     """
     Simule une machine de Turing à 3 rubans pour trier une séquence d'entiers.
 
@@ -6,8 +8,10 @@ def run(input_str):
     - Ruban 2 : ruban de travail temporaire
     - Ruban 3 : ruban de sortie triée
 
-    Paramètre:
+    Paramètres:
         input_str (str): chaîne de caractères contenant les entiers séparés par des espaces
+        trace: niveau de trace ('none', 'summary', 'sampled[:N]', 'reservoir:N', 'full').
+            Une itération (un passage sur le ruban 1) est l'unité d'échantillonnage.
 
     Retour:
         tuple (list, list): (résultat trié, trace détaillée des opérations)
@@ -18,24 +22,28 @@ def run(input_str):
     except ValueError:
         return [], ["Erreur: Entrez des nombres séparés par des espaces (ex: '5 2 7 1')"]
 
+    options = lire_options(trace)
+    sampler = Echantillonneur(options) if options.niveau == SAMPLED else None
     trace = []
+    passes = 0  # Nombre d'itérations (passages sur le ruban 1)
 
     # Initialisation des rubans
     tape1 = numbers.copy()  # Entrée
     tape2 = []              # Ruban de travail
     tape3 = []              # Ruban de sortie (triée)
 
-    trace.append("Initialisation:")
-    trace.append(f"Ruban 1 (entrée): {tape1}")
-    trace.append(f"Ruban 2 (travail): {tape2}")
-    trace.append(f"Ruban 3 (sortie): {tape3}")
-    trace.append("---")
+    if options.niveau == FULL:
+        trace.append("Initialisation:")
+        trace.append(f"Ruban 1 (entrée): {tape1}")
+        trace.append(f"Ruban 2 (travail): {tape2}")
+        trace.append(f"Ruban 3 (sortie): {tape3}")
+        trace.append("---")
 
     # Algorithme de tri par sélection simulé via les rubans
     while tape1:
         # Étape 1 : Trouver le minimum sur ruban 1
         min_val = min(tape1)
-        trace.append(f"Trouver le minimum: {min_val}")
+        moves = []  # Ruban de destination de chaque élément (seulement si la trace est demandée)
 
         tape2 = []  # Réinitialisation du ruban 2
         found_min = False
@@ -45,19 +53,36 @@ def run(input_str):
             if num == min_val and not found_min:
                 tape3.append(num)  # Écrire sur ruban 3
                 found_min = True
-                trace.append(f"Déplacer {num} vers ruban 3 (sortie)")
+                if not options.aucune:
+                    moves.append((num, "ruban 3 (sortie)"))
             else:
                 tape2.append(num)  # Garder les autres sur ruban 2
-                trace.append(f"Déplacer {num} vers ruban 2 (travail)")
+                if not options.aucune:
+                    moves.append((num, "ruban 2 (travail)"))
 
         # Étape 3 : Préparer la prochaine itération
         tape1, tape2 = tape2, []
 
-        # Trace intermédiaire
-        trace.append("État après cette itération:")
-        trace.append(f"Ruban 1: {tape1}")
-        trace.append(f"Ruban 2: {tape2}")
-        trace.append(f"Ruban 3: {tape3}")
-        trace.append("---")
+        # Trace intermédiaire (construite uniquement si l'itération est conservée)
+        def lines():
+            return ([f"Trouver le minimum: {min_val}"]
+                    + [f"Déplacer {num} vers {dest}" for num, dest in moves]
+                    + ["État après cette itération:",
+                       f"Ruban 1: {tape1}",
+                       f"Ruban 2: {tape2}",
+                       f"Ruban 3: {tape3}",
+                       "---"])
+        if options.niveau == FULL:
+            trace.extend(lines())
+        elif sampler is not None:
+            sampler.ajouter(passes, lines)
+        passes += 1
+
+    # 'sampled' : itérations retenues ; 'summary' : rubans finaux et compteur
+    if sampler is not None:
+        for lines in sampler.elements():
+            trace.extend(lines)
+    elif options.niveau == SUMMARY:
+        trace.extend([f"Ruban 3 (sortie): {tape3}", f"Itérations: {passes}"])
 
     return tape3, trace
@@ -0,0 +1,367 @@
+"""
+Tri externe par fusion sur k rubans stockés dans des fichiers temporaires.
+
+Contrairement à tm_3tape_sort (tri par sélection en mémoire), les rubans
+sont des fichiers lus et écrits séquentiellement, par blocs de
+``block_size`` nombres (entiers 64 bits) :
+
+1. Monotonies initiales : l'entrée est découpée en tranches de
+   ``run_size`` nombres, triées en mémoire et réparties à tour de rôle
+   sur les rubans 2..k.
+2. Passe de fusion : une monotonie de chacun des k-1 rubans est fusionnée
+   (fusion à k-1 voies) sur le ruban 1, jusqu'à épuisement des rubans.
+3. S'il reste plusieurs monotonies sur le ruban 1, elles sont
+   redistribuées sur les rubans 2..k et une nouvelle passe commence.
+
+La mémoire utilisée est bornée par run_size + k × block_size nombres,
+quelle que soit la taille de l'entrée, et le nombre de passes est
+⌈log_{k-1}(monotonies initiales)⌉. La trace décrit une ligne par passe
+(et non une ligne par élément déplacé), avec le volume d'E/S des rubans.
+"""
+import itertools
+import re
+import tempfile
+import time
+from array import array
+from bisect import bisect_right
+from typing import BinaryIO, Iterable, Iterator, List, Optional
+
+from simulators6.options_trace import FULL, NONE, SAMPLED, SUMMARY, Echantillonneur, lire_options
+
+BLOCK_SIZE = 1 << 13   # nombres par bloc lu ou écrit (64 Kio)
+RUN_SIZE = 1 << 16     # nombres triés en mémoire par monotonie initiale
+ITEM_SIZE = array('q').itemsize
+
+_NUMBER = re.compile(rb'\S+')
+
+
+class Tape:
+    """
+    Ruban stocké dans un fichier temporaire, lu et écrit par blocs.
+
+    Attributs :
+    -----------
+    runs : List[int]
+        Longueurs des monotonies écrites sur le ruban, dans l'ordre
+    bytes_read, bytes_written : int
+        Volume d'E/S du ruban
+    """
+
+    def __init__(self, block_size: int = BLOCK_SIZE, directory: Optional[str] = None):
+        self.block_size = block_size
+        self.file = tempfile.TemporaryFile(dir=directory)
+        self.runs: List[int] = []
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self._buffer = array('q')
+        self._position = 0
+        self._unread = 0
+
+    def write_run(self, blocks: Iterable[array]) -> int:
+        """
+        Écrit une monotonie à la suite du ruban.
+
+        Paramètres :
+        ------------
+        blocks : Iterable[array]
+            Blocs de la monotonie (tableaux d'entiers 64 bits), dans l'ordre
+
+        Retour :
+        --------
+        int
+            Nombre de valeurs écrites
+        """
+        length = 0
+        for block in blocks:
+            block.tofile(self.file)
+            length += len(block)
+        self.bytes_written += length * ITEM_SIZE
+        self.runs.append(length)
+        return length
+
+    def rewind(self):
+        """Prépare la lecture du ruban depuis le début."""
+        self.file.seek(0)
+        self._buffer = array('q')
+        self._position = 0
+        self._unread = sum(self.runs)
+
+    def clear(self):
+        """Efface le ruban (avant d'y écrire une nouvelle série de monotonies)."""
+        self.file.seek(0)
+        self.file.truncate()
+        self.runs = []
+
+    def read_run(self, length: int) -> Iterator[array]:
+        """Lit séquentiellement les ``length`` valeurs suivantes (une monotonie), par blocs."""
+        while length:
+            if self._position == len(self._buffer):
+                self._buffer = array('q')
+                count = min(self.block_size, self._unread)
+                self._buffer.fromfile(self.file, count)
+                self._unread -= count
+                self._position = 0
+                self.bytes_read += count * ITEM_SIZE
+            take = min(length, len(self._buffer) - self._position)
+            yield self._buffer[self._position:self._position + take]
+            self._position += take
+            length -= take
+
+    def close(self):
+        self.file.close()
+
+
+class MergeSortStats:
+    """
+    Compteurs d'un tri externe.
+
+    Attributs :
+    -----------
+    numbers : int
+        Nombre de valeurs triées
+    initial_runs : int
+        Nombre de monotonies initiales
+    passes : int
+        Nombre de passes de fusion
+    bytes_read, bytes_written : int
+        Volume d'E/S cumulé des rubans
+    seconds : float
+        Durée du tri
+    log : List[str]
+        Une ligne par étape du tri (monotonies initiales, distributions, fusions)
+    """
+
+    def __init__(self):
+        self.numbers = 0
+        self.initial_runs = 0
+        self.passes = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.seconds = 0.0
+        self.log: List[str] = []
+
+
+def _count(value: int) -> str:
+    return f"{value:,}".replace(",", " ")
+
+
+def _io(tapes: List[Tape]) -> str:
+    """Volume d'E/S cumulé des rubans, pour le journal."""
+    return (f"{_count(sum(tape.bytes_read for tape in tapes))} octets lus, "
+            f"{_count(sum(tape.bytes_written for tape in tapes))} écrits")
+
+
+def _merge(runs: List[Iterator[array]]) -> Iterator[array]:
+    """
+    Fusion à plusieurs voies de monotonies lues par blocs.
+
+    Tant que toutes les voies ont un bloc en cours, les valeurs inférieures
+    ou égales au plus petit des derniers éléments de ces blocs sont sûres :
+    elles sont extraites (bisection) et triées ensemble, ce qui épuise au
+    moins un bloc à chaque tour. La fusion avance ainsi par blocs entiers.
+    """
+    heads = []
+    for run in runs:
+        block = next(run, None)
+        if block is not None:
+            heads.append([block, 0, run])
+    while heads:
+        if len(heads) == 1:
+            block, position, run = heads[0]
+            yield block[position:]
+            yield from run
+            return
+        bound = min(block[-1] for block, _, _ in heads)
+        parts = []
+        for head in heads:
+            block, position, _ = head
+            end = bisect_right(block, bound, position)
+            parts.append(block[position:end])
+            head[1] = end
+        yield array('q', sorted(itertools.chain.from_iterable(parts)))
+        for head in heads:
+            if head[1] == len(head[0]):
+                block = next(head[2], None)
+                head[0], head[1] = block, 0
+        heads = [head for head in heads if head[0] is not None]
+
+
+def iter_sorted_blocks(numbers: Iterable[int], k: int = 3, run_size: int = RUN_SIZE,
+                       block_size: int = BLOCK_SIZE, directory: Optional[str] = None,
+                       stats: Optional[MergeSortStats] = None) -> Iterator[array]:
+    """
+    Trie des entiers par fusion externe sur k rubans (fichiers temporaires).
+
+    Paramètres :
+    ------------
+    numbers : Iterable[int]
+        Entrée (parcourue une seule fois, jamais chargée en entier)
+    k : int
+        Nombre de rubans (au moins 3 : un de sortie, k-1 fusionnés)
+    run_size : int
+        Taille des monotonies initiales, triées en mémoire
+    block_size : int
+        Nombre de valeurs par lecture ou écriture sur un ruban
+    directory : str
+        Répertoire des fichiers temporaires (celui du système par défaut)
+    stats : MergeSortStats
+        Compteurs et journal des passes, mis à jour au fil du tri (facultatif)
+
+    Retour :
+    --------
+    Iterator[array]
+        Les valeurs triées, par blocs, lues séquentiellement sur le ruban final
+
+    Exceptions :
+    ------------
+    ValueError :
+        Si k < 3 ou si une valeur ne tient pas sur 64 bits
+    """
+    if k < 3:
+        raise ValueError("Le tri par fusion demande au moins 3 rubans")
+    stats = MergeSortStats() if stats is None else stats
+    start = time.perf_counter()
+    tapes = [Tape(block_size, directory) for _ in range(k)]
+    output, inputs = tapes[0], tapes[1:]
+    try:
+        # 1. Monotonies initiales, triées en mémoire et réparties sur les rubans 2..k
+        numbers = iter(numbers)
+        for index in itertools.count():
+            try:
+                chunk = array('q', sorted(itertools.islice(numbers, run_size)))
+            except OverflowError:
+                raise ValueError("Nombre hors de l'intervalle des entiers 64 bits") from None
+            if not chunk:
+                break
+            stats.numbers += inputs[index % len(inputs)].write_run([chunk])
+        stats.initial_runs = sum(len(tape.runs) for tape in inputs)
+        stats.log.append(f"Monotonies initiales: {_count(stats.numbers)} nombres en {stats.initial_runs} "
+                         f"monotonie(s) de ≤ {_count(run_size)} nombres, réparties sur les rubans 2..{k}")
+
+        while sum(len(tape.runs) for tape in inputs) > 1:
+            # 2. Fusion à k-1 voies : une monotonie de chaque ruban à la fois, vers le ruban 1
+            stats.passes += 1
+            output.clear()
+            for tape in inputs:
+                tape.rewind()
+            for group in itertools.zip_longest(*(tape.runs for tape in inputs)):
+                output.write_run(_merge([tape.read_run(length) for tape, length in zip(inputs, group)
+                                         if length is not None]))
+            stats.log.append(f"Passe {stats.passes}: fusion à {len(inputs)} voies → {len(output.runs)} "
+                             f"monotonie(s) sur le ruban 1 ({_io(tapes)})")
+            if len(output.runs) == 1:
+                break
+
+            # 3. Redistribution des monotonies du ruban 1 sur les rubans 2..k (copie par blocs)
+            output.rewind()
+            for tape in inputs:
+                tape.clear()
+            for index, length in enumerate(output.runs):
+                inputs[index % len(inputs)].write_run(output.read_run(length))
+            stats.log.append(f"Passe {stats.passes}: distribution de {len(output.runs)} monotonies "
+                             f"sur les rubans 2..{k} ({_io(tapes)})")
+        else:
+            # Zéro ou une monotonie : elle est déjà triée sur le ruban 2
+            output = inputs[0]
+
+        output.rewind()
+        for length in output.runs:
+            yield from output.read_run(length)
+    finally:
+        stats.bytes_read = sum(tape.bytes_read for tape in tapes)
+        stats.bytes_written = sum(tape.bytes_written for tape in tapes)
+        stats.seconds = time.perf_counter() - start
+        for tape in tapes:
+            tape.close()
+
+
+def iter_sorted(numbers: Iterable[int], k: int = 3, run_size: int = RUN_SIZE, block_size: int = BLOCK_SIZE,
+                directory: Optional[str] = None, stats: Optional[MergeSortStats] = None) -> Iterator[int]:
+    """Les valeurs triées une à une (voir iter_sorted_blocks)."""
+    for block in iter_sorted_blocks(numbers, k, run_size, block_size, directory, stats):
+        yield from block
+
+
+def read_numbers(file: BinaryIO, chunk_size: int = 1 << 20) -> Iterator[int]:
+    """
+    Lit les entiers (séparés par des blancs) d'un fichier binaire, par morceaux.
+
+    Exceptions :
+    ------------
+    ValueError :
+        Si un élément n'est pas un entier
+    """
+    rest = b''
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        chunk = rest + chunk
+        # Le dernier élément peut être coupé : la fin du morceau, après le dernier
+        # séparateur, est reportée au morceau suivant
+        cut = max(chunk.rfind(separator) for separator in (b' ', b'\n', b'\t', b'\r')) + 1
+        rest = chunk[cut:]
+        yield from map(int, _NUMBER.findall(chunk, 0, cut))
+    yield from map(int, _NUMBER.findall(rest))
+
+
+def sort_file(source: str, destination: str, k: int = 3, run_size: int = RUN_SIZE,
+              block_size: int = BLOCK_SIZE, directory: Optional[str] = None) -> MergeSortStats:
+    """
+    Trie un fichier d'entiers (séparés par des blancs) vers un fichier, un nombre par ligne.
+
+    Retour :
+    --------
+    MergeSortStats
+        Compteurs du tri (passes, volume d'E/S, durée) et journal des passes
+    """
+    stats = MergeSortStats()
+    with open(source, 'rb') as entree, open(destination, 'wb') as sortie:
+        for block in iter_sorted_blocks(read_numbers(entree), k, run_size, block_size, directory, stats):
+            if block:
+                sortie.write(b'\n'.join(b'%d' % value for value in block) + b'\n')
+    return stats
+
+
+def run(input_str, trace=FULL, k=3, run_size=RUN_SIZE, block_size=BLOCK_SIZE):
+    """
+    Trie une séquence d'entiers par fusion externe sur k rubans.
+
+    Paramètres:
+        input_str (str): chaîne de caractères contenant les entiers séparés par des espaces
+        trace: niveau de trace ('none', 'summary', 'sampled[:N]', 'reservoir:N', 'full').
+            Une étape (monotonies initiales, fusion ou distribution) est l'unité de trace.
+        k (int): nombre de rubans (au moins 3)
+        run_size, block_size (int): voir iter_sorted
+
+    Retour:
+        tuple (list, list): (résultat trié, trace des passes)
+    """
+    try:
+        numbers = list(map(int, input_str.strip().split()))
+    except ValueError:
+        return [], ["Erreur: Entrez des nombres séparés par des espaces (ex: '5 2 7 1')"]
+
+    options = lire_options(trace)
+    stats = MergeSortStats()
+    try:
+        result = list(iter_sorted(numbers, k, run_size, block_size, stats=stats))
+    except ValueError as error:
+        return [], [f"Erreur: {error}"]
+
+    totals = [f"Passes de fusion: {stats.passes}",
+              f"E/S des rubans: {_count(stats.bytes_read)} octets lus, {_count(stats.bytes_written)} écrits"]
+    if options.niveau == NONE:
+        return result, []
+    if options.niveau == SUMMARY:
+        return result, [f"Ruban 1 (sortie): {len(result)} nombres triés"] + totals
+    lines = stats.log
+    if options.niveau == SAMPLED:
+        sampler = Echantillonneur(options)
+        for index, line in enumerate(lines):
+            sampler.ajouter(index, lambda line=line: line)
+        lines = sampler.elements()
+    trace = []
+    for line in lines:
+        trace.extend([line, "---"])
+    return result, trace + totals
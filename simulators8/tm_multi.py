@@ -1,88 +1,138 @@
+from simulators6.options_trace import FULL, SAMPLED, SUMMARY, Echantillonneur, lire_options
+from simulators8.multi_trace import SNAPSHOT_WIDTH, MultiTapeTrace, format_snapshot
+from simulators8.paged_tape import PagedTape
+from simulators8.patterns import TransitionIndex
+
+
 class MultiTapeTuringMachine:
-    def __init__(self, k, transitions, start_state='q0', accept_states=None):
+    def __init__(self, k, transitions, start_state='q0', accept_states=None, trace=FULL):
         """
         Initialise une machine de Turing à k rubans.
 
         - k : nombre de rubans
         - transitions : dictionnaire de transitions {(état, symbole1, ..., symbole_k): (nouvel_état, [nouv_symb], [directions])}
+          Un symbole lu '*' accepte n'importe quel symbole, un symbole écrit '=' réécrit le symbole lu
+          (voir simulators8.patterns)
         - start_state : état initial (par défaut 'q0')
         - accept_states : liste des états d'acceptation (par défaut ['q_accept'])
+        - trace : niveau de trace ('none', 'summary', 'sampled[:N]', 'reservoir:N', 'full')
         """
         self.k = k
         self.transitions = transitions
+        self.index = TransitionIndex(k, transitions)  # motifs compilés : recherche en O(k)
+        self.start_state = start_state
         self.state = start_state
         self.accept_states = set(accept_states or ['q_accept'])
-        self.tapes = [['B'] for _ in range(k)]  # chaque ruban commence avec un blanc
+        self.tapes = [PagedTape() for _ in range(k)]  # chaque ruban commence avec un blanc
         self.heads = [0 for _ in range(k)]      # tête de lecture initialisée à 0 pour chaque ruban
         self.trace = []
+        self.steps = 0                          # nombre de transitions effectuées
+        self.set_trace(trace)
+
+    def set_trace(self, trace):
+        """
+        Change le niveau de trace (voir simulators6.options_trace).
+        """
+        self.trace_options = lire_options(trace)
+        self._sampler = Echantillonneur(self.trace_options) if self.trace_options.niveau == SAMPLED else None
+        # 'full' : trace paresseuse (étapes de O(k) octets, chaînes rendues à la lecture)
+        if self.trace_options.niveau == FULL:
+            if not isinstance(self.trace, MultiTapeTrace):
+                self.trace = MultiTapeTrace(self, entries=self.trace)
+            self.trace.invalidate()
+        elif isinstance(self.trace, MultiTapeTrace):
+            self.trace = list(self.trace)
 
     def initialize_tape(self, tape_index, content):
         """
         Initialise le contenu d'un ruban (indexé de 0 à k-1).
 
         - tape_index : index du ruban à initialiser
-        - content : chaîne de caractères représentant le contenu du ruban
+        - content : chaîne de caractères (ou liste de symboles) écrite à partir de la position 0
         """
-        self.tapes[tape_index] = list(content) if isinstance(content, str) else content
+        self.tapes[tape_index] = PagedTape(content)
         self.heads[tape_index] = 0
+        if isinstance(self.trace, MultiTapeTrace):
+            self.trace.invalidate()
 
     def step(self):
         """
         Effectue une seule transition si possible.
         Retourne False si aucune transition applicable.
         """
-        # Lire les symboles sous chaque tête
-        current_syms = tuple(
-            self.tapes[i][self.heads[i]] if 0 <= self.heads[i] < len(self.tapes[i]) else 'B'
-            for i in range(self.k)
-        )
-        key = (self.state,) + current_syms
-
-        if key not in self.transitions:
+        # Lire les symboles sous chaque tête (blanc hors des pages écrites)
+        current_syms = tuple(self.tapes[i][self.heads[i]] for i in range(self.k))
+        action = self.index.lookup(self.state, current_syms)
+
+        if action is None:
             return False  # Aucune transition applicable
 
-        new_state, new_syms, directions = self.transitions[key]
+        new_state, new_syms, directions = action
 
-        # Écriture et déplacement pour chaque ruban
+        # Écriture et déplacement pour chaque ruban (bi-infini : une tête peut passer à gauche de 0)
+        heads = self.heads
         for i in range(self.k):
-            if 0 <= self.heads[i] < len(self.tapes[i]):
-                self.tapes[i][self.heads[i]] = new_syms[i]
-            else:
-                self.tapes[i].append(new_syms[i])  # si la tête est hors du ruban
+            tape = self.tapes[i]
+            tape[heads[i]] = new_syms[i]
 
             if directions[i] == 'R':
-                self.heads[i] += 1
-                if self.heads[i] >= len(self.tapes[i]):
-                    self.tapes[i].append('B')  # prolonger le ruban
+                heads[i] += 1
+                if heads[i] > tape.high:
+                    tape.high = heads[i]  # prolonger la zone visitée
             elif directions[i] == 'L':
-                self.heads[i] = max(0, self.heads[i] - 1)
+                heads[i] -= 1
+                if heads[i] < tape.low:
+                    tape.low = heads[i]
             # Si direction == 'S' → ne rien faire
 
         self.state = new_state
-        self.trace.append(self.snapshot())
+        self.steps += 1
+        self._record(new_syms)
         return True
 
-    def run(self, max_steps=1000):
+    def _record(self, written=None):
+        """
+        Enregistre la configuration courante selon le niveau de trace.
+
+        - written : symboles écrits par la dernière transition (None au départ)
+        """
+        if self.trace_options.niveau == FULL:
+            self.trace.record(self.state, self.heads, written)
+        elif self._sampler is not None:
+            self._sampler.ajouter(self.steps, self.snapshot)
+
+    def run(self, max_steps=1000, trace=None):
         """
         Exécute la machine jusqu'à acceptation ou blocage.
 
         - max_steps : limite de sécurité
+        - trace : niveau de trace pour cette exécution (par défaut celui du constructeur)
         - Retourne True si acceptée, False sinon
         """
-        self.trace.append(self.snapshot())
+        if trace is not None:
+            self.set_trace(trace)
+        self._record()
+        accepted = False
         for _ in range(max_steps):
             if self.state in self.accept_states:
-                return True
+                accepted = True
+                break
             if not self.step():
-                return False
-        return False  # Timeout
+                break
+
+        # 'sampled' : ajoute les étapes retenues ; 'summary' : la configuration finale seule
+        if self._sampler is not None:
+            self.trace.extend(self._sampler.elements())
+            self._sampler = Echantillonneur(self.trace_options)
+        elif self.trace_options.niveau == SUMMARY:
+            self.trace.append(self.snapshot())
+        return accepted  # False : blocage ou timeout
 
     def snapshot(self):
         """
         Retourne une chaîne représentant l'état actuel de la machine :
         - État courant
-        - Rubans avec position de la tête
+        - Rubans (30 premières cases visitées, à partir de min(0, case la plus à gauche))
+          avec position de la tête (négative à gauche de l'origine)
         """
-        return f"{self.state} | " + " || ".join(
-            "".join(self.tapes[i])[:30] + f" (H{self.heads[i]})" for i in range(self.k)
-        )
+        return format_snapshot(self.state, [tape.window(SNAPSHOT_WIDTH) for tape in self.tapes], self.heads)
@@ -1,3 +1,9 @@
+import time
+
+from simulators6.boucles import DetecteurBoucle, confirmer_cycle
+from simulators6.reprise import restaurer, sauvegarder
+
+
 class UniversalTuringMachine:
     """
     Une machine de Turing universelle simple, interprétant une machine encodée en unaire (avec séparateurs binaires).
@@ -19,6 +25,9 @@ class UniversalTuringMachine:
         self.head = 0                                               # Position de la tête de lecture
         self.blank = 'B'                                            # Symbole blanc par défaut
         self.accept_states = accept_states
+        self.origin = 0                                             # Indice de la case initiale (cases ajoutées à gauche)
+        self.loop = None                                            # (début, longueur) du cycle détecté par run()
+        self.steps = 0                                              # Transitions effectuées depuis le début
 
     def decode_unary(self, code):
         """Décode un entier encodé unairement. Ex: '111' → 3"""
@@ -61,6 +70,7 @@ class UniversalTuringMachine:
         if self.head < 0:
             self.tape.insert(0, self.blank)
             self.head = 0
+            self.origin += 1
         elif self.head >= len(self.tape):
             self.tape.append(self.blank)
 
@@ -74,23 +84,82 @@ class UniversalTuringMachine:
         self.tape[self.head] = write_sym
         self.state = next_state
         self.head += 1 if direction == 'R' else -1
+        self.steps += 1
         return True
 
-    def run(self, max_steps=1000):
+    def run(self, max_steps=1000, detect_loops=False, checkpoint=None, checkpoint_interval=5.0):
         """
         Exécute la machine jusqu’à acceptation, blocage ou dépassement de pas.
 
+        Paramètres :
+        ------------
+        max_steps : int
+            Nombre maximal de transitions
+        detect_loops : bool
+            Arrête l'exécution dès qu'une configuration se répète ; le cycle
+            est alors décrit par ``self.loop = (début, longueur)``
+        checkpoint : str
+            Fichier où l'état d'exécution est sauvegardé périodiquement
+            (voir simulators6.reprise et resume())
+        checkpoint_interval : float
+            Secondes minimum entre deux sauvegardes
+
         Retour :
         --------
-        bool : True si acceptée, False sinon (rejet ou timeout)
+        bool : True si acceptée, False sinon (rejet, boucle ou timeout)
         """
-        for _ in range(max_steps):
+        self.loop = None
+        detector = None
+        if detect_loops:
+            detector = DetecteurBoucle(self.state, self.head - self.origin,
+                                       ((i - self.origin, sym) for i, sym in enumerate(self.tape)), self.blank)
+        next_save = time.monotonic() + checkpoint_interval
+        for step in range(max_steps):
             if self.state in self.accept_states:
                 return True
+            if checkpoint and step % 4096 == 0 and time.monotonic() >= next_save:
+                sauvegarder(self, checkpoint)
+                next_save = time.monotonic() + checkpoint_interval
+            if detector is None:
+                if not self.step():
+                    return False
+                continue
+
+            # Configuration déjà rencontrée : la machine boucle indéfiniment
+            position = self.head - self.origin
+            previous = detector.observer(step)
+            if previous is not None:
+                cells = {i - self.origin: sym for i, sym in enumerate(self.tape) if sym != self.blank}
+                if confirmer_cycle(self.transitions, self.state, position, cells, self.blank, step - previous,
+                                   lambda direction: 1 if direction == 'R' else -1, self.accept_states):
+                    self.loop = (previous, step - previous)
+                    return False
+            state = self.state
+            read = self.tape[self.head] if 0 <= self.head < len(self.tape) else self.blank
             if not self.step():
                 return False
+            detector.appliquer(state, position, read, self.tape[position + self.origin],
+                               self.state, self.head - self.origin)
         return False  # arrêt forcé (timeout)
 
+    def resume(self, checkpoint, max_steps=1000, detect_loops=False, checkpoint_interval=5.0):
+        """
+        Reprend une exécution sauvegardée par run(checkpoint=...).
+
+        Paramètres :
+        ------------
+        checkpoint : str
+            Point de contrôle (il continue d'être mis à jour pendant la reprise)
+        max_steps : int
+            Nombre maximal de transitions, compté depuis le début de l'exécution
+
+        Retour :
+        --------
+        bool : Comme run()
+        """
+        restaurer(self, checkpoint)
+        return self.run(max(0, max_steps - self.steps), detect_loops, checkpoint, checkpoint_interval)
+
     def print_tape(self):
         """
         Affiche l’état actuel du ruban avec un curseur ^ indiquant la position de la tête.